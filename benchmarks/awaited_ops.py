@@ -0,0 +1,79 @@
+"""
+Measures how many operations per second can be awaited through :class:`.UringIoManager`, using the
+lightweight single-shot waiters versus the memory object stream pair that was previously created
+for every operation.
+
+Each task awaits a ``nop`` at a time, so the numbers are dominated by the waiter plumbing rather
+than by the kernel.
+
+Run with ``python benchmarks/awaited_ops.py [operations] [tasks]``.
+"""
+
+import sys
+import time
+from collections.abc import Callable
+
+import anyio
+
+from century_ring._century_ring import CompletionEvent
+from century_ring.aio.manager import UringIoManager
+from century_ring.aio.sidecar import start_uring_sidecar
+from century_ring.aio.waiters import CompletionWaiter
+
+
+class MemoryStreamWaiter:
+    """
+    The old waiter, which is a full memory object stream pair.
+    """
+
+    def __init__(self) -> None:
+        self._send, self._recv = anyio.create_memory_object_stream[CompletionEvent](1)
+
+    def set(self, cqe: CompletionEvent) -> None:
+        with self._send:
+            self._send.send_nowait(cqe)
+
+    async def wait(self) -> CompletionEvent:
+        async with self._recv:
+            return await self._recv.receive()
+
+
+async def await_nops(manager: UringIoManager, count: int) -> None:
+    for _ in range(count):
+        await manager.wait_for_completion(manager.ring.prep_nop())
+
+
+async def run(operations: int, tasks: int, waiter: Callable[[], CompletionWaiter] | None) -> float:
+    async with start_uring_sidecar() as manager:
+        if waiter is not None:
+            manager._new_waiter = waiter
+
+        before = time.perf_counter()
+        async with anyio.create_task_group() as group:
+            for _ in range(tasks):
+                group.start_soon(await_nops, manager, operations // tasks)
+        elapsed = time.perf_counter() - before
+
+    return (operations // tasks) * tasks / elapsed
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    tasks = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    for backend in ("asyncio", "trio"):
+        try:
+            before = anyio.run(run, operations, tasks, MemoryStreamWaiter, backend=backend)
+            after = anyio.run(run, operations, tasks, None, backend=backend)
+        except ModuleNotFoundError:
+            print(f"{backend:>8}: not installed")
+            continue
+
+        print(
+            f"{backend:>8}: {before:12,.0f} ops/sec with memory streams, "
+            f"{after:12,.0f} ops/sec with waiters ({after / before:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures the cost of preparing and completing operations that own data (reads, in this case)
+with a large number of them in flight at once.
+
+Every read is parked on an empty pipe, so all of them stay in flight (and their buffers stay in
+the ring's owned data table) until the write end is closed, at which point they all complete with
+EOF and are reaped.
+
+Run with ``python benchmarks/owned_data.py [in_flight]``.
+"""
+
+import os
+import sys
+import time
+
+from century_ring import make_io_ring
+
+
+def run(in_flight: int) -> tuple[float, float]:
+    read_end, write_end = os.pipe()
+
+    try:
+        with make_io_ring(entries=4096, cq_size=65536) as ring:
+            before = time.perf_counter()
+            for _ in range(in_flight):
+                ring.prep_read(read_end, 1)
+            ring.submit()
+            prep_time = time.perf_counter() - before
+
+            os.close(write_end)
+            write_end = -1
+
+            reaped = 0
+            before = time.perf_counter()
+            while reaped < in_flight:
+                ring.submit_and_wait(1)
+                reaped += len(ring.get_completion_batch(max_entries=in_flight))
+            complete_time = time.perf_counter() - before
+
+            return prep_time, complete_time
+    finally:
+        os.close(read_end)
+        if write_end >= 0:
+            os.close(write_end)
+
+
+def main() -> None:
+    in_flight = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    prep_time, complete_time = run(in_flight)
+
+    print(f"{in_flight} operations in flight")
+    print(f"prep:     {prep_time * 1e9 / in_flight:8.1f} ns/op")
+    print(f"complete: {complete_time * 1e9 / in_flight:8.1f} ns/op")
+
+
+if __name__ == "__main__":
+    main()
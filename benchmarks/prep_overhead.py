@@ -0,0 +1,66 @@
+"""
+Measures the per-operation cost of preparing submissions through the :class:`.IoUring` API, versus
+calling the raw Rust-level functions directly with plain integers and letting the ring assign the
+user data.
+
+Only the preparation is timed; completions are reaped between batches, outside of the timer.
+
+Run with ``python benchmarks/prep_overhead.py [operations]``.
+"""
+
+import os
+import sys
+import time
+from collections.abc import Callable
+
+from century_ring import IoUring, make_io_ring
+from century_ring._century_ring import _RUSTFFI_ioring_prep_close, _RUSTFFI_ioring_prep_read
+
+BATCH_SIZE = 4096
+
+
+def run(ring: IoUring, operations: int, prep: Callable[[], object]) -> float:
+    elapsed = 0.0
+
+    for _ in range(operations // BATCH_SIZE):
+        before = time.perf_counter()
+        for _ in range(BATCH_SIZE):
+            prep()
+        elapsed += time.perf_counter() - before
+
+        ring.submit_and_wait(BATCH_SIZE)
+        while len(ring.get_completion_batch()):
+            pass
+
+    return (operations // BATCH_SIZE) * BATCH_SIZE / elapsed
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    zero = os.open("/dev/zero", os.O_RDONLY)
+
+    try:
+        with make_io_ring(entries=BATCH_SIZE, cq_size=BATCH_SIZE * 2) as ring:
+            raw = ring._the_ring
+
+            results = {
+                "prep_close": run(ring, operations, lambda: ring.prep_close(-1)),
+                "raw close": run(
+                    ring, operations, lambda: _RUSTFFI_ioring_prep_close(raw, -1, None, 0, False)
+                ),
+                "prep_read": run(ring, operations, lambda: ring.prep_read(zero, 1)),
+                "raw read": run(
+                    ring,
+                    operations,
+                    lambda: _RUSTFFI_ioring_prep_read(raw, zero, 1, -1, None, 0, None),
+                ),
+            }
+    finally:
+        os.close(zero)
+
+    for name, ops_per_sec in results.items():
+        print(f"{name:>12}: {ops_per_sec:12,.0f} ops/sec")
+
+
+if __name__ == "__main__":
+    main()
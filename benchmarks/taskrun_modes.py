@@ -0,0 +1,51 @@
+"""
+Compares the :class:`.TaskRunMode` options on a local echo workload over a socketpair. Each round
+trip sends a message one way, receives it, and sends it back, waiting for the completions of every
+step.
+
+Run with ``python benchmarks/taskrun_modes.py [round trips]``.
+"""
+
+import socket
+import sys
+import time
+
+from century_ring import IoUring, TaskRunMode, make_io_ring
+
+MESSAGE = b"x" * 64
+
+
+def send_and_receive(ring: IoUring, sender: socket.socket, receiver: socket.socket) -> None:
+    ring.prep_send(sender.fileno(), MESSAGE)
+    ring.prep_recv(receiver.fileno(), len(MESSAGE))
+    ring.submit_and_wait(2)
+
+    completed = 0
+    while completed < 2:
+        completed += len(ring.get_completion_entries())
+
+
+def run(mode: TaskRunMode, round_trips: int) -> tuple[TaskRunMode, float]:
+    left, right = socket.socketpair()
+
+    with left, right, make_io_ring(task_run_mode=mode) as ring:
+        before = time.perf_counter()
+        for _ in range(round_trips):
+            send_and_receive(ring, left, right)
+            send_and_receive(ring, right, left)
+        elapsed = time.perf_counter() - before
+
+        return ring.task_run_mode, round_trips / elapsed
+
+
+def main() -> None:
+    round_trips = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for mode in TaskRunMode:
+        actual, per_sec = run(mode, round_trips)
+        note = "" if actual == mode else f" (fell back to {actual.name})"
+        print(f"{mode.name:>12}: {per_sec:12,.0f} round trips/sec{note}")
+
+
+if __name__ == "__main__":
+    main()
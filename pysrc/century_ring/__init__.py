@@ -1,8 +1,17 @@
 from century_ring._century_ring import CompletionEvent as CompletionEvent
-from century_ring.enums import FileOpenFlag as FileOpenFlag, FileOpenMode as FileOpenMode
+from century_ring.chain import LinkedChain as LinkedChain, PreparedChain as PreparedChain
+from century_ring.enums import (
+    FileOpenFlag as FileOpenFlag,
+    FileOpenMode as FileOpenMode,
+    ReadWriteFlag as ReadWriteFlag,
+    TaskRunMode as TaskRunMode,
+)
 from century_ring.helpers import make_sqe_flags as make_sqe_flags, raise_for_cqe as raise_for_cqe
 from century_ring.ring import (
     AT_FDCWD as AT_FDCWD,
+    AUTO_SLOT as AUTO_SLOT,
+    CompletionBatch as CompletionBatch,
     IoUring as IoUring,
+    RingCapabilities as RingCapabilities,
     make_io_ring as make_io_ring,
 )
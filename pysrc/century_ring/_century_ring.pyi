@@ -6,6 +6,13 @@
 # functionality of this file is *private*, may change under any circumstances, and may be confusing
 # to use. The only guarantee is that you can't *explicitly* break anything by using these
 # operations directly.
+#
+# Every ``_RUSTFFI_ioring_prep_*`` function returns the user data value stored in the SQE. Passing
+# ``None`` as the user data makes the ring allocate the next one itself, which saves a separate
+# call to ``TheIoRing.get_next_user_data``.
+
+from array import array
+from collections.abc import Buffer, Sequence
 
 class CompletionEvent:
     """
@@ -18,10 +25,24 @@ class CompletionEvent:
     #: The internal user_data field. Not relevant.
     user_data: int
 
-    #: If this operation had a buffer, either the provided buffer from the application or the
-    #: allocated buffer (writes and reads, respectively).
+    #: If this operation allocated a buffer to read into, the data that was read. Operations that
+    #: write from a buffer provided by the application never set this.
     buffer: bytes | None
 
+    #: If this operation picked a buffer from a provided buffer ring, the ID of that buffer.
+    buffer_id: int | None
+
+    #: The raw ``cqe->flags`` field for this event.
+    flags: int
+
+    #: If True, the operation that posted this event is a multishot operation that is still armed,
+    #: and will post more completion events with the same ``user_data``.
+    has_more: bool
+
+    #: If True, this is the notification event for a zero-copy operation, which is posted once the
+    #: kernel no longer needs the operation's buffer.
+    is_notification: bool
+
     def should_be_ignored(self) -> bool:
         """
         If True, this is a special completion event that should be ignored by user code.
@@ -38,9 +59,9 @@ class TheIoRing:
         Submits all pending events, returning the number of events submitted.
         """
 
-    def wait_with_timeout(self, secs: int, nsec: int) -> int:
+    def wait_with_timeout(self, secs: int, nsec: int, want: int) -> int:
         """
-        Submits all pending events, then waits for the specified time.
+        Submits all pending events, then waits for ``want`` completions or the specified time.
         """
 
     def pending_sq_entries(self) -> int:
@@ -48,28 +69,141 @@ class TheIoRing:
         Gets the number of pending submission queue entries.
         """
 
+    def fileno(self) -> int:
+        """
+        Gets the file descriptor of the ring itself.
+        """
+
+    def register_iowq_max_workers(self, bounded: int, unbounded: int, /) -> tuple[int, int]:
+        """
+        Limits the number of io-wq workers, returning the previous limits.
+        """
+
+    def register_iowq_aff(self, cpus: list[int], /) -> None:
+        """
+        Pins the io-wq workers to a set of CPUs.
+        """
+
+    def unregister_iowq_aff(self) -> None:
+        """
+        Removes the CPU affinity of the io-wq workers.
+        """
+
+    def capabilities(self) -> tuple[bool, bool, bool]:
+        """
+        Gets the ``(registered_ring_fd, ext_arg, sqpoll)`` capabilities of the ring.
+        """
+
+    def task_run_mode(self) -> int:
+        """
+        Gets the task running mode that the ring was actually set up with.
+        """
+
+    def reserve_sq_entries(self, count: int, /) -> None:
+        """
+        Makes sure there's room for ``count`` more entries in the submission queue.
+        """
+
     def get_completion_entries(self) -> list[CompletionEvent]:
         """
         Gets the list of ready completion events.
         """
 
+    def get_completion_batch(
+        self, max_entries: int, /
+    ) -> tuple[array[int], array[int], array[int], dict[int, bytes]]:
+        """
+        Drains up to ``max_entries`` completion events into parallel arrays of user data values,
+        results, and flags, along with the buffers for the entries that own one.
+        """
+
     def get_next_user_data(self) -> int:
         """
         Gets the next user-data value, used for tracking objects internally.
         """
 
-    def register_eventfd(self, event_fd: int) -> None:
+    def register_eventfd(self, event_fd: int, async_only: bool, /) -> None:
         """
         Registers an eventfd with the loop.
         """
 
+    def register_buffers(self, count: int, size: int, /) -> None:
+        """
+        Registers a pool of ``count`` buffers of ``size`` bytes each with the ring.
+        """
+
+    def unregister_buffers(self) -> None:
+        """
+        Unregisters the previously registered buffer pool.
+        """
+
+    def read_registered_buffer(self, index: int, offset: int, size: int, /) -> bytes:
+        """
+        Copies data out of a registered buffer.
+        """
+
+    def write_registered_buffer(self, index: int, offset: int, data: Buffer, /) -> int:
+        """
+        Copies data into a registered buffer.
+        """
+
+    def register_buffer_ring(self, group: int, count: int, size: int, /) -> None:
+        """
+        Registers a provided buffer ring under the specified buffer group ID.
+        """
+
+    def unregister_buffer_ring(self, group: int, /) -> None:
+        """
+        Unregisters the provided buffer ring for the specified buffer group ID.
+        """
+
+    def read_provided_buffer(
+        self, group: int, buffer_id: int, size: int, recycle: bool, /
+    ) -> bytes:
+        """
+        Copies data out of a checked out provided buffer.
+        """
+
+    def recycle_provided_buffer(self, group: int, buffer_id: int, /) -> None:
+        """
+        Hands a checked out provided buffer back to the kernel.
+        """
+
+    def register_files(self, count: int, /) -> None:
+        """
+        Registers a sparse file table with the specified number of slots.
+        """
+
+    def update_registered_files(self, offset: int, fds: list[int], /) -> int:
+        """
+        Replaces slots in the registered file table.
+        """
+
+    def unregister_files(self) -> None:
+        """
+        Unregisters the registered file table.
+        """
+
+    def is_closed(self) -> bool:
+        """
+        Checks if the io_uring has been closed.
+        """
+
     def close(self) -> None:
         """
         Closes the io_uring. This method is idempotent.
         """
 
 def _RUSTFFI_create_io_ring(
-    entries: int, cq_entries: int, sqlpoll_idle_ms: int, single_issuer: bool, autosubmit: bool, /
+    entries: int,
+    cq_entries: int,
+    sqlpoll_idle_ms: int,
+    single_issuer: bool,
+    autosubmit: bool,
+    task_run_mode: int,
+    sq_thread_cpu: int | None,
+    attach_wq: int | None,
+    /,
 ) -> TheIoRing:
     """
     Creates a new ``io_uring``.
@@ -93,10 +227,11 @@ def _RUSTFFI_ioring_prep_openat(
     ring: TheIoRing,
     dirfd: int,
     file_path: bytes,
-    user_data: int,
+    user_data: int | None,
     flags: int,
     mode: int,
     sqe_flags: int,
+    direct_slot: int | None,
     /,
 ) -> int:
     """
@@ -104,71 +239,334 @@ def _RUSTFFI_ioring_prep_openat(
     """
 
 def _RUSTFFI_ioring_prep_read(
-    ring: TheIoRing, fd: int, max_size: int, offset: int, user_data: int, sqe_flags: int, /
-) -> None:
+    ring: TheIoRing,
+    fd: int,
+    max_size: int,
+    offset: int,
+    user_data: int | None,
+    sqe_flags: int,
+    buffer_group: int | None,
+    /,
+) -> int:
     """
     Prepares a pread(2) call through ``io_uring``.
     """
 
+def _RUSTFFI_ioring_prep_read_into(
+    ring: TheIoRing,
+    fd: int,
+    buf: Buffer,
+    size: int | None,
+    buffer_offset: int,
+    offset: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a pread(2) call into a writable buffer through ``io_uring``.
+    """
+
 def _RUSTFFI_ioring_prep_write(
     ring: TheIoRing,
     fd: int,
-    buf: bytes | bytearray,
-    size: int,
+    buf: Buffer,
+    size: int | None,
     buffer_offset: int,
     file_offset: int,
-    user_data: int,
+    user_data: int | None,
     sqe_flags: int,
     /,
-) -> None:
+) -> int:
     """
     Prepares a pwrite(2) call through ``io_uring``.
     """
 
-def _RUSTFFI_ioring_prep_close(ring: TheIoRing, fd: int, user_data: int, sqe_flags: int, /) -> None:
+def _RUSTFFI_ioring_prep_readv(
+    ring: TheIoRing,
+    fd: int,
+    buffers: Sequence[Buffer],
+    offset: int,
+    rw_flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a preadv2(2) call into several writable buffers through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_writev(
+    ring: TheIoRing,
+    fd: int,
+    buffers: Sequence[Buffer],
+    offset: int,
+    rw_flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a pwritev2(2) call from several buffers through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_read_many(
+    ring: TheIoRing,
+    fds: Sequence[int],
+    sizes: Sequence[int] | int,
+    offsets: Sequence[int] | None,
+    sqe_flags: int,
+    /,
+) -> array[int]:
+    """
+    Prepares many read(2) calls through ``io_uring`` at once.
+    """
+
+def _RUSTFFI_ioring_prep_write_many(
+    ring: TheIoRing,
+    fd: int,
+    buffers: Sequence[Buffer],
+    offsets: Sequence[int] | None,
+    sqe_flags: int,
+    /,
+) -> array[int]:
+    """
+    Prepares many write(2) calls to a single file through ``io_uring`` at once.
+    """
+
+def _RUSTFFI_ioring_prep_read_fixed(
+    ring: TheIoRing,
+    fd: int,
+    buffer_index: int,
+    buffer_offset: int,
+    max_size: int,
+    offset: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a pread(2) call into a registered buffer through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_write_fixed(
+    ring: TheIoRing,
+    fd: int,
+    buffer_index: int,
+    buffer_offset: int,
+    size: int,
+    file_offset: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a pwrite(2) call from a registered buffer through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_close(
+    ring: TheIoRing, fd: int, user_data: int | None, sqe_flags: int, fixed: bool, /
+) -> int:
     """
     Prepares a close(2) call through ``io_uring``.
     """
 
+def _RUSTFFI_ioring_prep_close_many(
+    ring: TheIoRing, fds: Sequence[int], sqe_flags: int, /
+) -> array[int]:
+    """
+    Prepares many close(2) calls through ``io_uring`` at once.
+    """
+
+def _RUSTFFI_ioring_prep_nop(ring: TheIoRing, user_data: int | None, sqe_flags: int, /) -> int:
+    """
+    Prepares a no-op through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_link_timeout(
+    ring: TheIoRing, sec: int, nsec: int, user_data: int | None, sqe_flags: int, /
+) -> int:
+    """
+    Prepares a linked timeout through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_poll_add(
+    ring: TheIoRing,
+    fd: int,
+    events: int,
+    multishot: bool,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a poll through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_timeout(
+    ring: TheIoRing,
+    sec: int,
+    nsec: int,
+    absolute: bool,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a standalone timeout through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_cancel(
+    ring: TheIoRing,
+    target_user_data: int | None,
+    fd: int | None,
+    fixed: bool,
+    all: bool,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a cancellation of in-flight operations through ``io_uring``.
+    """
+
 def _RUSTFFI_ioring_prep_create_socket(
-    ring: TheIoRing, domain: int, type: int, protocol: int, user_data: int, sqe_flags: int, /
-) -> None:
+    ring: TheIoRing,
+    domain: int,
+    type: int,
+    protocol: int,
+    user_data: int | None,
+    sqe_flags: int,
+    direct_slot: int | None,
+    /,
+) -> int:
     """
     Prepares a socket(2) call through ``io_uring``.
     """
 
 def _RUSTFFI_ioring_prep_connect_v4(
-    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int, sqe_flags: int, /
-) -> None:
+    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int | None, sqe_flags: int, /
+) -> int:
     """
     Prepares a IPv4 connect(2) call through ``io_uring``.
     """
 
 def _RUSTFFI_ioring_prep_connect_v6(
-    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int, sqe_flags: int, /
-) -> None:
+    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int | None, sqe_flags: int, /
+) -> int:
     """
     Prepares a IPv6 connect(2) call through ``io_uring``.
     """
 
+def _RUSTFFI_ioring_prep_bind_v4(
+    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int | None, sqe_flags: int, /
+) -> int:
+    """
+    Prepares a IPv4 bind(2) call through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_bind_v6(
+    ring: TheIoRing, fd: int, addr: str, port: int, user_data: int | None, sqe_flags: int, /
+) -> int:
+    """
+    Prepares a IPv6 bind(2) call through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_listen(
+    ring: TheIoRing, fd: int, backlog: int, user_data: int | None, sqe_flags: int, /
+) -> int:
+    """
+    Prepares a listen(2) call through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_accept(
+    ring: TheIoRing,
+    fd: int,
+    flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    direct_slot: int | None,
+    /,
+) -> int:
+    """
+    Prepares an accept4(2) call through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_accept_multishot(
+    ring: TheIoRing, fd: int, flags: int, user_data: int | None, sqe_flags: int, direct: bool, /
+) -> int:
+    """
+    Prepares a multishot accept4(2) call through ``io_uring``.
+    """
+
 def _RUSTFFI_ioring_prep_recv(
-    ring: TheIoRing, fd: int, max_size: int, flags: int, user_data: int, sqe_flags: int, /
-) -> None:
+    ring: TheIoRing,
+    fd: int,
+    max_size: int,
+    flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    buffer_group: int | None,
+    /,
+) -> int:
     """
     Prepares a recv(2) call through ``io_uring``.
     """
 
+def _RUSTFFI_ioring_prep_recv_into(
+    ring: TheIoRing,
+    fd: int,
+    buf: Buffer,
+    size: int | None,
+    buffer_offset: int,
+    flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a recv(2) call into a writable buffer through ``io_uring``.
+    """
+
+def _RUSTFFI_ioring_prep_recv_multishot(
+    ring: TheIoRing,
+    fd: int,
+    flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    buffer_group: int,
+    /,
+) -> int:
+    """
+    Prepares a multishot recv(2) call through ``io_uring``.
+    """
+
 def _RUSTFFI_ioring_prep_send(
     ring: TheIoRing,
     fd: int,
-    data: bytes | bytearray,
-    size: int,
+    data: Buffer,
+    size: int | None,
     buffer_offset: int,
     flags: int,
-    user_data: int,
+    user_data: int | None,
     sqe_flags: int,
     /,
-) -> None:
+) -> int:
     """
     Prepares a send(2) call through ``io_uring``.
     """
+
+def _RUSTFFI_ioring_prep_send_zc(
+    ring: TheIoRing,
+    fd: int,
+    data: Buffer,
+    size: int | None,
+    buffer_offset: int,
+    flags: int,
+    user_data: int | None,
+    sqe_flags: int,
+    /,
+) -> int:
+    """
+    Prepares a zero-copy send(2) call through ``io_uring``.
+    """
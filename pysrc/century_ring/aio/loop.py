@@ -0,0 +1,399 @@
+import asyncio
+import ipaddress
+import selectors
+import socket
+from collections.abc import Buffer, Callable, Iterator, Mapping
+from contextlib import ExitStack
+from select import POLLERR, POLLHUP, POLLIN, POLLOUT
+from typing import Any, override
+
+from century_ring._century_ring import CompletionEvent
+from century_ring.enums import TaskRunMode
+from century_ring.helpers import make_sqe_flags, raise_for_cqe
+from century_ring.ring import IoUring, make_io_ring
+
+_SKIP_SUCCESS = make_sqe_flags(skip_success=True)
+
+type _FileObject = int | Any
+
+
+def _fileobj_to_fd(fileobj: _FileObject) -> int:
+    fd = fileobj if isinstance(fileobj, int) else int(fileobj.fileno())
+    if fd < 0:
+        raise ValueError(f"Invalid file descriptor: {fd}")
+
+    return fd
+
+
+def _poll_mask(events: int) -> int:
+    mask = 0
+    if events & selectors.EVENT_READ:
+        mask |= POLLIN
+
+    if events & selectors.EVENT_WRITE:
+        mask |= POLLOUT
+
+    return mask
+
+
+class _SelectorMapping(Mapping[_FileObject, selectors.SelectorKey]):
+    def __init__(self, keys: dict[int, selectors.SelectorKey]) -> None:
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, fileobj: _FileObject) -> selectors.SelectorKey:
+        return self._keys[_fileobj_to_fd(fileobj)]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._keys)
+
+
+class UringSelector(selectors.BaseSelector):
+    """
+    A :class:`selectors.BaseSelector` that waits for readiness using ``io_uring`` poll operations
+    rather than ``epoll``.
+
+    Every registered file has a single one-shot poll in flight. A poll is only re-armed on the
+    :meth:`select` call after the one that reported it, once the event loop has had a chance to
+    act on it, which gives the same level-triggered behaviour as the other selectors.
+
+    Completion events that aren't for a poll are kept aside and can be fetched with
+    :meth:`take_completions`.
+    """
+
+    def __init__(self, ring: IoUring) -> None:
+        self._ring = ring
+        self._keys: dict[int, selectors.SelectorKey] = {}
+
+        # fd -> user data of the poll in flight, and the reverse.
+        self._polls: dict[int, int] = {}
+        self._poll_fds: dict[int, int] = {}
+        self._needs_rearm: set[int] = set()
+
+        self._completions: list[CompletionEvent] = []
+
+    def _arm(self, fd: int) -> None:
+        user_data = self._ring.prep_poll(fd, _poll_mask(self._keys[fd].events))
+        self._polls[fd] = user_data
+        self._poll_fds[user_data] = fd
+
+    def _disarm(self, fd: int) -> None:
+        self._needs_rearm.discard(fd)
+
+        if (user_data := self._polls.pop(fd, None)) is not None:
+            del self._poll_fds[user_data]
+            self._ring.prep_cancel(user_data, sqe_flags=_SKIP_SUCCESS)
+
+    @override
+    def register(
+        self, fileobj: _FileObject, events: int, data: Any = None
+    ) -> selectors.SelectorKey:
+        if not events or events & ~(selectors.EVENT_READ | selectors.EVENT_WRITE):
+            raise ValueError(f"Invalid events: {events!r}")
+
+        fd = _fileobj_to_fd(fileobj)
+        if fd in self._keys:
+            raise KeyError(f"{fileobj!r} (FD {fd}) is already registered")
+
+        key = selectors.SelectorKey(fileobj, fd, events, data)
+        self._keys[fd] = key
+        self._arm(fd)
+        return key
+
+    @override
+    def unregister(self, fileobj: _FileObject) -> selectors.SelectorKey:
+        fd = _fileobj_to_fd(fileobj)
+
+        try:
+            key = self._keys.pop(fd)
+        except KeyError:
+            raise KeyError(f"{fileobj!r} is not registered") from None
+
+        self._disarm(fd)
+        return key
+
+    @override
+    def modify(self, fileobj: _FileObject, events: int, data: Any = None) -> selectors.SelectorKey:
+        fd = _fileobj_to_fd(fileobj)
+
+        try:
+            key = self._keys[fd]
+        except KeyError:
+            raise KeyError(f"{fileobj!r} is not registered") from None
+
+        if events != key.events:
+            self.unregister(fileobj)
+            return self.register(fileobj, events, data)
+
+        if data != key.data:
+            key = key._replace(data=data)
+            self._keys[fd] = key
+
+        return key
+
+    @override
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        for fd in self._needs_rearm:
+            if fd in self._keys and fd not in self._polls:
+                self._arm(fd)
+
+        self._needs_rearm.clear()
+
+        try:
+            if timeout is None:
+                self._ring.submit_and_wait(1)
+            elif timeout <= 0:
+                self._ring.submit()
+            else:
+                seconds, nsec = divmod(round(timeout * 1_000_000_000), 1_000_000_000)
+                self._ring.submit_and_wait_with_timeout(seconds, nsec)
+        except InterruptedError:
+            pass
+
+        ready: dict[int, int] = {}
+
+        for cqe in self._ring.get_completion_entries():
+            if cqe.should_be_ignored():
+                continue
+
+            fd = self._poll_fds.pop(cqe.user_data, None)
+            if fd is None:
+                self._completions.append(cqe)
+                continue
+
+            del self._polls[fd]
+            self._needs_rearm.add(fd)
+            key = self._keys[fd]
+
+            if cqe.result < 0:
+                # let whoever is waiting on the file find out about the error themselves.
+                events = key.events
+            else:
+                events = 0
+                if cqe.result & (POLLIN | POLLHUP | POLLERR):
+                    events |= selectors.EVENT_READ
+
+                if cqe.result & (POLLOUT | POLLHUP | POLLERR):
+                    events |= selectors.EVENT_WRITE
+
+            ready[fd] = ready.get(fd, 0) | (events & key.events)
+
+        return [(self._keys[fd], events) for fd, events in ready.items() if events]
+
+    def take_completions(self) -> list[CompletionEvent]:
+        """
+        Gets every completion event that wasn't for a poll since the last call.
+        """
+
+        completions, self._completions = self._completions, []
+        return completions
+
+    @override
+    def close(self) -> None:
+        self._keys.clear()
+        self._polls.clear()
+        self._poll_fds.clear()
+        self._needs_rearm.clear()
+
+    @override
+    def get_map(self) -> Mapping[_FileObject, selectors.SelectorKey]:
+        return _SelectorMapping(self._keys)
+
+
+class UringEventLoop(asyncio.SelectorEventLoop):
+    """
+    An :mod:`asyncio` event loop that runs entirely on top of an ``io_uring``.
+
+    Each iteration of the loop does a single submit-and-wait on the ring, which both submits every
+    operation queued up since the last iteration and waits (with the timeout of the next scheduled
+    callback) for completions. File readiness for transports, servers, subprocess pipes and the
+    loop's own wakeups is driven by ring poll operations (see :class:`.UringSelector`), and the
+    ``sock_*`` methods are implemented as ring operations directly.
+
+    Any other ring operation can be awaited with :meth:`wait_for_completion`:
+
+    .. code-block:: python3
+
+        loop = asyncio.get_running_loop()
+        cqe = await loop.wait_for_completion(loop.ring.prep_read(fd, 4096))
+    """
+
+    def __init__(
+        self,
+        *,
+        entries: int = 256,
+        cq_size: int | None = None,
+        task_run_mode: TaskRunMode = TaskRunMode.COOPERATIVE,
+    ) -> None:
+        """
+        :param entries: See :func:`.make_io_ring`.
+        :param cq_size: See :func:`.make_io_ring`.
+        :param task_run_mode: See :func:`.make_io_ring`.
+
+            The ring is created here, but a loop is often created on one thread and run on
+            another. :attr:`.TaskRunMode.DEFERRED` ties the ring to the thread that created it, so
+            only pass it if the loop will run on the thread that creates it. The ring is created
+            with ``single_issuer``, so the loop must always run on the same thread once it has
+            started.
+        """
+
+        self._exit_stack = ExitStack()
+        self._ring = self._exit_stack.enter_context(
+            make_io_ring(entries=entries, cq_size=cq_size, task_run_mode=task_run_mode)
+        )
+
+        self._uring_selector = UringSelector(self._ring)
+        self._completion_futures: dict[int, asyncio.Future[CompletionEvent]] = {}
+        self._completion_handler: Callable[[CompletionEvent], None] | None = None
+
+        super().__init__(selector=self._uring_selector)
+
+    @property
+    def ring(self) -> IoUring:
+        """
+        The ``io_uring`` that this loop runs on.
+        """
+
+        return self._ring
+
+    def set_completion_handler(self, handler: Callable[[CompletionEvent], None] | None) -> None:
+        """
+        Sets a function that is called with every completion event that nothing on this loop is
+        waiting for, such as the events for operations managed by a :class:`.UringIoManager`.
+        """
+
+        self._completion_handler = handler
+
+    @override
+    def _process_events(self, event_list: list[tuple[selectors.SelectorKey, int]]) -> None:
+        super()._process_events(event_list)
+
+        for cqe in self._uring_selector.take_completions():
+            future = self._completion_futures.pop(cqe.user_data, None)
+
+            if future is None:
+                if self._completion_handler is not None:
+                    self._completion_handler(cqe)
+
+            elif not future.done():
+                future.set_result(cqe)
+
+    async def wait_for_completion(
+        self, user_data: int, *, autoraise: bool = True
+    ) -> CompletionEvent:
+        """
+        Waits for a single completion with the specified ``user_data``. The operation is submitted
+        on the next iteration of the loop.
+
+        If this is cancelled before the operation completes, the operation is cancelled on the
+        ``io_uring`` side too.
+
+        :param user_data: A ``user_data`` value returned from a submission queue function on
+            :attr:`ring`.
+
+        :param autoraise: If True, then this will automatically raise if the CQE returns an error.
+        :return: The posted completion event.
+        """
+
+        future = self.create_future()
+        self._completion_futures[user_data] = future
+
+        try:
+            cqe = await future
+        except asyncio.CancelledError:
+            if self._completion_futures.pop(user_data, None) is not None:
+                self._ring.prep_cancel(user_data, sqe_flags=_SKIP_SUCCESS)
+
+            raise
+
+        if autoraise:
+            raise_for_cqe(cqe)
+
+        return cqe
+
+    @override
+    async def sock_recv(self, sock: socket.socket, n: int) -> bytes:
+        cqe = await self.wait_for_completion(self._ring.prep_recv(sock.fileno(), n))
+        return cqe.buffer or b""
+
+    @override
+    async def sock_recv_into(self, sock: socket.socket, buf: Buffer) -> int:
+        cqe = await self.wait_for_completion(self._ring.prep_recv_into(sock.fileno(), buf))
+        return cqe.result
+
+    @override
+    async def sock_sendall(self, sock: socket.socket, data: Buffer) -> None:
+        view = memoryview(data).cast("B")
+
+        while view:
+            cqe = await self.wait_for_completion(self._ring.prep_send(sock.fileno(), view))
+            view = view[cqe.result :]
+
+    @override
+    async def sock_connect(self, sock: socket.socket, address: Any) -> None:
+        try:
+            host = ipaddress.ip_address(address[0])
+        except (TypeError, ValueError, IndexError):
+            # not a numeric address, so it has to go through the resolver first.
+            return await super().sock_connect(sock, address)
+
+        port = int(address[1])
+
+        if sock.family == socket.AF_INET and isinstance(host, ipaddress.IPv4Address):
+            user_data = self._ring.prep_connect_v4(sock.fileno(), host, port)
+        elif (
+            sock.family == socket.AF_INET6
+            and isinstance(host, ipaddress.IPv6Address)
+            and all(not it for it in address[2:])
+        ):
+            user_data = self._ring.prep_connect_v6(sock.fileno(), host, port)
+        else:
+            return await super().sock_connect(sock, address)
+
+        await self.wait_for_completion(user_data)
+
+    @override
+    async def sock_accept(self, sock: socket.socket) -> tuple[socket.socket, Any]:
+        cqe = await self.wait_for_completion(
+            self._ring.prep_accept(sock.fileno(), nonblocking=True)
+        )
+
+        conn = socket.socket(fileno=cqe.result)
+        try:
+            address = conn.getpeername()
+        except OSError:
+            # e.g. unix sockets, which have no peer name if the peer isn't bound.
+            address = ""
+
+        return conn, address
+
+    @override
+    def close(self) -> None:
+        if self.is_closed():
+            return
+
+        try:
+            super().close()
+        finally:
+            self._exit_stack.close()
+
+
+class UringEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """
+    An :mod:`asyncio` event loop policy that creates :class:`.UringEventLoop` instances.
+    """
+
+    @override
+    def new_event_loop(self) -> UringEventLoop:
+        return UringEventLoop()
+
+
+def new_event_loop() -> UringEventLoop:
+    """
+    Creates a new :class:`.UringEventLoop`. This can be passed as the ``loop_factory`` to
+    :func:`asyncio.run` or :class:`asyncio.Runner`.
+    """
+
+    return UringEventLoop()
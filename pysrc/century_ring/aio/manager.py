@@ -1,4 +1,10 @@
-import os
+import asyncio
+import errno
+import math
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from select import POLLIN, POLLOUT
 
 import anyio
 import anyio.lowlevel
@@ -6,8 +12,10 @@ import attr
 from anyio.streams.memory import MemoryObjectSendStream
 
 from century_ring._century_ring import CompletionEvent
+from century_ring.aio.waiters import CompletionWaiter, current_waiter_factory
+from century_ring.chain import PreparedChain
 from century_ring.helpers import raise_for_cqe
-from century_ring.ring import IoUring
+from century_ring.ring import AcceptableFile, IoUring
 
 
 @attr.define(slots=True, kw_only=True)
@@ -15,59 +23,169 @@ class UringIoManager:
     """
     An alternative I/O manager that uses ``io_uring`` as the underlying event driver.
 
-    This only supports running as a secondary loop currently, using an ``eventfd`` and a separate
-    task on the main selector-based event loop to wake up the waiting task and dispatch events
-    to sleeping tasks.
+    On a regular event loop, this runs as a secondary loop, using a separate task on the main
+    selector-based event loop that watches the ring's own file descriptor to wake up and dispatch
+    events to sleeping tasks. On a :class:`.UringEventLoop`, the manager shares the loop's own
+    ring and the loop dispatches completion events to it directly.
     """
 
     ring: IoUring = attr.field()
-    efd: int = attr.field()
     _force_submissions: bool = attr.field(init=True, alias="force_submissions")
+    _defer_submissions: bool = attr.field(default=False, alias="defer_submissions")
+    _reap_on_submit: bool = attr.field(default=False, alias="reap_on_submit")
 
-    _completion_waiters: dict[int, MemoryObjectSendStream[CompletionEvent]] = attr.field(
+    # single-shot operations get a lightweight waiter; only multishot operations, which can post
+    # any number of events, need a full memory stream.
+    _completion_waiters: dict[int, CompletionWaiter] = attr.field(factory=dict)
+    _completion_streams: dict[int, MemoryObjectSendStream[CompletionEvent]] = attr.field(
         factory=dict
     )
+    _new_waiter: Callable[[], CompletionWaiter] = attr.field(
+        factory=current_waiter_factory, init=False
+    )
+    _deferred_submit: asyncio.Handle | None = attr.field(default=None, init=False)
 
     # Internal functions
-    async def _dispatch_event_results(self):
+    def _dispatch_completion(self, dispatched: CompletionEvent) -> None:
+        """
+        Dispatches a single completion event to the task waiting on it.
+        """
+
+        if dispatched.should_be_ignored():
+            return
+
+        if (waiter := self._completion_waiters.pop(dispatched.user_data, None)) is not None:
+            waiter.set(dispatched)
+            return
+
+        # multishot operations keep posting events to the same stream until the final one
+        if dispatched.has_more:
+            stream = self._completion_streams.get(dispatched.user_data)
+        else:
+            stream = self._completion_streams.pop(dispatched.user_data, None)
+
+        if stream is None:  # pragma: no cover
+            # oh well
+            return
+
+        try:
+            stream.send_nowait(dispatched)
+        except (anyio.WouldBlock, anyio.BrokenResourceError):  # pragma: no cover
+            # whatever, nobody's listening anyway
+            return
+        else:
+            if not dispatched.has_more:
+                stream.close()
+
+    def _dispatch_ready(self) -> None:
+        """
+        Dispatches every completion event that is currently in the completion queue. This only
+        looks at the queue in userspace, so it's cheap to call when it's empty.
+        """
+
+        for dispatched in self.ring.get_completion_entries():
+            self._dispatch_completion(dispatched)
+
+    async def _dispatch_ring_completions(self):
         """
-        Listens on the eventfd and dispatches event completions.
+        Watches the ring's own file descriptor, which is readable whenever the completion queue
+        isn't empty, and dispatches event completions.
         """
 
+        fd = self.ring.fileno()
+
         while True:
-            await anyio.wait_readable(self.efd)
-            # discarded, we don't actually care what it says.
-            os.read(self.efd, 8)
-
-            for dispatched in self.ring.get_completion_entries():
-                if dispatched.should_be_ignored():
-                    continue
-
-                waiter = self._completion_waiters.pop(dispatched.user_data, None)
-                if waiter is None:  # pragma: no cover
-                    # oh well
-                    continue
-
-                try:
-                    waiter.send_nowait(dispatched)
-                except (anyio.WouldBlock, anyio.BrokenResourceError):  # pragma: no cover
-                    # whatever, nobody's listening anyway
-                    continue
-                else:
-                    waiter.close()
+            # something else may have already drained the queue, so check it before sleeping
+            # rather than after waking up.
+            self._dispatch_ready()
+            await anyio.wait_readable(fd)
+
+    def _cancel_abandoned(self, user_data: int) -> None:
+        """
+        Cancels an in-flight operation that nobody is waiting on anymore, so that it doesn't keep
+        running (and holding on to its buffers) until it eventually completes by itself.
+
+        If the ring has already been closed, then the operation went away with it, and this does
+        nothing; this is called while unwinding from cancellations, which mustn't be replaced by
+        an error about the closed ring.
+        """
+
+        if self.ring.closed:
+            return
+
+        # the completion for the cancellation itself has no waiter, so it's dropped by the
+        # dispatcher.
+        self.ring.prep_cancel(user_data)
+        self._submit_prepared()
+
+    def _submit_prepared(self) -> None:
+        """
+        Makes sure that newly prepared operations get submitted, according to the submission
+        policy of this manager.
+        """
+
+        if self._force_submissions:
+            self._submit()
+
+        elif self._defer_submissions and self._deferred_submit is None:
+            # every operation prepared before the callback runs goes out in the same submission.
+            self._deferred_submit = asyncio.get_running_loop().call_soon(self._run_deferred_submit)
+
+    def _submit(self) -> None:
+        self.ring.submit()
+
+        # operations that complete inline are already in the queue, so there's no point waiting
+        # for a wakeup to dispatch them.
+        if self._reap_on_submit:
+            self._dispatch_ready()
+
+    def _run_deferred_submit(self) -> None:
+        self._deferred_submit = None
+        self._submit()
+
+    def _cancel_deferred_submit(self) -> None:
+        if self._deferred_submit is not None:
+            self._deferred_submit.cancel()
+            self._deferred_submit = None
+
+    def _arm_deadline(self, user_data: int, deadline: float) -> int:
+        """
+        Arms a timer inside the ring that cancels the operation with the specified ``user_data``
+        once ``deadline`` passes, returning the user data of the timer.
+        """
+
+        # the deadline is on the async library's clock, which may not be CLOCK_MONOTONIC itself
+        # (trio's has a random offset) but runs at the same rate. as an absolute timeout, the
+        # kernel deadline is the one the caller asked for, however late the entry is submitted.
+        # rounded up, so that it never fires before ``deadline`` on the caller's clock.
+        expires = time.monotonic() + max(deadline - anyio.current_time(), 0)
+        seconds, nsec = divmod(math.ceil(expires * 1_000_000_000), 1_000_000_000)
+
+        # an expiring timeout counts as a failure, so it has to be hard-linked for the
+        # cancellation after it to run.
+        prepared = (
+            self.ring.chain(hard=True)
+            .add(IoUring.prep_timeout, seconds, nsec, absolute=True)
+            .add(IoUring.prep_cancel, user_data)
+            .prep()
+        )
+        return prepared.user_data[0]
 
     # Public API
     async def wait_for_completion(
-        self, user_data: int, *, autoraise: bool = True
+        self, user_data: int, *, autoraise: bool = True, deadline: float | None = None
     ) -> CompletionEvent:
         """
         Waits for a single completion with the specified ``user_data``.
 
-        This function *is* cancellable, but it will cause the completion event to be sent into
-        the void rather than cancelling it on the ``io_uring`` side.
+        This function *is* cancellable. If it is cancelled before the operation completes, then
+        the operation will be cancelled on the ``io_uring`` side too (see
+        :meth:`.IoUring.prep_cancel`).
 
         If ``force_submissions`` was provided when creating this manager, then this function will
-        submit all submission queue entries before suspending.
+        submit all submission queue entries before suspending. If ``defer_submissions`` was
+        provided instead, the submission is deferred to a callback on the next iteration of the
+        event loop, so that every operation started in the same iteration is submitted together.
 
         For obvious reasons, if the submission event had the ``skip_success`` flag enabled, this
         function will never work. Please do not use this function for submission events with the
@@ -75,21 +193,178 @@ class UringIoManager:
 
         :param user_data: A ``user_data`` value returned from a submission queue function.
         :param autoraise: If True, then this will automatically raise if the CQE returns an error.
+
+            If the operation was cancelled because its ``deadline`` passed, this raises
+            :class:`TimeoutError`.
+
+        :param deadline: If provided, the operation is cancelled once this deadline passes, in
+            terms of :func:`anyio.current_time`. Unlike wrapping this function in a cancel scope,
+            the timer lives inside the ring rather than on the host event loop.
+
+            This isn't free: the deadline is a timeout hard-linked to a cancellation of the
+            operation, and the timeout has to be cancelled again if the operation completes first,
+            so every operation that completes in time costs three extra submission queue entries
+            and three extra completion events. Where the operation can be prepared with its own
+            ``timeout`` argument (see :ref:`operation-timeouts`), prefer that instead, as the
+            linked timeout only costs one extra entry.
         :return: The posted completion event.
         """
 
         # TODO: make SQE functions return a SubmissionEntry that has the flags defined, then
         #       pass it to this function to prevent passing one with IOSQE_CQE_SKIP_SUCCESS.
 
-        if self._force_submissions:
-            self.ring.submit()
+        timer = self._arm_deadline(user_data, deadline) if deadline is not None else None
+
+        # the waiter has to exist before submitting, as the event may be dispatched straight away.
+        waiter = self._new_waiter()
+        self._completion_waiters[user_data] = waiter
+        self._submit_prepared()
+
+        cqe: CompletionEvent | None = None
+
+        try:
+            cqe = await waiter.wait()
+        finally:
+            # the dispatcher removes the waiter when it posts the event, so if it's still here
+            # then we were cancelled before the operation completed.
+            if self._completion_waiters.pop(user_data, None) is not None:
+                self._cancel_abandoned(user_data)
+
+            # unless the timer is what cancelled the operation, it's still armed, and would
+            # otherwise go on to cancel a user data value that's no longer in flight.
+            if timer is not None and (cqe is None or cqe.result != -errno.ECANCELED):
+                self._cancel_abandoned(timer)
 
-        send, recv = anyio.create_memory_object_stream[CompletionEvent]()
-        self._completion_waiters[user_data] = send
+        if autoraise:
+            if (
+                deadline is not None
+                and cqe.result == -errno.ECANCELED
+                and anyio.current_time() >= deadline
+            ):
+                raise TimeoutError(f"operation {user_data} didn't complete before its deadline")
 
-        async with recv:
-            cqe = await recv.receive()
-            if autoraise:
+            raise_for_cqe(cqe)
+
+        return cqe
+
+    async def wait_readable(self, fd: AcceptableFile) -> None:
+        """
+        Waits until a file descriptor is readable, using a poll operation on the ring rather than
+        the host event loop's own I/O backend.
+
+        :param fd: The file descriptor to wait on.
+        """
+
+        await self.wait_for_completion(self.ring.prep_poll(fd, POLLIN))
+
+    async def wait_writable(self, fd: AcceptableFile) -> None:
+        """
+        Waits until a file descriptor is writable, using a poll operation on the ring rather than
+        the host event loop's own I/O backend.
+
+        :param fd: The file descriptor to wait on.
+        """
+
+        await self.wait_for_completion(self.ring.prep_poll(fd, POLLOUT))
+
+    async def wait_for_chain(
+        self, chain: PreparedChain, *, autoraise: bool = True
+    ) -> list[CompletionEvent]:
+        """
+        Waits for every operation in a prepared :class:`.LinkedChain` to complete.
+
+        This function *is* cancellable, and like :meth:`.wait_for_completion`, cancelling it will
+        cancel every operation in the chain that hasn't completed yet.
+
+        :param chain: The :class:`.PreparedChain` returned from :meth:`.LinkedChain.prep`.
+        :param autoraise: If True, then this will automatically raise for the first CQE in the
+            chain that returned an error, once every operation in the chain has completed.
+        :return: The completion events for each operation in the chain, in the same order as the
+            operations were added.
+        """
+
+        # the waiters are all registered up-front as the events for the chain will usually
+        # arrive all at once.
+        waiters: list[CompletionWaiter] = []
+        for user_data in chain.user_data:
+            waiter = self._new_waiter()
+            self._completion_waiters[user_data] = waiter
+            waiters.append(waiter)
+
+        self._submit_prepared()
+
+        try:
+            cqes = [await waiter.wait() for waiter in waiters]
+        finally:
+            for user_data in chain.user_data:
+                if self._completion_waiters.pop(user_data, None) is not None:
+                    self._cancel_abandoned(user_data)
+
+        if autoraise:
+            for cqe in cqes:
                 raise_for_cqe(cqe)
 
-            return cqe
+        return cqes
+
+    async def iter_completions(
+        self, user_data: int, *, autoraise: bool = True
+    ) -> AsyncIterator[CompletionEvent]:
+        """
+        Iterates over every completion with the specified ``user_data``, for multishot operations.
+
+        This will yield every completion event posted by the operation, stopping after the final
+        event (the one without :attr:`.CompletionEvent.has_more` set).
+
+        Exiting the iterator early will cancel the operation on the ``io_uring`` side.
+
+        :param user_data: A ``user_data`` value returned from a submission queue function.
+        :param autoraise: If True, then this will automatically raise if a CQE returns an error.
+        """
+
+        send, recv = anyio.create_memory_object_stream[CompletionEvent](math.inf)
+        self._completion_streams[user_data] = send
+        self._submit_prepared()
+
+        try:
+            async with recv:
+                async for cqe in recv:
+                    if autoraise:
+                        raise_for_cqe(cqe)
+
+                    yield cqe
+        finally:
+            if (stream := self._completion_streams.pop(user_data, None)) is not None:
+                stream.close()
+                self._cancel_abandoned(user_data)
+
+    async def recv_chunks(
+        self, fd: AcceptableFile, buffer_group: int, flags: int = 0
+    ) -> AsyncIterator[bytes]:
+        """
+        Receives chunks of data from a socket using a multishot recv(2), until EOF.
+
+        The operation is automatically re-armed if the kernel terminates it early, such as if the
+        provided buffer ring temporarily runs out of buffers.
+
+        :param fd: The file descriptor of the socket to receive on.
+        :param buffer_group: The buffer group ID of a provided buffer ring to receive into. See
+            :meth:`.IoUring.register_buffer_ring`.
+
+        :param flags: A set of socket-specific flags for this operation.
+        """
+
+        while True:
+            user_data = self.ring.prep_recv_multishot(fd, buffer_group, flags)
+
+            async with aclosing(self.iter_completions(user_data, autoraise=False)) as it:
+                async for cqe in it:
+                    if cqe.result == -errno.ENOBUFS:
+                        break
+
+                    raise_for_cqe(cqe)
+
+                    if cqe.buffer_id is None:
+                        # EOF
+                        return
+
+                    yield self.ring.read_provided_buffer(buffer_group, cqe.buffer_id, cqe.result)
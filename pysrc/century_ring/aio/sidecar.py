@@ -1,4 +1,4 @@
-import os
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
@@ -6,6 +6,7 @@ from typing import Any
 import anyio
 import sniffio
 
+from century_ring.aio.loop import UringEventLoop
 from century_ring.aio.manager import UringIoManager
 from century_ring.ring import make_io_ring
 
@@ -40,33 +41,71 @@ async def start_uring_sidecar(
         When ``False``, the sidecar will wait for the host event loop to start waiting for I/O
         readiness, meaning that submissions will be batched up. When ``True``, the sidecar will
         force a full submission on every operation
+
+        On asyncio, which has no hook for when the loop starts waiting, operations are instead
+        submitted from a callback scheduled with :meth:`asyncio.loop.call_soon`, so every
+        operation started during the same loop iteration shares a single submission.
+
+    Trio has no public hook for replacing its I/O manager, so on trio the sidecar uses an
+    instrument instead: the ring is submitted right before trio goes to sleep, trio watches the
+    ring's file descriptor to wake up, and completion events are dispatched as soon as it does
+    (see :class:`.UringSidecarInstrument`).
+
+    If the running event loop is a :class:`.UringEventLoop`, the sidecar doesn't create a ring of
+    its own and instead shares the loop's ring, and the ring arguments are ignored. Operations are
+    then submitted in the same system call the loop uses to wait for events.
     """
 
+    if sniffio.current_async_library() == "asyncio":
+        loop = asyncio.get_running_loop()
+
+        if isinstance(loop, UringEventLoop):
+            manager = UringIoManager(ring=loop.ring, force_submissions=False)
+            loop.set_completion_handler(manager._dispatch_completion)
+
+            try:
+                yield manager
+            finally:
+                loop.set_completion_handler(None)
+
+            return
+
     # gross type hacking because trio keys these by themselves ?_?
     sidecar_instrument: Any | None = None
 
     with make_io_ring() as ring:
-        if (lib := sniffio.current_async_library()) == "trio":
-            from century_ring.aio.trio import UringSidecarInstrument
-
-            sidecar_instrument = UringSidecarInstrument(ring)
-            add_instrument(sidecar_instrument)
+        lib = sniffio.current_async_library()
 
-        elif lib == "asyncio":
-            # asyncio doesn't have a hook point for waiting for I/O, so instead we have to always
-            # enable this.
-            force_submissions = True
+        # asyncio doesn't have a hook point for waiting for I/O, so instead submissions are
+        # deferred to a callback that runs once per loop iteration.
+        defer_submissions = lib == "asyncio" and not force_submissions
 
         async with anyio.create_task_group() as group:
-            efd = os.eventfd(0)
-            ring.register_eventfd(efd)
-            manager = UringIoManager(ring=ring, efd=efd, force_submissions=force_submissions)
-            group.start_soon(manager._dispatch_event_results)
+            if lib == "trio":
+                from century_ring.aio.trio import UringSidecarInstrument, watch_ring_fd
+
+                # the instrument both submits and dispatches events, so no eventfd is needed.
+                manager = UringIoManager(ring=ring, force_submissions=force_submissions)
+                sidecar_instrument = UringSidecarInstrument(ring, manager)
+                add_instrument(sidecar_instrument)
+                group.start_soon(watch_ring_fd, ring)
+
+            else:
+                # the host loop watches the ring's own file descriptor, which is readable whenever
+                # there are completion events, so no eventfd is needed here either.
+                manager = UringIoManager(
+                    ring=ring,
+                    force_submissions=force_submissions,
+                    defer_submissions=defer_submissions,
+                    reap_on_submit=True,
+                )
+                group.start_soon(manager._dispatch_ring_completions)
 
             try:
                 yield manager
             finally:
                 group.cancel_scope.cancel()
+                manager._cancel_deferred_submit()
 
                 if lib == "trio":
                     remove_instrument(sidecar_instrument)
@@ -1,18 +1,28 @@
 from typing import Any, override
 
 import attr
+import outcome
+import trio
+import trio.lowlevel
 from trio.abc import Instrument
 
+from century_ring._century_ring import CompletionEvent
+from century_ring.aio.manager import UringIoManager
 from century_ring.ring import IoUring
 
 
-@attr.define(frozen=True, slots=True, hash=False)
+@attr.define(slots=True, hash=False)
 class UringSidecarInstrument(Instrument):
     """
     A :class:`trio.abc.Instrument` that is used for implementing the ``io_uring`` sidecar.
+
+    Right before trio goes to sleep, this submits the ring. Completion events are dispatched
+    straight after trio wakes up, without going through an ``eventfd``; trio itself is woken up
+    by the ring's file descriptor becoming readable.
     """
 
     ring: IoUring = attr.field()
+    manager: UringIoManager = attr.field()
 
     @override
     def __hash__(self):
@@ -20,5 +30,55 @@ class UringSidecarInstrument(Instrument):
         return id(self)
 
     @override
-    def before_io_wait(self, *args: Any, **kwargs: Any):
+    def before_io_wait(self, timeout: float):
         self.ring.submit()
+
+    @override
+    def after_io_wait(self, timeout: float):
+        for cqe in self.ring.get_completion_entries():
+            self.manager._dispatch_completion(cqe)
+
+
+class TrioCompletionWaiter:
+    """
+    A :class:`.CompletionWaiter` that parks the waiting task directly with
+    :func:`trio.lowlevel.wait_task_rescheduled`.
+    """
+
+    __slots__ = ("_task", "_cqe")
+
+    def __init__(self) -> None:
+        self._task: trio.lowlevel.Task | None = None
+        self._cqe: CompletionEvent | None = None
+
+    def _abort(self, raise_cancel: Any) -> trio.lowlevel.Abort:
+        self._task = None
+        return trio.lowlevel.Abort.SUCCEEDED
+
+    def set(self, cqe: CompletionEvent) -> None:
+        if self._cqe is not None:
+            return
+
+        self._cqe = cqe
+
+        if self._task is not None:
+            task, self._task = self._task, None
+            trio.lowlevel.reschedule(task, outcome.Value(cqe))
+
+    async def wait(self) -> CompletionEvent:
+        if self._cqe is not None:
+            return self._cqe
+
+        self._task = trio.lowlevel.current_task()
+        return await trio.lowlevel.wait_task_rescheduled(self._abort)
+
+
+async def watch_ring_fd(ring: IoUring) -> None:
+    """
+    Keeps the ring's file descriptor registered with trio, so that trio wakes up whenever there
+    are completion events. The events themselves are dispatched by the
+    :class:`.UringSidecarInstrument`.
+    """
+
+    while True:
+        await trio.lowlevel.wait_readable(ring.fileno())
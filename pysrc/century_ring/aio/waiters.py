@@ -0,0 +1,61 @@
+import asyncio
+from collections.abc import Callable
+from typing import Protocol
+
+import sniffio
+
+from century_ring._century_ring import CompletionEvent
+
+
+class CompletionWaiter(Protocol):
+    """
+    A single-shot slot that one task waits on for a single completion event.
+
+    The event may be set before the task starts waiting, in which case waiting returns
+    immediately.
+    """
+
+    def set(self, cqe: CompletionEvent) -> None:
+        """
+        Sets the completion event, waking up the waiting task. Only the first call does anything.
+        """
+
+        ...
+
+    async def wait(self) -> CompletionEvent:
+        """
+        Waits for the completion event to be set.
+        """
+
+        ...
+
+
+class AsyncioCompletionWaiter:
+    """
+    A :class:`.CompletionWaiter` backed by a bare :class:`asyncio.Future`.
+    """
+
+    __slots__ = ("_future",)
+
+    def __init__(self) -> None:
+        self._future: asyncio.Future[CompletionEvent] = asyncio.get_running_loop().create_future()
+
+    def set(self, cqe: CompletionEvent) -> None:
+        if not self._future.done():
+            self._future.set_result(cqe)
+
+    async def wait(self) -> CompletionEvent:
+        return await self._future
+
+
+def current_waiter_factory() -> Callable[[], CompletionWaiter]:
+    """
+    Gets the cheapest kind of :class:`.CompletionWaiter` for the current async library.
+    """
+
+    if sniffio.current_async_library() == "trio":
+        from century_ring.aio.trio import TrioCompletionWaiter
+
+        return TrioCompletionWaiter
+
+    return AsyncioCompletionWaiter
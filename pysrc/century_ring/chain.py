@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Concatenate, Self
+
+import attr
+
+from century_ring.helpers import make_sqe_flags
+
+if TYPE_CHECKING:
+    from century_ring.ring import IoUring
+
+_IO_LINK = make_sqe_flags(io_link=True)
+_IO_HARDLINK = make_sqe_flags(io_hardlink=True)
+_SKIP_SUCCESS = make_sqe_flags(skip_success=True)
+
+
+@attr.define(frozen=True, slots=True)
+class _ChainOperation:
+    prep: Callable[..., int] = attr.field()
+    args: tuple[Any, ...] = attr.field()
+    kwargs: dict[str, Any] = attr.field()
+
+
+@attr.define(frozen=True, slots=True)
+class _ChainTimeout:
+    seconds: int = attr.field()
+    nsec: int = attr.field()
+
+
+@attr.frozen(slots=True)
+class PreparedChain:
+    """
+    The result of preparing a :class:`.LinkedChain`.
+    """
+
+    #: The user-data values of every operation in the chain, in the order they were added.
+    user_data: list[int] = attr.field()
+
+    #: The user-data values of every linked timeout in the chain, in the order they were added.
+    timeout_user_data: list[int] = attr.field()
+
+    @property
+    def final_user_data(self) -> int:
+        """
+        The user-data value of the last operation in the chain. As the operations in a chain run
+        one after another, this is the last completion event the chain will post.
+        """
+
+        return self.user_data[-1]
+
+
+@attr.define(slots=True)
+class LinkedChain:
+    """
+    Builds a chain of operations that are linked together (see :ref:`linking`), so that each
+    operation only starts once the one before it has completed.
+
+    Operations are added with :meth:`.add` and are only pushed onto the submission queue once
+    :meth:`.prep` is called, which makes sure the entire chain goes out in the same submission.
+
+    .. code-block:: python3
+
+        chain = ring.chain()
+        chain.add(IoUring.prep_openat, None, b"/etc/hostname", direct_slot=0)
+        chain.add(IoUring.prep_read, FixedFileHandle(ring, 0), 4096)
+        chain.add(IoUring.prep_close, FixedFileHandle(ring, 0))
+        prepared = chain.prep()
+    """
+
+    _ring: IoUring = attr.field(alias="_ring")
+
+    #: If True, then the operations will be hard-linked, and a failing operation will not cancel
+    #: the operations after it.
+    hard: bool = attr.field(default=False, kw_only=True)
+
+    _entries: list[_ChainOperation | _ChainTimeout] = attr.field(factory=list, init=False)
+
+    def add[**P](
+        self,
+        prep: Callable[Concatenate[IoUring, P], int],
+        /,
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> Self:
+        """
+        Adds a new operation to the end of this chain.
+
+        :param prep: An unbound ``prep_*`` method of :class:`.IoUring`, such as
+            ``IoUring.prep_read``. Any ``sqe_flags`` passed will have the linking flags added on
+            to them.
+
+        :param args: The positional arguments to call ``prep`` with.
+        :param kwargs: The keyword arguments to call ``prep`` with.
+        :return: This chain, for chaining calls.
+        """
+
+        self._entries.append(_ChainOperation(prep, args, kwargs))
+        return self
+
+    def add_timeout(self, seconds: int, nsec: int = 0) -> Self:
+        """
+        Adds a linked timeout to the operation that was just added to this chain. If that
+        operation doesn't complete in time, it will be cancelled, which will also cancel the rest
+        of the chain.
+
+        :param seconds: The number of seconds the operation has to complete.
+        :param nsec: The number of nanoseconds, added onto the value passed for ``seconds``.
+        :return: This chain, for chaining calls.
+        """
+
+        if not self._entries or isinstance(self._entries[-1], _ChainTimeout):
+            raise ValueError("A linked timeout must come directly after an operation")
+
+        self._entries.append(_ChainTimeout(seconds, nsec))
+        return self
+
+    def prep(self) -> PreparedChain:
+        """
+        Pushes every operation in this chain onto the submission queue. If there isn't room for
+        the entire chain, the submission queue will be submitted first.
+
+        :return: A :class:`.PreparedChain` holding the user-data values of the chain.
+        """
+
+        if not any(isinstance(entry, _ChainOperation) for entry in self._entries):
+            raise ValueError("Can't prepare an empty chain")
+
+        link_flag = _IO_HARDLINK if self.hard else _IO_LINK
+
+        # operations prepared with their own ``timeout`` push a linked timeout after themselves.
+        self._ring._the_ring.reserve_sq_entries(
+            sum(
+                2 if isinstance(it, _ChainOperation) and it.kwargs.get("timeout") is not None else 1
+                for it in self._entries
+            )
+        )
+
+        user_data: list[int] = []
+        timeout_user_data: list[int] = []
+        last = len(self._entries) - 1
+
+        try:
+            for idx, entry in enumerate(self._entries):
+                link = link_flag if idx != last else 0
+
+                match entry:
+                    case _ChainOperation(prep, args, kwargs):
+                        sqe_flags = (kwargs.get("sqe_flags") or 0) | link
+                        kwargs = {**kwargs, "sqe_flags": sqe_flags}
+                        user_data.append(prep(self._ring, *args, **kwargs))
+
+                    case _ChainTimeout(seconds, nsec):
+                        timeout_user_data.append(
+                            self._ring.prep_link_timeout(seconds, nsec, sqe_flags=link)
+                        )
+
+        except BaseException:
+            # the entries that did get pushed are still linked onto whatever gets pushed next,
+            # so terminate the chain early rather than accidentally linking an unrelated entry.
+            if user_data or timeout_user_data:
+                self._ring.prep_nop(sqe_flags=_SKIP_SUCCESS)
+
+            raise
+
+        finally:
+            self._entries.clear()
+
+        return PreparedChain(user_data, timeout_user_data)
@@ -109,3 +109,70 @@ def enum_flags_to_int_flags(flags: Iterable[FileOpenFlag]) -> int:
                 final_flags |= os.O_TRUNC
 
     return final_flags
+
+
+class ReadWriteFlag(enum.Enum):
+    """
+    Enumeration of the per-operation flags for vectored reads and writes. These correspond to the
+    ``RWF_*`` flags for preadv2(2) and pwritev2(2).
+    """
+
+    #: When this flag is provided, the operation will be high priority, and the kernel may poll
+    #: for its completion rather than waiting for an interrupt. Only supported on files opened
+    #: with :attr:`.FileOpenFlag.DIRECT`.
+    HIGH_PRIORITY = os.RWF_HIPRI
+
+    #: When this flag is provided, the written data will be flushed to disk before the operation
+    #: completes, like ``O_DSYNC``.
+    DATA_SYNC = os.RWF_DSYNC
+
+    #: When this flag is provided, the written data and metadata will be flushed to disk before
+    #: the operation completes, like ``O_SYNC``.
+    SYNC = os.RWF_SYNC
+
+    #: When this flag is provided, the operation will fail with ``EAGAIN`` rather than block if
+    #: the data isn't immediately available.
+    NO_WAIT = os.RWF_NOWAIT
+
+    #: When this flag is provided, the data will be written to the end of the file, like
+    #: ``O_APPEND``. The file offset is ignored.
+    APPEND = os.RWF_APPEND
+
+
+class TaskRunMode(enum.Enum):
+    """
+    Enumeration of the ways that the kernel can run the "task work" that posts completion events
+    for finished operations.
+
+    If the requested mode isn't supported by the running kernel, or can't be used with the other
+    ring options, the ring falls back to the next best mode. The mode actually in use is available
+    from :attr:`.IoUring.task_run_mode`.
+    """
+
+    #: The kernel interrupts the process to run task work as soon as it is queued, using an
+    #: inter-processor interrupt if the process is currently running on another CPU.
+    DEFAULT = 0
+
+    #: Task work is only run the next time the process enters the kernel, which avoids the
+    #: interrupts. Requires Linux 5.19 or newer and can't be used with submission queue polling.
+    COOPERATIVE = 1
+
+    #: Task work is only run when the process waits for or reaps completions from the ring, so it
+    #: is batched up rather than interleaved with the rest of the program. Requires Linux 6.1 or
+    #: newer and ``single_issuer``, and can't be used with submission queue polling. Falls back
+    #: to :attr:`.COOPERATIVE`.
+    DEFERRED = 2
+
+
+def rw_flags_to_int_flags(flags: Iterable[ReadWriteFlag]) -> int:
+    """
+    Converts an iterable of :class:`.ReadWriteFlag` to the integer flags used by preadv2(2) and
+    friends.
+    """
+
+    final_flags = 0
+
+    for flag in flags:
+        final_flags |= flag.value
+
+    return final_flags
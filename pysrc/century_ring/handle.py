@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import os
 from types import TracebackType
-from typing import Protocol, Self, final, override
+from typing import TYPE_CHECKING, Protocol, Self, final, override
 
 from century_ring._century_ring import CompletionEvent
 from century_ring.helpers import raise_for_cqe
 
+if TYPE_CHECKING:
+    from century_ring.ring import IoUring
+
 
 class IntoFilelikeHandle(Protocol):
     """
@@ -166,3 +169,79 @@ class FdHandle(FileLikeHandle):
     @override
     def __str__(self):  # pragma: no cover
         return str(self.fd)
+
+
+@final
+class FixedFileHandle(FileLikeHandle):
+    """
+    A :class:`.FileLikeHandle` implementation that wraps a *direct descriptor*; that is, a slot
+    in the registered file table of an :class:`.IoUring`.
+
+    Direct descriptors aren't real file descriptors and are only meaningful to the ring that they
+    were created on. Operations on the ring that are passed one of these handles will automatically
+    use the ``fixed_file`` SQE flag, which skips looking up the file on every operation.
+    """
+
+    @classmethod
+    def from_completion_event(
+        cls, ring: IoUring, event: CompletionEvent, slot: int | None = None
+    ) -> Self:
+        """
+        Creates a new :class:`.FixedFileHandle` from a :class:`.CompletionEvent`.
+
+        :param ring: The ring that the direct descriptor was created on.
+        :param event: The completion event for the operation that created the direct descriptor.
+        :param slot: The slot that was explicitly requested when submitting the operation, if any.
+
+            If the kernel was left to pick a slot, then the slot is taken from the result of the
+            completion event.
+        """
+
+        raise_for_cqe(event)
+        return cls(ring, slot if slot is not None else event.result)
+
+    def __init__(self, ring: IoUring, slot: int) -> None:
+        self.ring = ring
+        self.fd = slot
+
+        self._close_called = False
+
+    @override
+    def __enter__(self) -> Self:
+        return self
+
+    @override
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> bool:
+        self.close()
+        return False
+
+    @override
+    def close_called(self) -> bool:
+        return self._close_called
+
+    @override
+    def mark_closed(self) -> None:
+        self._close_called = True
+
+    @override
+    def close(self) -> None:
+        if self._close_called:
+            return
+
+        try:
+            self.ring.update_registered_files(self.fd, [-1])
+        finally:
+            self._close_called = True
+
+    @override
+    def __repr__(self):  # pragma: no cover
+        return f"FixedFileHandle(slot={self.fd})"
+
+    @override
+    def __str__(self):  # pragma: no cover
+        return f"<direct descriptor {self.fd}>"
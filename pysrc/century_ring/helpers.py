@@ -34,9 +34,10 @@ def make_sqe_flags(
         refers to a file within the file array registered with the ``io_uring``, instead of an
         arbitrary file descriptor a process has open.
 
-        This file must have been registered with the ``io_uring`` before, and not all operations
-        support using this flag; those operations will return ``-EBADF`` in their completion queue
-        entry.
+        This file must have been registered with the ``io_uring`` before (see
+        :meth:`.IoUring.register_files`), and not all operations support using this flag; those
+        operations will return ``-EBADF`` in their completion queue entry. This flag is set
+        automatically for operations on a :class:`.FixedFileHandle`.
 
     :param io_drain:
 
@@ -1,7 +1,8 @@
 import ipaddress
 import os
 import socket
-from collections.abc import Iterable, Iterator
+from array import array
+from collections.abc import Buffer, Iterable, Iterator, Sequence
 from contextlib import contextmanager
 from os import PathLike
 
@@ -11,18 +12,48 @@ from century_ring._century_ring import (
     CompletionEvent,
     TheIoRing,
     _RUSTFFI_create_io_ring,
+    _RUSTFFI_ioring_prep_accept,
+    _RUSTFFI_ioring_prep_accept_multishot,
+    _RUSTFFI_ioring_prep_bind_v4,
+    _RUSTFFI_ioring_prep_bind_v6,
+    _RUSTFFI_ioring_prep_cancel,
     _RUSTFFI_ioring_prep_close,
+    _RUSTFFI_ioring_prep_close_many,
     _RUSTFFI_ioring_prep_connect_v4,
     _RUSTFFI_ioring_prep_connect_v6,
     _RUSTFFI_ioring_prep_create_socket,
+    _RUSTFFI_ioring_prep_link_timeout,
+    _RUSTFFI_ioring_prep_listen,
+    _RUSTFFI_ioring_prep_nop,
     _RUSTFFI_ioring_prep_openat,
+    _RUSTFFI_ioring_prep_poll_add,
     _RUSTFFI_ioring_prep_read,
+    _RUSTFFI_ioring_prep_read_fixed,
+    _RUSTFFI_ioring_prep_read_into,
+    _RUSTFFI_ioring_prep_read_many,
+    _RUSTFFI_ioring_prep_readv,
     _RUSTFFI_ioring_prep_recv,
+    _RUSTFFI_ioring_prep_recv_into,
+    _RUSTFFI_ioring_prep_recv_multishot,
     _RUSTFFI_ioring_prep_send,
+    _RUSTFFI_ioring_prep_send_zc,
+    _RUSTFFI_ioring_prep_timeout,
     _RUSTFFI_ioring_prep_write,
+    _RUSTFFI_ioring_prep_write_fixed,
+    _RUSTFFI_ioring_prep_write_many,
+    _RUSTFFI_ioring_prep_writev,
 )
-from century_ring.enums import FileOpenFlag, FileOpenMode, enum_flags_to_int_flags
-from century_ring.handle import IntoFilelikeHandle
+from century_ring.chain import LinkedChain
+from century_ring.enums import (
+    FileOpenFlag,
+    FileOpenMode,
+    ReadWriteFlag,
+    TaskRunMode,
+    enum_flags_to_int_flags,
+    rw_flags_to_int_flags,
+)
+from century_ring.handle import FixedFileHandle, IntoFilelikeHandle
+from century_ring.helpers import make_sqe_flags
 
 # Q: why wrap all of these in (relatively) identical objects?
 # A: ffi API is kinda ugly! also, no default arguments
@@ -30,6 +61,17 @@ from century_ring.handle import IntoFilelikeHandle
 # for some reason, this isn't defined in ``os``
 AT_FDCWD = -100
 
+#: Passed as a ``direct_slot`` to let the kernel pick a free slot in the registered file table.
+AUTO_SLOT = -1
+
+_FIXED_FILE = make_sqe_flags(fixed_file=True)
+_IO_LINK = make_sqe_flags(io_link=True)
+_IO_HARDLINK = make_sqe_flags(io_hardlink=True)
+_SKIP_SUCCESS = make_sqe_flags(skip_success=True)
+
+# completion events with this bit set in their user data are skipped by ``should_be_ignored``.
+_IGNORED_USER_DATA = 1 << 63
+
 type AcceptableFile = IntoFilelikeHandle | int
 
 
@@ -44,6 +86,73 @@ def unwrap_file(fd: AcceptableFile) -> int:
     return fd.as_handle().fd
 
 
+def sqe_flags_for_file(fd: AcceptableFile, sqe_flags: int | None) -> int:
+    """
+    Gets the SQE flags for an operation on the specified file, adding the ``fixed_file`` flag if
+    the file is a direct descriptor.
+    """
+
+    sqe_flags = sqe_flags if sqe_flags is not None else 0
+
+    if isinstance(fd, int):
+        return sqe_flags
+
+    if isinstance(fd.as_handle(), FixedFileHandle):
+        sqe_flags |= _FIXED_FILE
+
+    return sqe_flags
+
+
+@attr.frozen(slots=True)
+class CompletionBatch:
+    """
+    A batch of completion events, stored as parallel arrays rather than as one object per event.
+    The event at index ``i`` of the batch is described by ``user_data[i]``, ``results[i]``, and
+    ``flags[i]``.
+    """
+
+    #: The ``cqe->user_data`` field of every event in the batch.
+    user_data: array[int] = attr.field()
+
+    #: The ``cqe->res`` field of every event in the batch.
+    results: array[int] = attr.field()
+
+    #: The ``cqe->flags`` field of every event in the batch.
+    flags: array[int] = attr.field()
+
+    #: A mapping of user data to the read buffer, for only the events whose operation owned one.
+    #: This is the same value as :attr:`.CompletionEvent.buffer` would have been.
+    buffers: dict[int, bytes] = attr.field()
+
+    def __len__(self) -> int:
+        return len(self.user_data)
+
+
+@attr.frozen(slots=True)
+class RingCapabilities:
+    """
+    Describes which optional kernel features an :class:`.IoUring` is actually making use of.
+    """
+
+    #: If True, the ring's own file descriptor is registered with the kernel, which saves a file
+    #: lookup on every submit and wait. This requires Linux 5.18 or newer and ``single_issuer``,
+    #: and is never used with submission queue polling.
+    #:
+    #: The registration belongs to the thread that created the ring, so this is always False when
+    #: checked from any other thread, which uses the plain file descriptor instead.
+    registered_ring_fd: bool = attr.field()
+
+    #: If True, waiting with a timeout is done in a single syscall without posting a completion
+    #: event. See :meth:`.IoUring.submit_and_wait_with_timeout`.
+    ext_arg: bool = attr.field()
+
+    #: If True, submissions are picked up by a kernel submission poll thread.
+    sqpoll: bool = attr.field()
+
+    #: The :class:`.TaskRunMode` the ring is using.
+    task_run_mode: TaskRunMode = attr.field()
+
+
 @attr.define
 class IoUring:
     """
@@ -52,6 +161,14 @@ class IoUring:
 
     _the_ring: TheIoRing = attr.field(alias="_the_ring")
 
+    @property
+    def closed(self) -> bool:
+        """
+        Whether this ring has been closed, after which nothing can be submitted to it.
+        """
+
+        return self._the_ring.is_closed()
+
     @property
     def pending_sq_entries(self) -> int:
         """
@@ -60,6 +177,24 @@ class IoUring:
 
         return self._the_ring.pending_sq_entries()
 
+    def capabilities(self) -> RingCapabilities:
+        """
+        Gets the optional kernel features that this ring is actually making use of, which depend
+        on both the options passed to :func:`.make_io_ring` and the running kernel.
+        """
+
+        registered_ring_fd, ext_arg, sqpoll = self._the_ring.capabilities()
+        return RingCapabilities(registered_ring_fd, ext_arg, sqpoll, self.task_run_mode)
+
+    @property
+    def task_run_mode(self) -> TaskRunMode:
+        """
+        Gets the :class:`.TaskRunMode` that this ring is actually using, which may differ from the
+        one requested if the kernel doesn't support it.
+        """
+
+        return TaskRunMode(self._the_ring.task_run_mode())
+
     def submit(self) -> int:
         """
         Submits all outstanding entries in the current submission queue.
@@ -79,20 +214,25 @@ class IoUring:
 
         return self._the_ring.wait(count)
 
-    def submit_and_wait_with_timeout(self, seconds: int, nsec: int = 0) -> int:
+    def submit_and_wait_with_timeout(self, seconds: int, nsec: int = 0, count: int = 1) -> int:
         """
         Submits all outstanding entries, and waits for completions with a timeout.
 
-        This internally uses a special ``IORING_OP_TIMEOUT`` submission queue entry with a special
-        ``user_data`` value of 0xFF_FF_FF_00; any completion entry with this value should be
-        ignored.
+        The timeout is passed directly to ``io_uring_enter``, so this is a single system call and
+        no completion event is posted for the timeout itself.
+
+        On kernels older than 5.11, this instead internally uses a special ``IORING_OP_TIMEOUT``
+        submission queue entry with a special ``user_data`` value of 0xFF_FF_FF_00; any
+        completion entry with this value should be ignored. These kernels can only wait for a
+        single completion, regardless of ``count``.
 
         :param seconds: The number of seconds to wait for completions.
         :param nsec: The number of nanoseconds to wait, added onto the value passed for ``seconds``.
+        :param count: The number of completions to wait for before returning early.
         :return: The number of events successfully submitted.
         """
 
-        return self._the_ring.wait_with_timeout(seconds, nsec)
+        return self._the_ring.wait_with_timeout(seconds, nsec, count)
 
     def get_completion_entries(self) -> list[CompletionEvent]:
         """
@@ -101,7 +241,26 @@ class IoUring:
 
         return self._the_ring.get_completion_entries()
 
-    def register_eventfd(self, event_fd: int | None = None) -> int:
+    def get_completion_batch(self, max_entries: int = 4096) -> CompletionBatch:
+        """
+        Gets a batch of completion entries from the completion queue, as a
+        :class:`.CompletionBatch`.
+
+        This is equivalent to :meth:`.get_completion_entries`, but avoids creating a Python object
+        for every single completion event, which matters when draining a very large number of
+        completions at once.
+
+        :param max_entries: The maximum number of completion entries to drain. Any entries past
+            this are left in the completion queue for the next call.
+        """
+
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive", max_entries)
+
+        user_data, results, flags, buffers = self._the_ring.get_completion_batch(max_entries)
+        return CompletionBatch(user_data, results, flags, buffers)
+
+    def register_eventfd(self, event_fd: int | None = None, *, async_only: bool = False) -> int:
         """
         Registers an `eventfd <https://man7.org/linux/man-pages/man2/eventfd.2.html>`_ with the
         ``io_uring``.
@@ -114,6 +273,12 @@ class IoUring:
 
             If this is None, then an eventfd will be created with sane flags for you.
 
+        :param async_only: If True, the eventfd is only written to for operations that complete
+            asynchronously (``IORING_REGISTER_EVENTFD_ASYNC``). Operations that complete inline
+            while being submitted don't notify it, so the completion queue should be checked
+            directly after submitting instead. This saves a wakeup for events that the submitter
+            could have reaped by itself.
+
         :return: The ``event_fd`` passed in, or one created by this function.
 
         .. warning::
@@ -125,9 +290,200 @@ class IoUring:
         if event_fd is None:
             event_fd = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
 
-        self._the_ring.register_eventfd(event_fd)
+        self._the_ring.register_eventfd(event_fd, async_only)
         return event_fd
 
+    def register_buffers(self, count: int, size: int) -> None:
+        """
+        Registers a pool of fixed buffers with the ``io_uring``.
+
+        The kernel pins and maps the memory for these buffers once, at registration time, rather
+        than on every operation. Operations that use the pool (:meth:`.prep_read_fixed` and
+        :meth:`.prep_write_fixed`) refer to a buffer by its index, from zero up to ``count - 1``.
+
+        Only one pool may be registered with a ring at any one time.
+
+        :param count: The number of buffers in the pool.
+        :param size: The size of each individual buffer, in bytes.
+        """
+
+        self._the_ring.register_buffers(count, size)
+
+    def unregister_buffers(self) -> None:
+        """
+        Unregisters the fixed buffer pool previously registered with :meth:`.register_buffers`.
+
+        This will fail with a :class:`.ValueError` if there are any operations using the pool that
+        have not had their completion event reaped yet.
+        """
+
+        self._the_ring.unregister_buffers()
+
+    def read_registered_buffer(self, index: int, count: int, offset: int = 0) -> bytes:
+        """
+        Copies data out of a registered buffer, typically after a :meth:`.prep_read_fixed` call
+        has completed.
+
+        :param index: The index of the buffer within the pool.
+        :param count: The number of bytes to copy out.
+        :param offset: The offset within the buffer to start copying from.
+        """
+
+        return self._the_ring.read_registered_buffer(index, offset, count)
+
+    def write_registered_buffer(self, index: int, data: Buffer, offset: int = 0) -> int:
+        """
+        Copies data into a registered buffer, typically before a :meth:`.prep_write_fixed` call.
+
+        Don't do this whilst an operation using the same buffer is in flight.
+
+        :param index: The index of the buffer within the pool.
+        :param data: The data to copy into the buffer.
+        :param offset: The offset within the buffer to start copying to.
+        :return: The number of bytes copied.
+        """
+
+        return self._the_ring.write_registered_buffer(index, offset, data)
+
+    def register_buffer_ring(self, group: int, count: int, size: int) -> None:
+        """
+        Registers a provided buffer ring with the ``io_uring`` under a buffer group ID.
+
+        Reads and receives submitted with a ``buffer_group`` don't allocate their own buffer;
+        instead, the kernel picks a free buffer out of the ring only once data is available. This
+        means that an operation waiting on an idle socket costs no buffer memory at all.
+
+        The completion event for such an operation will have the ID of the picked buffer in
+        :attr:`.CompletionEvent.buffer_id`, and no :attr:`.CompletionEvent.buffer`. The picked
+        buffer is *checked out* until it is handed back with :meth:`.read_provided_buffer` or
+        :meth:`.recycle_provided_buffer`; if every buffer in the ring is checked out, operations
+        will fail with ``ENOBUFS``.
+
+        :param group: The buffer group ID to register the ring under, from 0 to 65535.
+        :param count: The number of buffers in the ring. This must be a power of two.
+        :param size: The size of each individual buffer, in bytes.
+        """
+
+        self._the_ring.register_buffer_ring(group, count, size)
+
+    def unregister_buffer_ring(self, group: int) -> None:
+        """
+        Unregisters a provided buffer ring previously registered with
+        :meth:`.register_buffer_ring`.
+
+        This will fail with a :class:`.ValueError` if there are any operations using this buffer
+        group that have not had their completion event reaped yet.
+        """
+
+        self._the_ring.unregister_buffer_ring(group)
+
+    def read_provided_buffer(
+        self, group: int, buffer_id: int, count: int, *, recycle: bool = True
+    ) -> bytes:
+        """
+        Copies data out of a buffer picked from a provided buffer ring.
+
+        :param group: The buffer group ID that the operation was submitted with.
+        :param buffer_id: The :attr:`.CompletionEvent.buffer_id` of the completion event.
+        :param count: The number of bytes to copy out, usually :attr:`.CompletionEvent.result`.
+        :param recycle: If True, then the buffer will be handed back to the kernel afterwards.
+        """
+
+        return self._the_ring.read_provided_buffer(group, buffer_id, count, recycle)
+
+    def recycle_provided_buffer(self, group: int, buffer_id: int) -> None:
+        """
+        Hands a buffer picked from a provided buffer ring back to the kernel, without reading it.
+
+        :param group: The buffer group ID that the operation was submitted with.
+        :param buffer_id: The :attr:`.CompletionEvent.buffer_id` of the completion event.
+        """
+
+        self._the_ring.recycle_provided_buffer(group, buffer_id)
+
+    def register_files(self, count: int) -> None:
+        """
+        Registers a sparse file table of ``count`` empty slots with the ``io_uring``.
+
+        Slots in the table can be filled with *direct descriptors*, either by passing a
+        ``direct_slot`` to :meth:`.prep_openat`, :meth:`.prep_create_socket` or
+        :meth:`.prep_accept`, or by installing an existing file descriptor with
+        :meth:`.update_registered_files`. Operations on a direct descriptor skip looking up the
+        file on every operation, and don't touch the process-wide file descriptor table at all.
+
+        Direct descriptors should be wrapped in a :class:`.FixedFileHandle` to be used with the
+        rest of the ring's operations.
+
+        :param count: The number of slots in the file table.
+        """
+
+        self._the_ring.register_files(count)
+
+    def update_registered_files(self, offset: int, fds: Iterable[int]) -> int:
+        """
+        Replaces slots in the registered file table, starting at ``offset``.
+
+        The file descriptors passed in are duplicated into the table; closing them afterwards
+        doesn't affect the direct descriptor. A file descriptor of ``-1`` empties the slot,
+        closing the direct descriptor that was there previously.
+
+        :param offset: The first slot to update.
+        :param fds: The file descriptors to place into the slots.
+        :return: The number of slots updated.
+        """
+
+        return self._the_ring.update_registered_files(offset, list(fds))
+
+    def unregister_files(self) -> None:
+        """
+        Unregisters the file table previously registered with :meth:`.register_files`, closing
+        every direct descriptor that was still in the table.
+        """
+
+        self._the_ring.unregister_files()
+
+    def fileno(self) -> int:
+        """
+        Gets the file descriptor of the ``io_uring`` itself.
+        """
+
+        return self._the_ring.fileno()
+
+    def register_iowq_max_workers(
+        self, bounded: int | None = None, unbounded: int | None = None
+    ) -> tuple[int, int]:
+        """
+        Limits the number of kernel worker threads that this ring's io-wq pool may spawn for
+        operations that can't complete without blocking. If the pool is shared with other rings
+        (see ``attach_wq`` for :func:`.make_io_ring`), the limits apply to all of them.
+
+        :param bounded: The maximum number of workers for operations that take a bounded amount of
+            time, such as reads from regular files. If None, this limit is left unchanged.
+
+        :param unbounded: The maximum number of workers for operations that may never complete,
+            such as reads from sockets. If None, this limit is left unchanged.
+
+        :return: The previous ``(bounded, unbounded)`` limits.
+        """
+
+        return self._the_ring.register_iowq_max_workers(bounded or 0, unbounded or 0)
+
+    def register_iowq_aff(self, cpus: Iterable[int]) -> None:
+        """
+        Pins the kernel worker threads of this ring's io-wq pool to a set of CPUs.
+
+        :param cpus: The indexes of the CPUs that the workers may run on.
+        """
+
+        self._the_ring.register_iowq_aff(list(cpus))
+
+    def unregister_iowq_aff(self) -> None:
+        """
+        Removes the CPU affinity previously set with :meth:`.register_iowq_aff`.
+        """
+
+        self._the_ring.unregister_iowq_aff()
+
     # actual methods
     def prep_openat(
         self,
@@ -137,6 +493,9 @@ class IoUring:
         flags: Iterable[FileOpenFlag] | None = None,
         permissions: int = 0o666,
         sqe_flags: int | None = None,
+        *,
+        direct_slot: int | None = None,
+        timeout: float | None = None,
     ) -> int:
         """
         Prepares an openat(2) call. See the relevant man page for more details.
@@ -168,6 +527,12 @@ class IoUring:
             file will be created with ``0o644`` permissions.
 
         :param sqe_flags: See :func:`.make_uring_flags`.
+        :param direct_slot: If provided, the file will be opened as a direct descriptor in this
+            slot of the registered file table, rather than as a regular file descriptor. See
+            :meth:`.register_files`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
         :return: The user-data value that was stored in the SQE.
         """
 
@@ -181,273 +546,1186 @@ class IoUring:
             dirfd = relative_to.as_handle().fd
 
         raw_flags = enum_flags_to_int_flags(flags) if flags else os.O_CLOEXEC
-        user_data = self._the_ring.get_next_user_data()
 
         raw_flags |= open_mode.value
         sqe_flags = sqe_flags if sqe_flags is not None else 0
 
-        _RUSTFFI_ioring_prep_openat(
-            self._the_ring, dirfd, os.fsencode(path), user_data, raw_flags, permissions, sqe_flags
+        user_data = _RUSTFFI_ioring_prep_openat(
+            self._the_ring,
+            dirfd,
+            os.fsencode(path),
+            None,
+            raw_flags,
+            permissions,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            direct_slot,
         )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
         return user_data
 
-    def prep_close(self, fd: AcceptableFile, *, sqe_flags: int | None = None) -> int:
+    def prep_nop(self, *, sqe_flags: int | None = None) -> int:
         """
-        Prepares a close(2) call. See the relevant man page for more details.
+        Prepares a no-op, which does nothing and completes immediately with a result of zero.
 
-        :param fd: The file handle to close.
-        :return: The user-data value that was stored in the SQE.
         :param sqe_flags: See :func:`.make_uring_flags`.
+        :return: The user-data value that was stored in the SQE.
         """
 
         sqe_flags = sqe_flags if sqe_flags is not None else 0
+        return _RUSTFFI_ioring_prep_nop(self._the_ring, None, sqe_flags)
 
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_close(self._the_ring, unwrap_file(fd), user_data, sqe_flags)
-
-        if not isinstance(fd, int):
-            fd.as_handle().mark_closed()
-
-        return user_data
-
-    def prep_read(
-        self, fd: AcceptableFile, byte_count: int, offset: int = -1, *, sqe_flags: int | None = None
+    def prep_link_timeout(
+        self, seconds: int, nsec: int = 0, *, sqe_flags: int | None = None
     ) -> int:
         """
-        Prepares a pread(2) call. See the relevant man page for more details.
-
-        The completion queue event for this submission will have the byte count as the result
-        field, and a buffer containing the data read from the file.
+        Prepares a linked timeout for the operation directly before it in the submission queue,
+        which must have been submitted with the ``io_link`` flag. If that operation doesn't
+        complete within the timeout, it is cancelled.
 
-        :param fd: The file descriptor to read the data from.
-        :param byte_count: The *maximum* number of bytes to read. The actual amount may be lower.
-        :param offset: The offset within the file to read from.
+        The completion queue event for this submission will have a result of ``-ETIME`` if the
+        timeout fired, or ``-ECANCELED`` if the operation completed first.
 
-            If this is a positive integer, this is an absolute offset within the file to read from.
-            If this is the constant ``-1``, then this will read from the current file's seek
-            position.
+        Prefer using :meth:`.chain` over calling this directly.
 
+        :param seconds: The number of seconds the operation has to complete.
+        :param nsec: The number of nanoseconds, added onto the value passed for ``seconds``.
         :param sqe_flags: See :func:`.make_uring_flags`.
         :return: The user-data value that was stored in the SQE.
         """
 
-        if offset < 0 and offset < -1:
-            raise ValueError("Can't pass negative offset", offset, "for this operation")
-
         sqe_flags = sqe_flags if sqe_flags is not None else 0
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_read(
-            self._the_ring, unwrap_file(fd), byte_count, offset, user_data, sqe_flags
-        )
-        return user_data
+        return _RUSTFFI_ioring_prep_link_timeout(self._the_ring, seconds, nsec, None, sqe_flags)
 
-    def prep_write(
+    def prep_poll(
         self,
         fd: AcceptableFile,
-        buffer: bytes | bytearray,
-        file_offset: int = -1,
-        count: int | None = None,
-        buffer_offset: int | None = None,
+        events: int,
         *,
+        multishot: bool = False,
         sqe_flags: int | None = None,
+        timeout: float | None = None,
     ) -> int:
         """
-        Prepares a pwrite(2) call. See the relevant man page for more details.
-
-        The completion queue event for this submission will have the actual byte count *written*
-        in the result field, as well as a copy of the buffer that was written for memory safetty
-        purposes. The byte count may be less than the count requested.
-
-        :param fd: The file descriptor to write the data to.
-        :param buffer: The bytestring or bytearray to send.
-
-            This is copied into the Rust-side code before submission; large buffer sizes will cause
-            excessive memory usage.
-
-        :param file_offset: The offset within the file to write at.
+        Prepares a poll(2)-style readiness check of a file descriptor, which completes once the
+        file is ready for any of the requested events.
 
-            If this is a positive integer, this is an absolute offset within the file to write at.
-            If this is the constant ``-1``, then this will write at the current file's seek
-            position.
-
-        :param count: The number of bytes to write from the provided buffer.
-
-            This defaults to the size of the buffer, and cannot be larger than the buffer.
+        The completion queue event for this submission will have the mask of ready events stored
+        in the result field.
 
-        :param buffer_offset: The offset within the buffer to start writing from.
+        :param fd: The file descriptor to poll.
+        :param events: The mask of events to wait for, such as :data:`select.POLLIN` or
+            :data:`select.POLLOUT`.
 
-            This defaults to the first byte of the buffer, and cannot be beyond the end of the
-            buffer.
+        :param multishot: If True, the poll stays armed and posts a completion event every time
+            the file becomes ready, until it is cancelled. Each of these events will have
+            :attr:`.CompletionEvent.has_more` set. This can't be combined with ``timeout``.
 
         :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
         :return: The user-data value that was stored in the SQE.
         """
 
-        if file_offset < -1:
-            raise ValueError("Can't pass negative offset", file_offset, "for this operation")
-
-        size = count if count is not None else len(buffer)
-        buffer_offset = buffer_offset if buffer_offset is not None else 0
+        if multishot and timeout is not None:
+            raise ValueError("Can't use a timeout with a multishot poll")
 
-        user_data = self._the_ring.get_next_user_data()
-        sqe_flags = sqe_flags if sqe_flags is not None else 0
-        _RUSTFFI_ioring_prep_write(
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_poll_add(
             self._the_ring,
             unwrap_file(fd),
-            buffer,
-            size,
-            buffer_offset,
-            file_offset,
-            user_data,
-            sqe_flags,
+            events,
+            multishot,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
         )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
         return user_data
 
-    def prep_create_socket(
+    def prep_timeout(
         self,
-        domain: int,
-        type: int,
-        protocol: int = 0,
+        seconds: int,
+        nsec: int = 0,
         *,
-        nonblocking: bool = False,
+        absolute: bool = False,
         sqe_flags: int | None = None,
     ) -> int:
         """
-        Prepares a socket(2) call. See the relevant man page for more information.
-
-        :param domain: The "domain" (better known as protocol family) for this socket.
-
-            In nearly all cases, this will be :attr:`socket.AF_INET` or :attr:`socket.AF_INET6`.
-
-        :param type: The type for this socket.
-
-            In nearly all cases, this will be :attr:`socket.SOCK_STREAM` or
-            :attr:`socket.SOCK_DGRAM`.
-
-        :param protocol: The protocol that this socket will carry.
+        Prepares a standalone timeout, which does nothing until it expires.
 
-            This should match the value passed for ``type``, i.e. don't pass
-            :attr:`socket.IPPROTO_UDP` for a ``SOCK_STREAM`` socket.
-
-        :param nonblocking: If true, then this socket will be created as a non-blocking socket.
+        The completion queue event for this submission will have a result of ``-ETIME`` once the
+        timeout expires, or ``-ECANCELED`` if it was cancelled with :meth:`.prep_cancel` first.
 
-            This saves an extra call to fcntl(2) to set O_NONBLOCK.
+        :param seconds: The number of seconds until the timeout expires.
+        :param nsec: The number of nanoseconds, added onto the value passed for ``seconds``.
+        :param absolute: If True, ``seconds`` and ``nsec`` are the time the timeout expires at on
+            the ``CLOCK_MONOTONIC`` clock (see :func:`time.monotonic`), rather than a duration
+            that only starts once the entry is submitted.
 
         :param sqe_flags: See :func:`.make_uring_flags`.
         :return: The user-data value that was stored in the SQE.
         """
 
-        user_data = self._the_ring.get_next_user_data()
-        type |= socket.SOCK_CLOEXEC
-
-        if nonblocking:
-            type |= socket.SOCK_NONBLOCK
-
         sqe_flags = sqe_flags if sqe_flags is not None else 0
-
-        _RUSTFFI_ioring_prep_create_socket(
-            self._the_ring, domain, type, protocol, user_data, sqe_flags
+        return _RUSTFFI_ioring_prep_timeout(
+            self._the_ring, seconds, nsec, absolute, None, sqe_flags
         )
-        return user_data
 
-    def prep_connect_v4(
+    def prep_cancel(
         self,
-        fd: AcceptableFile,
-        address: str | ipaddress.IPv4Address,
-        port: int,
+        user_data: int | None = None,
         *,
+        fd: AcceptableFile | None = None,
+        match_all: bool = False,
         sqe_flags: int | None = None,
     ) -> int:
         """
-        Prepares a connect(2) call for an IPv4 address. See the relevant man page for more info.
+        Prepares a cancellation of operations that have already been submitted and are still in
+        flight.
 
-        :param fd: The file descriptor of the socket to connect using.
-        :param address: The IPv4 address to connect to.
+        The operations to cancel are matched either by the ``user_data`` value returned when they
+        were prepared, or by the file they operate on. If neither is provided, then *every*
+        in-flight operation on this ring is cancelled.
 
-            This should either be a :class:`str` containing the four-octet IPv4 address
-            (e.g. ``'172.16.39.25``) or a :class:`ipaddress.IPv4Address`.
+        A cancelled operation completes with a result of ``-ECANCELED``, and any data owned by it
+        (such as its buffer) is freed once that completion event is reaped.
+
+        The completion queue event for this submission will have a result of ``0`` if an operation
+        was cancelled, ``-ENOENT`` if no matching operation was found, or ``-EALREADY`` if the
+        operation was already running and couldn't be interrupted. When cancelling more than one
+        operation, the result is the number of operations that were cancelled instead.
+
+        Cancelling by file, or cancelling more than one operation, requires Linux 5.19 or newer.
+
+        :param user_data: The user-data value of the operation to cancel.
+        :param fd: The file descriptor whose operations should be cancelled.
+        :param match_all: If True, then every matching operation is cancelled rather than only
+            the first one. This is implied when neither ``user_data`` nor ``fd`` is provided.
 
-        :param port: The port to connect to.
         :param sqe_flags: See :func:`.make_uring_flags`.
         :return: The user-data value that was stored in the SQE.
         """
 
         sqe_flags = sqe_flags if sqe_flags is not None else 0
 
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_connect_v4(
-            self._the_ring, unwrap_file(fd), str(address), port, user_data, sqe_flags
+        if fd is None:
+            return _RUSTFFI_ioring_prep_cancel(
+                self._the_ring, user_data, None, False, match_all, None, sqe_flags
+            )
+
+        fixed = not isinstance(fd, int) and isinstance(fd.as_handle(), FixedFileHandle)
+        return _RUSTFFI_ioring_prep_cancel(
+            self._the_ring, user_data, unwrap_file(fd), fixed, match_all, None, sqe_flags
         )
-        return user_data
 
-    def prep_connect_v6(
-        self,
-        fd: AcceptableFile,
-        address: str | ipaddress.IPv6Address,
-        port: int,
-        *,
-        sqe_flags: int | None = None,
-    ) -> int:
+    # both of these are only called for operations that actually have a timeout, so that the
+    # (much more common) untimed operations stay a single call into Rust.
+    def _link_timeout_flag(self, timeout: float) -> int:
         """
-        Prepares a connect(2) call for an IPv4 address. See the relevant man page for more info.
-
-        :param fd: The file descriptor of the socket to connect using.
-        :param address: The IPv6 address to connect to.
-        :param port: The port to connect to.
-        :param sqe_flags: See :func:`.make_uring_flags`.
-        :return: The user-data value that was stored in the SQE.
+        Gets the extra SQE flags for an operation with the specified ``timeout``, making room in
+        the submission queue for both the operation and its linked timeout.
         """
 
-        sqe_flags = sqe_flags if sqe_flags is not None else 0
+        if timeout < 0:
+            raise ValueError("Can't pass negative timeout", timeout)
 
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_connect_v6(
-            self._the_ring, unwrap_file(fd), str(address), port, user_data, sqe_flags
-        )
+        self._the_ring.reserve_sq_entries(2)
+        return _IO_LINK
+
+    def _push_link_timeout(self, timeout: float, sqe_flags: int) -> None:
+        """
+        Pushes the linked timeout for the operation that was just prepared.
+
+        :param sqe_flags: The SQE flags the operation was *originally* prepared with.
+        """
+
+        seconds, nsec = divmod(round(timeout * 1_000_000_000), 1_000_000_000)
+
+        # the completion of the timeout itself is of no interest to anyone.
+        user_data = self._the_ring.get_next_user_data() | _IGNORED_USER_DATA
+
+        try:
+            # if the operation was part of a larger chain, the timeout has to continue it.
+            _RUSTFFI_ioring_prep_link_timeout(
+                self._the_ring, seconds, nsec, user_data, sqe_flags & (_IO_LINK | _IO_HARDLINK)
+            )
+        except BaseException:
+            # the operation is linked onto whatever gets pushed next, so end the link here.
+            self.prep_nop(sqe_flags=_SKIP_SUCCESS)
+            raise
+
+    def chain(self, *, hard: bool = False) -> LinkedChain:
+        """
+        Creates a new :class:`.LinkedChain` for this ring, which can be used to submit several
+        operations that run one after another as a single submission.
+
+        :param hard: If True, then the operations will be hard-linked, and a failing operation
+            will not cancel the operations after it.
+        """
+
+        return LinkedChain(self, hard=hard)
+
+    def prep_close(
+        self,
+        fd: AcceptableFile,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a close(2) call. See the relevant man page for more details.
+
+        If ``fd`` is a :class:`.FixedFileHandle`, then the direct descriptor will be removed from
+        the registered file table instead.
+
+        :param fd: The file handle to close.
+        :return: The user-data value that was stored in the SQE.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+        """
+
+        sqe_flags = sqe_flags if sqe_flags is not None else 0
+
+        if isinstance(fd, int) and timeout is None:
+            return _RUSTFFI_ioring_prep_close(self._the_ring, fd, None, sqe_flags, False)
+
+        fixed = not isinstance(fd, int) and isinstance(fd.as_handle(), FixedFileHandle)
+        user_data = _RUSTFFI_ioring_prep_close(
+            self._the_ring,
+            unwrap_file(fd),
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            fixed,
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+
+        if not isinstance(fd, int):
+            fd.as_handle().mark_closed()
+
+        return user_data
+
+    def prep_close_many(self, fds: Sequence[int], *, sqe_flags: int | None = None) -> array[int]:
+        """
+        Prepares many close(2) calls at once. This is equivalent to calling :meth:`.prep_close`
+        once per file descriptor, but pushes every submission queue entry in a single call.
+
+        The entries are pushed in the same way as :meth:`.prep_read_many`.
+
+        :param fds: The raw file descriptors to close. Handles are not accepted here.
+        :param sqe_flags: See :func:`.make_uring_flags`. These are applied to every entry.
+        :return: An ``array('Q')`` of the user-data values stored in each SQE, in the same order
+            as ``fds``.
+        """
+
+        sqe_flags = sqe_flags if sqe_flags is not None else 0
+        return _RUSTFFI_ioring_prep_close_many(self._the_ring, fds, sqe_flags)
+
+    def prep_read(
+        self,
+        fd: AcceptableFile,
+        byte_count: int,
+        offset: int = -1,
+        *,
+        buffer_group: int | None = None,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pread(2) call. See the relevant man page for more details.
+
+        The completion queue event for this submission will have the byte count as the result
+        field, and a buffer containing the data read from the file.
+
+        :param fd: The file descriptor to read the data from.
+        :param byte_count: The *maximum* number of bytes to read. The actual amount may be lower.
+        :param offset: The offset within the file to read from.
+
+            If this is a positive integer, this is an absolute offset within the file to read from.
+            If this is the constant ``-1``, then this will read from the current file's seek
+            position.
+
+        :param buffer_group: If provided, the buffer group ID of a provided buffer ring to read
+            into instead of allocating a new buffer. See :meth:`.register_buffer_ring`.
+
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if offset < 0 and offset < -1:
+            raise ValueError("Can't pass negative offset", offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_read(
+            self._the_ring,
+            unwrap_file(fd),
+            byte_count,
+            offset,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            buffer_group,
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_read_into(
+        self,
+        fd: AcceptableFile,
+        buffer: Buffer,
+        count: int | None = None,
+        offset: int = -1,
+        buffer_offset: int = 0,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pread(2) call directly into a writable buffer. See the relevant man page for
+        more details.
+
+        Unlike :meth:`.prep_read`, no buffer is allocated; the kernel writes the data straight into
+        the passed buffer, which is held by the ring until the operation completes. The completion
+        queue event for this submission will have the byte count as the result field, but no
+        buffer.
+
+        :param fd: The file descriptor to read the data from.
+        :param buffer: Any writable object supporting the buffer protocol, such as a
+            :class:`bytearray`, a :class:`memoryview` of one, or a writable :class:`mmap.mmap`.
+
+            This must not be read from or written to until the operation completes.
+
+        :param count: The *maximum* number of bytes to read. The actual amount may be lower.
+
+            This defaults to the rest of the buffer after ``buffer_offset``, and cannot be larger.
+
+        :param offset: The offset within the file to read from. See :meth:`.prep_read`.
+        :param buffer_offset: The offset within the buffer to start reading into.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if offset < -1:
+            raise ValueError("Can't pass negative offset", offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_read_into(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer,
+            count,
+            buffer_offset,
+            offset,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_read_fixed(
+        self,
+        fd: AcceptableFile,
+        buffer_index: int,
+        byte_count: int,
+        offset: int = -1,
+        buffer_offset: int = 0,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pread(2) call into a buffer from the registered buffer pool. See
+        :meth:`.register_buffers` for more details.
+
+        The completion queue event for this submission will have the byte count as the result
+        field, but no buffer; use :meth:`.read_registered_buffer` to get the data.
+
+        :param fd: The file descriptor to read the data from.
+        :param buffer_index: The index of the registered buffer to read into.
+        :param byte_count: The *maximum* number of bytes to read. The actual amount may be lower.
+        :param offset: The offset within the file to read from. See :meth:`.prep_read`.
+        :param buffer_offset: The offset within the registered buffer to start reading into.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if offset < -1:
+            raise ValueError("Can't pass negative offset", offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_read_fixed(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer_index,
+            buffer_offset,
+            byte_count,
+            offset,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_write_fixed(
+        self,
+        fd: AcceptableFile,
+        buffer_index: int,
+        count: int,
+        file_offset: int = -1,
+        buffer_offset: int = 0,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pwrite(2) call from a buffer in the registered buffer pool. See
+        :meth:`.register_buffers` for more details.
+
+        :param fd: The file descriptor to write the data to.
+        :param buffer_index: The index of the registered buffer to write from.
+        :param count: The number of bytes to write from the registered buffer.
+        :param file_offset: The offset within the file to write at. See :meth:`.prep_write`.
+        :param buffer_offset: The offset within the registered buffer to start writing from.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if file_offset < -1:
+            raise ValueError("Can't pass negative offset", file_offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_write_fixed(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer_index,
+            buffer_offset,
+            count,
+            file_offset,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_write(
+        self,
+        fd: AcceptableFile,
+        buffer: Buffer,
+        file_offset: int = -1,
+        count: int | None = None,
+        buffer_offset: int | None = None,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pwrite(2) call. See the relevant man page for more details.
+
+        The completion queue event for this submission will have the actual byte count *written*
+        in the result field. The byte count may be less than the count requested.
+
+        :param fd: The file descriptor to write the data to.
+        :param buffer: Any object supporting the buffer protocol, such as :class:`bytes`,
+            :class:`bytearray`, :class:`memoryview` or :class:`mmap.mmap`.
+
+            This is *not* copied; instead, the ring holds onto the buffer until the operation
+            completes. If the buffer is mutable, it must not be modified until then.
+
+        :param file_offset: The offset within the file to write at.
+
+            If this is a positive integer, this is an absolute offset within the file to write at.
+            If this is the constant ``-1``, then this will write at the current file's seek
+            position.
+
+        :param count: The number of bytes to write from the provided buffer.
+
+            This defaults to the size of the buffer, and cannot be larger than the buffer.
+
+        :param buffer_offset: The offset within the buffer to start writing from.
+
+            This defaults to the first byte of the buffer, and cannot be beyond the end of the
+            buffer.
+
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if file_offset < -1:
+            raise ValueError("Can't pass negative offset", file_offset, "for this operation")
+
+        buffer_offset = buffer_offset if buffer_offset is not None else 0
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_write(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer,
+            count,
+            buffer_offset,
+            file_offset,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_readv(
+        self,
+        fd: AcceptableFile,
+        buffers: Sequence[Buffer],
+        offset: int = -1,
+        *,
+        rw_flags: Iterable[ReadWriteFlag] = (),
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a preadv2(2) call, scattering the data read into several writable buffers in
+        order. See the relevant man page for more details.
+
+        Like :meth:`.prep_read_into`, the data is read directly into the passed buffers, which are
+        held by the ring until the operation completes. The completion queue event for this
+        submission will have the total byte count across every buffer as the result field, but no
+        buffer.
+
+        :param fd: The file descriptor to read the data from.
+        :param buffers: The writable buffers to read into. Each buffer is filled completely before
+            moving onto the next one.
+        :param offset: The offset within the file to read from. See :meth:`.prep_read`.
+        :param rw_flags: A set of :class:`.ReadWriteFlag` for this operation.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if offset < -1:
+            raise ValueError("Can't pass negative offset", offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_readv(
+            self._the_ring,
+            unwrap_file(fd),
+            buffers,
+            offset,
+            rw_flags_to_int_flags(rw_flags),
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_writev(
+        self,
+        fd: AcceptableFile,
+        buffers: Sequence[Buffer],
+        file_offset: int = -1,
+        *,
+        rw_flags: Iterable[ReadWriteFlag] = (),
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a pwritev2(2) call, gathering the data to write from several buffers in order.
+        See the relevant man page for more details.
+
+        This avoids having to concatenate e.g. a message header, body, and trailer into a single
+        buffer before writing it. None of the buffers are copied; like :meth:`.prep_write`, the
+        ring holds onto every buffer until the operation completes.
+
+        The completion queue event for this submission will have the total byte count *written*
+        in the result field, which may be less than the total size of the buffers.
+
+        :param fd: The file descriptor to write the data to.
+        :param buffers: Any objects supporting the buffer protocol, such as :class:`bytes` or
+            :class:`bytearray`.
+        :param file_offset: The offset within the file to write at. See :meth:`.prep_write`.
+        :param rw_flags: A set of :class:`.ReadWriteFlag` for this operation.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        if file_offset < -1:
+            raise ValueError("Can't pass negative offset", file_offset, "for this operation")
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_writev(
+            self._the_ring,
+            unwrap_file(fd),
+            buffers,
+            file_offset,
+            rw_flags_to_int_flags(rw_flags),
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_read_many(
+        self,
+        fds: Sequence[int],
+        sizes: Sequence[int] | int,
+        offsets: Sequence[int] | None = None,
+        *,
+        sqe_flags: int | None = None,
+    ) -> array[int]:
+        """
+        Prepares many pread(2) calls at once. This is equivalent to calling :meth:`.prep_read`
+        once per file descriptor, but pushes every submission queue entry in a single call.
+
+        If there isn't room in the submission queue for every entry, it is submitted first (as
+        long as the ring was created with ``autosubmit``), so that either all of the entries are
+        pushed or none are. Batches bigger than the submission queue itself are pushed a queue's
+        worth at a time; if submitting fails part of the way through one, the raised exception
+        has a ``user_data`` attribute with the user data of the entries that were already pushed.
+
+        :param fds: The raw file descriptors to read from. These can be a list, or an
+            :class:`array.array` for the least overhead. Handles are not accepted here.
+        :param sizes: The *maximum* number of bytes to read from each file descriptor, or a single
+            integer to read the same maximum amount from every file descriptor.
+        :param offsets: The offset within each file to read from, or None to read from the current
+            seek position of every file. See :meth:`.prep_read`.
+        :param sqe_flags: See :func:`.make_uring_flags`. These are applied to every entry.
+        :return: An ``array('Q')`` of the user-data values stored in each SQE, in the same order
+            as ``fds``.
+        """
+
+        sqe_flags = sqe_flags if sqe_flags is not None else 0
+        return _RUSTFFI_ioring_prep_read_many(self._the_ring, fds, sizes, offsets, sqe_flags)
+
+    def prep_write_many(
+        self,
+        fd: int,
+        buffers: Sequence[Buffer],
+        offsets: Sequence[int] | None = None,
+        *,
+        sqe_flags: int | None = None,
+    ) -> array[int]:
+        """
+        Prepares many pwrite(2) calls to a single file at once. This is equivalent to calling
+        :meth:`.prep_write` once per buffer, but pushes every submission queue entry in a single
+        call.
+
+        The writes are independent submissions, and the kernel may run them in any order. Pass
+        explicit ``offsets`` (or link the entries with ``sqe_flags``) if the order matters. The
+        entries are pushed in the same way as :meth:`.prep_read_many`.
+
+        :param fd: The raw file descriptor to write to.
+        :param buffers: The buffers to write, each of which is held by the ring (not copied) until
+            its write completes. See :meth:`.prep_write`.
+        :param offsets: The offset within the file to write each buffer at, or None to write every
+            buffer at the current seek position.
+        :param sqe_flags: See :func:`.make_uring_flags`. These are applied to every entry.
+        :return: An ``array('Q')`` of the user-data values stored in each SQE, in the same order
+            as ``buffers``.
+        """
+
+        sqe_flags = sqe_flags if sqe_flags is not None else 0
+        return _RUSTFFI_ioring_prep_write_many(self._the_ring, fd, buffers, offsets, sqe_flags)
+
+    def prep_create_socket(
+        self,
+        domain: int,
+        type: int,
+        protocol: int = 0,
+        *,
+        nonblocking: bool = False,
+        direct_slot: int | None = None,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a socket(2) call. See the relevant man page for more information.
+
+        :param domain: The "domain" (better known as protocol family) for this socket.
+
+            In nearly all cases, this will be :attr:`socket.AF_INET` or :attr:`socket.AF_INET6`.
+
+        :param type: The type for this socket.
+
+            In nearly all cases, this will be :attr:`socket.SOCK_STREAM` or
+            :attr:`socket.SOCK_DGRAM`.
+
+        :param protocol: The protocol that this socket will carry.
+
+            This should match the value passed for ``type``, i.e. don't pass
+            :attr:`socket.IPPROTO_UDP` for a ``SOCK_STREAM`` socket.
+
+        :param nonblocking: If true, then this socket will be created as a non-blocking socket.
+
+            This saves an extra call to fcntl(2) to set O_NONBLOCK.
+
+        :param direct_slot: If provided, the socket will be created as a direct descriptor in
+            this slot of the registered file table. See :meth:`.prep_openat`.
+
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        type |= socket.SOCK_CLOEXEC
+
+        if nonblocking:
+            type |= socket.SOCK_NONBLOCK
+
+        sqe_flags = sqe_flags if sqe_flags is not None else 0
+
+        user_data = _RUSTFFI_ioring_prep_create_socket(
+            self._the_ring,
+            domain,
+            type,
+            protocol,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            direct_slot,
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
         return user_data
 
+    def prep_connect_v4(
+        self,
+        fd: AcceptableFile,
+        address: str | ipaddress.IPv4Address,
+        port: int,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a connect(2) call for an IPv4 address. See the relevant man page for more info.
+
+        :param fd: The file descriptor of the socket to connect using.
+        :param address: The IPv4 address to connect to.
+
+            This should either be a :class:`str` containing the four-octet IPv4 address
+            (e.g. ``'172.16.39.25``) or a :class:`ipaddress.IPv4Address`.
+
+        :param port: The port to connect to.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_connect_v4(
+            self._the_ring,
+            unwrap_file(fd),
+            str(address),
+            port,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_connect_v6(
+        self,
+        fd: AcceptableFile,
+        address: str | ipaddress.IPv6Address,
+        port: int,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a connect(2) call for an IPv4 address. See the relevant man page for more info.
+
+        :param fd: The file descriptor of the socket to connect using.
+        :param address: The IPv6 address to connect to.
+        :param port: The port to connect to.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_connect_v6(
+            self._the_ring,
+            unwrap_file(fd),
+            str(address),
+            port,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_bind_v4(
+        self,
+        fd: AcceptableFile,
+        address: str | ipaddress.IPv4Address,
+        port: int,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a bind(2) call for an IPv4 address. See the relevant man page for more info.
+
+        This requires Linux 6.11 or newer; on older kernels, this will raise a
+        :class:`NotImplementedError`.
+
+        :param fd: The file descriptor of the socket to bind.
+        :param address: The IPv4 address to bind to.
+        :param port: The port to bind to, or zero to pick a random free port.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_bind_v4(
+            self._the_ring,
+            unwrap_file(fd),
+            str(address),
+            port,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_bind_v6(
+        self,
+        fd: AcceptableFile,
+        address: str | ipaddress.IPv6Address,
+        port: int,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a bind(2) call for an IPv6 address. See the relevant man page for more info.
+
+        This requires Linux 6.11 or newer; on older kernels, this will raise a
+        :class:`NotImplementedError`.
+
+        :param fd: The file descriptor of the socket to bind.
+        :param address: The IPv6 address to bind to.
+        :param port: The port to bind to, or zero to pick a random free port.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_bind_v6(
+            self._the_ring,
+            unwrap_file(fd),
+            str(address),
+            port,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_listen(
+        self,
+        fd: AcceptableFile,
+        backlog: int = 128,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a listen(2) call. See the relevant man page for more info.
+
+        This requires Linux 6.11 or newer; on older kernels, this will raise a
+        :class:`NotImplementedError`.
+
+        :param fd: The file descriptor of the socket to listen on.
+        :param backlog: The maximum length of the queue of pending connections.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_listen(
+            self._the_ring,
+            unwrap_file(fd),
+            backlog,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_accept(
+        self,
+        fd: AcceptableFile,
+        *,
+        nonblocking: bool = False,
+        direct_slot: int | None = None,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares an accept4(2) call. See the relevant man page for more info.
+
+        The completion queue event for this submission will have the file descriptor of the newly
+        accepted socket stored in the result field.
+
+        :param fd: The file descriptor of the listening socket to accept a connection on.
+        :param nonblocking: If true, then the new socket will be created as a non-blocking socket.
+        :param direct_slot: If provided, the new socket will be created as a direct descriptor in
+            this slot of the registered file table. See :meth:`.prep_openat`.
+
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        flags = socket.SOCK_CLOEXEC
+        if nonblocking:
+            flags |= socket.SOCK_NONBLOCK
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_accept(
+            self._the_ring,
+            unwrap_file(fd),
+            flags,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            direct_slot,
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_accept_multishot(
+        self,
+        fd: AcceptableFile,
+        *,
+        nonblocking: bool = False,
+        direct: bool = False,
+        sqe_flags: int | None = None,
+    ) -> int:
+        """
+        Prepares a multishot accept4(2) call. See the relevant man page for more info.
+
+        Unlike :meth:`.prep_accept`, this operation stays armed after it completes, and posts a
+        completion event with the file descriptor of every new connection accepted on the socket.
+        As long as :attr:`.CompletionEvent.has_more` is True, the operation is still armed.
+
+        :param fd: The file descriptor of the listening socket to accept connections on.
+        :param nonblocking: If true, then new sockets will be created as non-blocking sockets.
+        :param direct: If true, then new sockets will be created as direct descriptors in free
+            slots of the registered file table, and the result of each completion event will be
+            the slot rather than a file descriptor.
+
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        flags = socket.SOCK_CLOEXEC
+        if nonblocking:
+            flags |= socket.SOCK_NONBLOCK
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        return _RUSTFFI_ioring_prep_accept_multishot(
+            self._the_ring, unwrap_file(fd), flags, None, sqe_flags, direct
+        )
+
     def prep_recv(
-        self, fd: AcceptableFile, byte_count: int, flags: int = 0, *, sqe_flags: int | None = None
+        self,
+        fd: AcceptableFile,
+        byte_count: int,
+        flags: int = 0,
+        *,
+        buffer_group: int | None = None,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
     ) -> int:
         """
         Prepares a recv(2) call. See the relevant man page for more info.
 
         :param fd: The file descriptor of the socket to receive on.
         :param byte_count: The *maximum* number of bytes to read. The actual amount may be lower.
+
+            When using a ``buffer_group``, this may be zero to receive up to the size of the
+            picked buffer.
+
         :param flags: A set of socket-specific flags for this operation.
+        :param buffer_group: If provided, the buffer group ID of a provided buffer ring to receive
+            into instead of allocating a new buffer. See :meth:`.register_buffer_ring`.
+
         :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
         :return: The user-data value that was stored in the SQE.
         """
 
-        sqe_flags = sqe_flags if sqe_flags is not None else 0
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_recv(
-            self._the_ring, unwrap_file(fd), byte_count, flags, user_data, sqe_flags
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_recv(
+            self._the_ring,
+            unwrap_file(fd),
+            byte_count,
+            flags,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+            buffer_group,
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_recv_into(
+        self,
+        fd: AcceptableFile,
+        buffer: Buffer,
+        count: int | None = None,
+        buffer_offset: int = 0,
+        flags: int = 0,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a recv(2) call directly into a writable buffer. See the relevant man page for
+        more info, and :meth:`.prep_read_into` for how the buffer is handled.
+
+        :param fd: The file descriptor of the socket to receive on.
+        :param buffer: Any writable object supporting the buffer protocol.
+        :param count: The *maximum* number of bytes to read. The actual amount may be lower.
+
+            This defaults to the rest of the buffer after ``buffer_offset``, and cannot be larger.
+
+        :param buffer_offset: The offset within the buffer to start receiving into.
+        :param flags: A set of socket-specific flags for this operation.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        user_data = _RUSTFFI_ioring_prep_recv_into(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer,
+            count,
+            buffer_offset,
+            flags,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
         )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
         return user_data
 
+    def prep_recv_multishot(
+        self,
+        fd: AcceptableFile,
+        buffer_group: int,
+        flags: int = 0,
+        *,
+        sqe_flags: int | None = None,
+    ) -> int:
+        """
+        Prepares a multishot recv(2) call. See the relevant man page for more info.
+
+        Unlike :meth:`.prep_recv`, this operation stays armed after it completes, and posts a
+        completion event for every chunk of data received on the socket. Every event will have the
+        same user-data value; as long as :attr:`.CompletionEvent.has_more` is True, the operation
+        is still armed. Once an event is posted without it (e.g. on EOF, an error, or if the
+        buffer ring runs out of buffers), the operation is finished and must be re-submitted.
+
+        Received data is always placed into a provided buffer; see :meth:`.register_buffer_ring`.
+
+        :param fd: The file descriptor of the socket to receive on.
+        :param buffer_group: The buffer group ID of the provided buffer ring to receive into.
+        :param flags: A set of socket-specific flags for this operation.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+        return _RUSTFFI_ioring_prep_recv_multishot(
+            self._the_ring, unwrap_file(fd), flags, None, sqe_flags, buffer_group
+        )
+
     def prep_send(
         self,
         fd: AcceptableFile,
-        buffer: bytes | bytearray,
+        buffer: Buffer,
         count: int | None = None,
         buffer_offset: int | None = None,
         flags: int = 0,
         *,
         sqe_flags: int | None = None,
+        timeout: float | None = None,
     ) -> int:
         """
         Prepares a send(2) call. See the relevant man page for more info.
 
         The completion queue event for this submission will have the actual byte count *written*
-        in the result field, as well as a copy of the buffer that was written for memory safetty
-        purposes. The byte count may be less than the count requested.
+        in the result field. The byte count may be less than the count requested.
 
         :param fd: The file descriptor to write the data to.
-        :param buffer: The bytestring or bytearray to send.
+        :param buffer: Any object supporting the buffer protocol, such as :class:`bytes`,
+            :class:`bytearray`, :class:`memoryview` or :class:`mmap.mmap`.
 
-            This is copied into the Rust-side code before submission; large buffer sizes will cause
-            excessive memory usage.
+            This is *not* copied; instead, the ring holds onto the buffer until the operation
+            completes. If the buffer is mutable, it must not be modified until then.
 
         :param count: The number of bytes to write from the provided buffer.
 
@@ -459,25 +1737,89 @@ class IoUring:
             buffer.
 
         :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
         :return: The user-data value that was stored in the SQE.
         """
 
-        size = count if count is not None else len(buffer)
         buffer_offset = buffer_offset if buffer_offset is not None else 0
 
-        sqe_flags = sqe_flags if sqe_flags is not None else 0
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_send(
+            self._the_ring,
+            unwrap_file(fd),
+            buffer,
+            count,
+            buffer_offset,
+            flags,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
+        )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
+        return user_data
+
+    def prep_send_zc(
+        self,
+        fd: AcceptableFile,
+        buffer: Buffer,
+        count: int | None = None,
+        buffer_offset: int | None = None,
+        flags: int = 0,
+        *,
+        sqe_flags: int | None = None,
+        timeout: float | None = None,
+    ) -> int:
+        """
+        Prepares a zero-copy send(2) call. See the relevant man page for more info.
+
+        Unlike :meth:`.prep_send`, the buffer is not copied at all; the kernel sends directly from
+        the memory of the passed buffer, which is held by the ring until the kernel is finished
+        with it. This avoids two copies of the data, at the cost of some extra bookkeeping, and is
+        only worth it for large payloads.
+
+        This operation posts *two* completion events with the same user-data value. The first
+        has the actual byte count sent in the result field and has
+        :attr:`.CompletionEvent.has_more` set. The second is a notification event (with
+        :attr:`.CompletionEvent.is_notification` set) that is posted once the kernel no longer
+        needs the buffer. If the buffer is mutable, it must not be modified until this second event
+        has been posted.
+
+        :param fd: The file descriptor of the socket to send on.
+        :param buffer: Any object supporting the buffer protocol, such as :class:`bytes`,
+            :class:`bytearray`, :class:`memoryview` or :class:`mmap.mmap`.
+
+        :param count: The number of bytes to write from the provided buffer.
 
-        user_data = self._the_ring.get_next_user_data()
-        _RUSTFFI_ioring_prep_send(
+            This defaults to the size of the buffer, and cannot be larger than the buffer.
+
+        :param buffer_offset: The offset within the buffer to start writing from.
+        :param flags: A set of socket-specific flags for this operation.
+        :param sqe_flags: See :func:`.make_uring_flags`.
+        :param timeout: If provided, the operation is cancelled if it hasn't completed within
+            this many seconds. See :ref:`operation-timeouts`.
+
+        :return: The user-data value that was stored in the SQE.
+        """
+
+        buffer_offset = buffer_offset if buffer_offset is not None else 0
+
+        sqe_flags = sqe_flags_for_file(fd, sqe_flags)
+
+        user_data = _RUSTFFI_ioring_prep_send_zc(
             self._the_ring,
             unwrap_file(fd),
             buffer,
-            size,
+            count,
             buffer_offset,
             flags,
-            user_data,
-            sqe_flags,
+            None,
+            sqe_flags if timeout is None else sqe_flags | self._link_timeout_flag(timeout),
         )
+        if timeout is not None:
+            self._push_link_timeout(timeout, sqe_flags)
         return user_data
 
 
@@ -488,6 +1830,9 @@ def make_io_ring(
     sqpoll_idle_ms: int | None = None,
     single_issuer: bool = True,
     autosubmit: bool = True,
+    task_run_mode: TaskRunMode = TaskRunMode.DEFAULT,
+    sq_thread_cpu: int | None = None,
+    attach_wq: IoUring | None = None,
 ) -> Iterator[IoUring]:
     """
     Creates a new :class:`.IoUring` instance. This is a *context manager*; when the ``with`` block
@@ -527,12 +1872,34 @@ def make_io_ring(
 
         If this is False, then trying to submit a new operation whilst the queue is full will
         fail with a :class:`.ValueError`.
+
+    :param task_run_mode: Controls when the kernel runs the work that posts completion events.
+        See :class:`.TaskRunMode`.
+
+        Rings that are only ever used from a single thread should prefer
+        :attr:`.TaskRunMode.DEFERRED`, which avoids interrupting the process whilst it's busy.
+
+    :param sq_thread_cpu: If provided, the submission poll thread will be pinned to this CPU.
+        Requires ``sqpoll_idle_ms``.
+
+    :param attach_wq: If provided, this ring will share the io-wq worker pool of another ring
+        rather than creating its own. If both rings use submission queue polling, they will also
+        share a single submission poll thread.
     """
 
     cq_size = cq_size if (cq_size and cq_size > 0) else 0
     sqpoll_idle_ms = sqpoll_idle_ms if (sqpoll_idle_ms and sqpoll_idle_ms > 0) else 0
 
-    ring = _RUSTFFI_create_io_ring(entries, cq_size, sqpoll_idle_ms, single_issuer, autosubmit)
+    ring = _RUSTFFI_create_io_ring(
+        entries,
+        cq_size,
+        sqpoll_idle_ms,
+        single_issuer,
+        autosubmit,
+        task_run_mode.value,
+        sq_thread_cpu,
+        attach_wq.fileno() if attach_wq is not None else None,
+    )
     try:
         yield IoUring(_the_ring=ring)
     finally:
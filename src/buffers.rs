@@ -0,0 +1,303 @@
+use std::{
+    alloc::{alloc_zeroed, dealloc, handle_alloc_error, Layout},
+    ptr::NonNull,
+    sync::atomic::{AtomicU16, Ordering},
+};
+
+use io_uring::types::BufRingEntry;
+use nix::libc;
+use pyo3::{exceptions::PyValueError, ffi, Bound, FromPyObject, PyAny, PyErr, PyResult, Python};
+
+/**
+A pool of buffers that have been registered with the kernel via ``io_uring_register_buffers``.
+
+The kernel pins and maps these pages once at registration time, so operations that use them
+(``ReadFixed``/``WriteFixed``) skip both the per-operation allocation and the page pinning. The
+backing memory is owned by the ring and never moves until the pool is unregistered.
+*/
+pub(crate) struct FixedBufferPool {
+    buffers: Vec<Box<[u8]>>,
+
+    /// The number of submitted operations that still point into this pool.
+    pub(crate) in_flight: usize,
+}
+
+impl FixedBufferPool {
+    pub(crate) fn new(count: u16, size: u32) -> PyResult<FixedBufferPool> {
+        if count == 0 || size == 0 {
+            return Err(PyValueError::new_err(
+                "Can't register an empty set of buffers",
+            ));
+        }
+
+        let buffers = (0..count)
+            .map(|_| vec![0u8; size as usize].into_boxed_slice())
+            .collect();
+
+        return Ok(FixedBufferPool {
+            buffers,
+            in_flight: 0,
+        });
+    }
+
+    /** Creates the list of iovecs that describe this pool to the kernel. */
+    pub(crate) fn iovecs(&mut self) -> Vec<libc::iovec> {
+        return self
+            .buffers
+            .iter_mut()
+            .map(|buf| libc::iovec {
+                iov_base: buf.as_mut_ptr().cast(),
+                iov_len: buf.len(),
+            })
+            .collect();
+    }
+
+    /** Gets the region ``[offset, offset + size)`` of the buffer at ``index``. */
+    pub(crate) fn slot(&mut self, index: u16, offset: usize, size: usize) -> PyResult<&mut [u8]> {
+        let count = self.buffers.len();
+        let Some(buf) = self.buffers.get_mut(index as usize) else {
+            let message = format!("buffer index {} out of range for pool of {}", index, count);
+            return Err(PyValueError::new_err(message));
+        };
+
+        let end_offset = offset.checked_add(size).unwrap_or(usize::MAX);
+        if end_offset > buf.len() {
+            let message = format!(
+                "offset {} out of range from buffer of {}",
+                end_offset,
+                buf.len()
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        return Ok(&mut buf[offset..end_offset]);
+    }
+}
+
+/**
+A provided buffer ring (``IORING_REGISTER_PBUF_RING``), registered with the kernel under a buffer
+group ID.
+
+Operations submitted with ``IOSQE_BUFFER_SELECT`` and this group ID don't own a buffer; the kernel
+picks a free buffer from this ring only once data actually arrives, and reports which one it picked
+in the completion event. A picked buffer stays checked out until it is recycled back into the ring.
+*/
+pub(crate) struct ProvidedBufferRing {
+    entries: NonNull<BufRingEntry>,
+    layout: Layout,
+    buffers: Box<[u8]>,
+    buffer_size: usize,
+    count: u16,
+    tail: u16,
+    checked_out: Vec<bool>,
+
+    /// The number of submitted operations that may still pick a buffer from this ring.
+    pub(crate) in_flight: usize,
+}
+
+// safety: the ring memory is exclusively owned by this struct (and the kernel), and is only ever
+// touched through ``&mut self``.
+unsafe impl Send for ProvidedBufferRing {}
+unsafe impl Sync for ProvidedBufferRing {}
+
+impl ProvidedBufferRing {
+    pub(crate) fn new(count: u16, size: u32) -> PyResult<ProvidedBufferRing> {
+        if count == 0 || !count.is_power_of_two() || count > 32768 {
+            let message = format!(
+                "buffer ring size must be a power of two up to 32768, not {}",
+                count
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        if size == 0 {
+            return Err(PyValueError::new_err("Can't provide zero-sized buffers"));
+        }
+
+        // the kernel requires the ring itself to be page-aligned.
+        let page_size = unsafe { libc::sysconf(libc::_SC_PAGESIZE) }.max(4096) as usize;
+        let ring_size = (count as usize) * std::mem::size_of::<BufRingEntry>();
+        let layout = Layout::from_size_align(ring_size, page_size)
+            .map_err(|e| PyValueError::new_err(e.to_string()))?;
+
+        let raw = unsafe { alloc_zeroed(layout) } as *mut BufRingEntry;
+        let Some(entries) = NonNull::new(raw) else {
+            handle_alloc_error(layout);
+        };
+
+        let mut buf_ring = ProvidedBufferRing {
+            entries,
+            layout,
+            buffers: vec![0u8; (count as usize) * (size as usize)].into_boxed_slice(),
+            buffer_size: size as usize,
+            count,
+            tail: 0,
+            checked_out: vec![false; count as usize],
+            in_flight: 0,
+        };
+
+        for bid in 0..count {
+            buf_ring.push(bid);
+        }
+        buf_ring.publish_tail();
+
+        return Ok(buf_ring);
+    }
+
+    /** Gets the address of the ring, to be passed to the kernel on registration. */
+    pub(crate) fn ring_addr(&self) -> u64 {
+        return self.entries.as_ptr() as u64;
+    }
+
+    /** Gets the number of entries in this ring. */
+    pub(crate) fn count(&self) -> u16 {
+        return self.count;
+    }
+
+    fn push(&mut self, bid: u16) {
+        let index = (self.tail & (self.count - 1)) as usize;
+        let offset = (bid as usize) * self.buffer_size;
+
+        unsafe {
+            let entry = &mut *self.entries.as_ptr().add(index);
+            entry.set_addr(self.buffers.as_mut_ptr().add(offset) as u64);
+            entry.set_len(self.buffer_size as u32);
+            entry.set_bid(bid);
+        }
+
+        self.tail = self.tail.wrapping_add(1);
+    }
+
+    fn publish_tail(&mut self) {
+        // the tail overlaps the reserved field of the first entry, and is read by the kernel
+        // concurrently, so it needs to be written with release semantics.
+        unsafe {
+            let tail = BufRingEntry::tail(self.entries.as_ptr()) as *const AtomicU16;
+            (*tail).store(self.tail, Ordering::Release);
+        }
+    }
+
+    fn check_bid(&self, bid: u16) -> PyResult<()> {
+        if bid >= self.count {
+            let message = format!("buffer id {} out of range for ring of {}", bid, self.count);
+            return Err(PyValueError::new_err(message));
+        }
+
+        if !self.checked_out[bid as usize] {
+            let message = format!("buffer id {} isn't checked out", bid);
+            return Err(PyValueError::new_err(message));
+        }
+
+        return Ok(());
+    }
+
+    /** Marks a buffer as picked by the kernel for a completed operation. */
+    pub(crate) fn mark_checked_out(&mut self, bid: u16) {
+        if let Some(it) = self.checked_out.get_mut(bid as usize) {
+            *it = true;
+        }
+    }
+
+    /** Gets the first ``size`` bytes of a checked out buffer. */
+    pub(crate) fn get(&self, bid: u16, size: usize) -> PyResult<&[u8]> {
+        self.check_bid(bid)?;
+
+        if size > self.buffer_size {
+            let message = format!(
+                "can't read {} bytes from a buffer of {}",
+                size, self.buffer_size
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        let offset = (bid as usize) * self.buffer_size;
+        return Ok(&self.buffers[offset..offset + size]);
+    }
+
+    /** Hands a checked out buffer back to the kernel. */
+    pub(crate) fn recycle(&mut self, bid: u16) -> PyResult<()> {
+        self.check_bid(bid)?;
+
+        self.checked_out[bid as usize] = false;
+        self.push(bid);
+        self.publish_tail();
+        return Ok(());
+    }
+}
+
+impl Drop for ProvidedBufferRing {
+    fn drop(&mut self) {
+        unsafe { dealloc(self.entries.as_ptr() as *mut u8, self.layout) };
+    }
+}
+
+/**
+A list of ``iovec``s for a vectored operation, which point into buffers that are owned alongside
+it.
+*/
+pub(crate) struct OwnedIoVecs(pub(crate) Vec<libc::iovec>);
+
+// safety: the pointers are only ever dereferenced by the kernel, and the buffers they point into
+// are kept alive next to them until the operation completes.
+unsafe impl Send for OwnedIoVecs {}
+unsafe impl Sync for OwnedIoVecs {}
+
+/**
+A buffer export of a Python buffer-protocol object, viewed as plain bytes.
+
+This is requested with ``PyBUF_SIMPLE``, so the exporter guarantees that the memory is contiguous
+and the item format is ignored; e.g. an ``array('i')`` or a ``memoryview`` cast to ``'H'`` is
+just its raw bytes. The export (and the object behind it) is held until this is dropped.
+*/
+pub(crate) struct ByteBuffer(Box<ffi::Py_buffer>);
+
+// safety: the export is only released with the GIL held, the same as pyo3's ``PyBuffer``.
+unsafe impl Send for ByteBuffer {}
+unsafe impl Sync for ByteBuffer {}
+
+impl ByteBuffer {
+    /// Gets a pointer to the start of the buffer.
+    pub(crate) fn buf_ptr(&self) -> *mut u8 {
+        return self.0.buf as *mut u8;
+    }
+
+    /// Gets the size of the buffer, in bytes.
+    pub(crate) fn len_bytes(&self) -> usize {
+        return self.0.len as usize;
+    }
+
+    /// Checks if the exporter has marked the buffer as read-only.
+    pub(crate) fn readonly(&self) -> bool {
+        return self.0.readonly != 0;
+    }
+
+    /// Gets the contents of the buffer as a byte slice.
+    pub(crate) fn as_slice(&self) -> &[u8] {
+        // an empty export may have a null pointer, which isn't allowed for a slice.
+        if self.len_bytes() == 0 {
+            return &[];
+        }
+
+        return unsafe { std::slice::from_raw_parts(self.buf_ptr(), self.len_bytes()) };
+    }
+}
+
+impl<'py> FromPyObject<'py> for ByteBuffer {
+    fn extract_bound(obj: &Bound<'py, PyAny>) -> PyResult<Self> {
+        let mut view = Box::new(unsafe { std::mem::zeroed::<ffi::Py_buffer>() });
+
+        let result =
+            unsafe { ffi::PyObject_GetBuffer(obj.as_ptr(), &mut *view, ffi::PyBUF_SIMPLE) };
+        if result == -1 {
+            return Err(PyErr::fetch(obj.py()));
+        }
+
+        return Ok(ByteBuffer(view));
+    }
+}
+
+impl Drop for ByteBuffer {
+    fn drop(&mut self) {
+        Python::with_gil(|_| unsafe { ffi::PyBuffer_Release(&mut *self.0) });
+    }
+}
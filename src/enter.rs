@@ -0,0 +1,225 @@
+use std::os::fd::AsRawFd;
+
+use io_uring::types::{SubmitArgs, Timespec};
+use nix::libc;
+
+// none of these are exposed by the io_uring crate.
+pub(crate) const IORING_ENTER_GETEVENTS: u32 = 1 << 0;
+const IORING_ENTER_EXT_ARG: u32 = 1 << 3;
+const IORING_ENTER_REGISTERED_RING: u32 = 1 << 4;
+const IORING_REGISTER_RING_FDS: u32 = 20;
+const IORING_UNREGISTER_RING_FDS: u32 = 21;
+
+/** ``struct io_uring_rsrc_update`` */
+#[repr(C)]
+struct RsrcUpdate {
+    offset: u32,
+    resv: u32,
+    data: u64,
+}
+
+/** ``struct io_uring_getevents_arg`` */
+#[repr(C)]
+struct GetEventsArg {
+    sigmask: u64,
+    sigmask_sz: u32,
+    pad: u32,
+    ts: u64,
+}
+
+thread_local! {
+    // gettid() is a syscall, which would defeat the point of skipping the fd lookup.
+    static CURRENT_TID: libc::pid_t = unsafe { libc::gettid() };
+}
+
+/**
+The ring's own file descriptor, registered in the registered ring table of a single thread.
+
+The kernel keeps a separate table per thread, so the index means nothing (or, worse, refers to
+a different ring) on any other thread.
+*/
+#[derive(Clone, Copy)]
+pub(crate) struct RegisteredRing {
+    index: u32,
+    tid: libc::pid_t,
+}
+
+impl RegisteredRing {
+    /** Checks if the calling thread is the one that registered the ring. */
+    pub(crate) fn is_current_thread(&self) -> bool {
+        return CURRENT_TID.with(|tid| *tid == self.tid);
+    }
+}
+
+/** Gets the registered index to enter with from the calling thread, if there is one. */
+pub(crate) fn current_index(registered: Option<RegisteredRing>) -> Option<u32> {
+    return registered
+        .filter(|it| it.is_current_thread())
+        .map(|it| it.index);
+}
+
+/**
+Registers the ring's own file descriptor with the kernel (``IORING_REGISTER_RING_FDS``), so that
+``io_uring_enter`` can skip looking up the file on every call.
+
+The registration is only valid on the calling thread. Returns ``None`` if the kernel doesn't
+support this, as it's purely an optimisation.
+*/
+pub(crate) fn register_ring_fd(ring: &io_uring::IoUring) -> Option<RegisteredRing> {
+    let fd = ring.as_raw_fd();
+
+    // an offset of -1 lets the kernel pick a free index.
+    let mut update = RsrcUpdate {
+        offset: u32::MAX,
+        resv: 0,
+        data: fd as u64,
+    };
+
+    let result = unsafe {
+        libc::syscall(
+            libc::SYS_io_uring_register,
+            fd,
+            IORING_REGISTER_RING_FDS,
+            &mut update as *mut RsrcUpdate,
+            1,
+        )
+    };
+
+    if result != 1 {
+        return None;
+    }
+
+    return Some(RegisteredRing {
+        index: update.offset,
+        tid: CURRENT_TID.with(|tid| *tid),
+    });
+}
+
+/**
+Unregisters a ring file descriptor that was registered with ``register_ring_fd``. Until this is
+done, the registration keeps the ring alive even after it's closed.
+
+This can only be done from the thread that registered it; on any other thread the same index
+belongs to that thread's own table. Otherwise the registration is left for the kernel to clean up
+when the owning thread exits.
+*/
+pub(crate) fn unregister_ring_fd(ring: &io_uring::IoUring, registered: RegisteredRing) {
+    if !registered.is_current_thread() {
+        return;
+    }
+
+    let mut update = RsrcUpdate {
+        offset: registered.index,
+        resv: 0,
+        data: 0,
+    };
+
+    // nothing useful can be done if this fails.
+    unsafe {
+        libc::syscall(
+            libc::SYS_io_uring_register,
+            ring.as_raw_fd(),
+            IORING_UNREGISTER_RING_FDS,
+            &mut update as *mut RsrcUpdate,
+            1,
+        )
+    };
+}
+
+/**
+Calls ``io_uring_enter`` directly, through the registered ring index if there is one (see
+``current_index``). If ``timespec`` is provided, it is passed as the wait timeout with
+``IORING_ENTER_EXT_ARG``.
+*/
+pub(crate) fn enter(
+    ring: &io_uring::IoUring,
+    registered_index: Option<u32>,
+    to_submit: u32,
+    min_complete: u32,
+    flags: u32,
+    timespec: Option<&Timespec>,
+) -> std::io::Result<usize> {
+    let (fd, mut flags) = match registered_index {
+        Some(index) => (index as libc::c_int, flags | IORING_ENTER_REGISTERED_RING),
+        None => (ring.as_raw_fd(), flags),
+    };
+
+    let arg = timespec.map(|ts| GetEventsArg {
+        sigmask: 0,
+        sigmask_sz: 0,
+        pad: 0,
+        ts: ts as *const Timespec as u64,
+    });
+
+    let (arg_ptr, arg_size) = match &arg {
+        Some(it) => {
+            flags |= IORING_ENTER_EXT_ARG;
+            (
+                it as *const GetEventsArg as *const libc::c_void,
+                std::mem::size_of::<GetEventsArg>(),
+            )
+        }
+        None => (std::ptr::null(), 0),
+    };
+
+    let result = unsafe {
+        libc::syscall(
+            libc::SYS_io_uring_enter,
+            fd,
+            to_submit,
+            min_complete,
+            flags,
+            arg_ptr,
+            arg_size,
+        )
+    };
+
+    if result < 0 {
+        return Err(std::io::Error::last_os_error());
+    }
+
+    return Ok(result as usize);
+}
+
+/**
+Submits the submission queue and waits for ``want`` completions, optionally with a timeout.
+
+Rings without a registered index go through the io_uring crate, which also handles waking up the
+submission poll thread for sqpoll rings (which never have a registered index).
+*/
+pub(crate) fn submit_and_wait(
+    ring: &mut io_uring::IoUring,
+    registered_index: Option<u32>,
+    want: usize,
+    timespec: Option<&Timespec>,
+) -> std::io::Result<usize> {
+    let Some(index) = registered_index else {
+        return match timespec {
+            Some(ts) => {
+                let args = SubmitArgs::new().timespec(ts);
+                ring.submitter().submit_with_args(want, &args)
+            }
+            None => ring.submit_and_wait(want),
+        };
+    };
+
+    let (to_submit, overflow) = {
+        let submission = ring.submission();
+        (submission.len(), submission.cq_overflow())
+    };
+
+    let flags = if want > 0 || overflow {
+        IORING_ENTER_GETEVENTS
+    } else {
+        0
+    };
+
+    return enter(
+        ring,
+        Some(index),
+        to_submit as u32,
+        want as u32,
+        flags,
+        timespec,
+    );
+}
@@ -2,9 +2,20 @@ use std::os::fd::RawFd;
 
 use bytemuck::cast_slice;
 use io_uring::{squeue::Flags, types::Fd};
-use pyo3::{exceptions::{PyNotImplementedError, PyValueError}, pyfunction, PyResult};
+use nix::libc;
+use pyo3::{
+    exceptions::{PyNotImplementedError, PyValueError},
+    pyfunction, Bound, FromPyObject, PyAny, PyResult, Python,
+};
 
-use crate::{ring::TheIoRing, shared::check_write_buffer};
+use crate::{
+    buffers::{ByteBuffer, OwnedIoVecs},
+    ring::TheIoRing,
+    shared::{
+        check_write_buffer, checked_op_len, make_destination_slot, make_native_array,
+        writable_buffer_region,
+    },
+};
 
 /// Performs an ``openat(2)`` call via io_uring.
 #[pyfunction(name = "_RUSTFFI_ioring_prep_openat")]
@@ -12,11 +23,14 @@ pub fn ioring_prep_openat(
     ring: &mut TheIoRing,
     dirfd: RawFd,
     file_path: &[u8],
-    user_data: u64,
+    user_data: Option<u64>,
     file_flags: i32,
     mode: u32,
     sqe_flags: u8,
-) -> PyResult<()> {
+    direct_slot: Option<i32>,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::OpenAt::CODE) {
         return Err(PyNotImplementedError::new_err("openat"));
     }
@@ -36,13 +50,14 @@ pub fn ioring_prep_openat(
     let openat_op = io_uring::opcode::OpenAt::new(dir_fd, path_i8.as_ptr())
         .flags(file_flags)
         .mode(mode)
+        .file_index(make_destination_slot(direct_slot)?)
         .build()
         .flags(parsed_sqe_flags)
         .user_data(user_data);
 
     ring.autosubmit(&openat_op)?;
     ring.add_owned_path(user_data, owned_path);
-    return Ok(());
+    return Ok(user_data);
 }
 
 /// Performs a ``read(2)`` call via io_uring.
@@ -52,9 +67,12 @@ pub fn ioring_prep_read(
     fd: RawFd,
     max_size: u32,
     offset: i64,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+    buffer_group: Option<u16>,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Read::CODE) {
         return Err(PyNotImplementedError::new_err("read"));
     }
@@ -66,6 +84,22 @@ pub fn ioring_prep_read(
         ));
     }
 
+    if let Some(group) = buffer_group {
+        // no buffer of our own, the kernel picks one from the group when the read happens.
+        ring.check_buffer_group(group)?;
+
+        let ring_op = io_uring::opcode::Read::new(Fd(fd), std::ptr::null_mut(), max_size)
+            .offset(offset as u64)
+            .buf_group(group)
+            .build()
+            .flags(parsed_sqe_flags | Flags::BUFFER_SELECT)
+            .user_data(user_data);
+
+        ring.autosubmit(&ring_op)?;
+        ring.add_provided_buffer_user(user_data, group);
+        return Ok(user_data);
+    }
+
     let mut buf: Vec<u8> = vec![0; max_size as usize];
     let ring_op = io_uring::opcode::Read::new(Fd(fd), buf.as_mut_ptr(), max_size)
         .offset(offset as u64)
@@ -75,7 +109,46 @@ pub fn ioring_prep_read(
 
     ring.autosubmit(&ring_op)?;
     ring.add_owned_buffer(user_data, buf);
-    return Ok(());
+    return Ok(user_data);
+}
+
+/// Performs a ``read(2)`` call via io_uring directly into a writable Python buffer.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_read_into")]
+pub fn ioring_prep_read_into(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    data: ByteBuffer,
+    size: Option<usize>,
+    buffer_offset: usize,
+    offset: i64,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Read::CODE) {
+        return Err(PyNotImplementedError::new_err("read"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    // the buffer export is held by the ring until the operation completes, so the kernel can
+    // write straight into it.
+    let (ptr, size) = writable_buffer_region(&data, size, buffer_offset)?;
+    let ring_op = io_uring::opcode::Read::new(Fd(fd), ptr, checked_op_len(size)?)
+        .offset(offset as u64)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_owned_python_buffer(user_data, data);
+    return Ok(user_data);
 }
 
 /// Performs a ``writw(2)`` call via io_uring.
@@ -83,13 +156,15 @@ pub fn ioring_prep_read(
 pub fn ioring_prep_write(
     ring: &mut TheIoRing,
     fd: RawFd,
-    data: &[u8],
-    size: usize,
+    data: ByteBuffer,
+    size: Option<usize>,
     buffer_offset: usize,
     file_offset: i64,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Write::CODE) {
         return Err(PyNotImplementedError::new_err("write"));
     }
@@ -101,20 +176,334 @@ pub fn ioring_prep_write(
         ));
     }
 
-    let end_offset = check_write_buffer(data, size, buffer_offset)?;
+    let slice = data.as_slice();
+    let size = size.unwrap_or(slice.len());
+    let end_offset = check_write_buffer(slice, size, buffer_offset)?;
 
     // like the read op, we need to make sure the read-from buffer outlives us.
-    // so we copy it to our own buffer, let the ring own it, and then it's deallocated later on
-    let vec = data[buffer_offset..end_offset].to_vec();
+    // rather than copying it, the ring holds onto the buffer export (and the object behind it)
+    // until the operation completes.
+    let ptr = slice[buffer_offset..end_offset].as_ptr();
 
-    let ring_op = io_uring::opcode::Write::new(Fd(fd), vec.as_ptr(), vec.len() as u32)
+    let ring_op = io_uring::opcode::Write::new(Fd(fd), ptr, checked_op_len(size)?)
         .offset(file_offset as u64)
         .build()
         .flags(parsed_sqe_flags)
         .user_data(user_data);
 
     ring.autosubmit(&ring_op)?;
-    ring.add_owned_buffer(user_data, vec);
+    ring.add_owned_python_buffer(user_data, data);
+
+    return Ok(user_data);
+}
+
+/// Performs a ``preadv2(2)`` call via io_uring, scattering into several writable Python buffers.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_readv")]
+pub fn ioring_prep_readv(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    buffers: Vec<ByteBuffer>,
+    offset: i64,
+    rw_flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Readv::CODE) {
+        return Err(PyNotImplementedError::new_err("readv"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    if buffers.is_empty() {
+        return Err(PyValueError::new_err(
+            "Can't read into an empty list of buffers",
+        ));
+    }
+
+    let mut iovecs = Vec::<libc::iovec>::with_capacity(buffers.len());
+    for buffer in &buffers {
+        let (ptr, size) = writable_buffer_region(buffer, None, 0)?;
+        iovecs.push(libc::iovec {
+            iov_base: ptr.cast(),
+            iov_len: size,
+        });
+    }
+
+    let ring_op = io_uring::opcode::Readv::new(Fd(fd), iovecs.as_ptr(), iovecs.len() as u32)
+        .offset(offset as u64)
+        .rw_flags(rw_flags)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_owned_iovecs(user_data, OwnedIoVecs(iovecs), buffers);
+    return Ok(user_data);
+}
+
+/// Performs a ``pwritev2(2)`` call via io_uring, gathering from several Python buffers.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_writev")]
+pub fn ioring_prep_writev(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    buffers: Vec<ByteBuffer>,
+    offset: i64,
+    rw_flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Writev::CODE) {
+        return Err(PyNotImplementedError::new_err("writev"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    if buffers.is_empty() {
+        return Err(PyValueError::new_err(
+            "Can't write an empty list of buffers",
+        ));
+    }
+
+    // the kernel only ever reads through these pointers, so read-only buffers (e.g. ``bytes``)
+    // are fine here.
+    let mut iovecs = Vec::<libc::iovec>::with_capacity(buffers.len());
+    for buffer in &buffers {
+        let slice = buffer.as_slice();
+        iovecs.push(libc::iovec {
+            iov_base: slice.as_ptr() as *mut libc::c_void,
+            iov_len: slice.len(),
+        });
+    }
+
+    let ring_op = io_uring::opcode::Writev::new(Fd(fd), iovecs.as_ptr(), iovecs.len() as u32)
+        .offset(offset as u64)
+        .rw_flags(rw_flags)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_owned_iovecs(user_data, OwnedIoVecs(iovecs), buffers);
+    return Ok(user_data);
+}
+
+/** Checks that the per-operation offsets passed to a bulk operation line up with its items. */
+fn check_bulk_offsets(count: usize, offsets: &Option<Vec<i64>>) -> PyResult<()> {
+    if let Some(offsets) = offsets {
+        if offsets.len() != count {
+            let message = format!("expected {} offsets, got {}", count, offsets.len());
+            return Err(PyValueError::new_err(message));
+        }
+    }
 
     return Ok(());
 }
+
+/** The sizes of a bulk read: either one size for every read, or a size per read. */
+#[derive(FromPyObject)]
+pub enum BulkSizes {
+    Same(u32),
+    PerItem(Vec<u32>),
+}
+
+/// Performs many ``read(2)`` calls via io_uring in one go, each into a newly allocated buffer.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_read_many")]
+pub fn ioring_prep_read_many<'py>(
+    py: Python<'py>,
+    ring: &mut TheIoRing,
+    fds: Vec<RawFd>,
+    sizes: BulkSizes,
+    offsets: Option<Vec<i64>>,
+    sqe_flags: u8,
+) -> PyResult<Bound<'py, PyAny>> {
+    if !ring.probe.is_supported(io_uring::opcode::Read::CODE) {
+        return Err(PyNotImplementedError::new_err("read"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    if let BulkSizes::PerItem(sizes) = &sizes {
+        if sizes.len() != fds.len() {
+            let message = format!("expected {} sizes, got {}", fds.len(), sizes.len());
+            return Err(PyValueError::new_err(message));
+        }
+    }
+    check_bulk_offsets(fds.len(), &offsets)?;
+
+    let user_datas = ring.push_many(py, fds.len(), |ring, index, user_data| {
+        let offset = offsets.as_ref().map_or(-1, |it| it[index]);
+        let size = match &sizes {
+            BulkSizes::Same(size) => *size,
+            BulkSizes::PerItem(sizes) => sizes[index],
+        };
+
+        let mut buf: Vec<u8> = vec![0; size as usize];
+        let ring_op = io_uring::opcode::Read::new(Fd(fds[index]), buf.as_mut_ptr(), size)
+            .offset(offset as u64)
+            .build()
+            .flags(parsed_sqe_flags)
+            .user_data(user_data);
+
+        ring.autosubmit(&ring_op)?;
+        ring.add_owned_buffer(user_data, buf);
+        return Ok(());
+    })?;
+
+    return make_native_array(py, "Q", &user_datas);
+}
+
+/// Performs many ``write(2)`` calls to a single file via io_uring in one go.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_write_many")]
+pub fn ioring_prep_write_many<'py>(
+    py: Python<'py>,
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    buffers: Vec<ByteBuffer>,
+    offsets: Option<Vec<i64>>,
+    sqe_flags: u8,
+) -> PyResult<Bound<'py, PyAny>> {
+    if !ring.probe.is_supported(io_uring::opcode::Write::CODE) {
+        return Err(PyNotImplementedError::new_err("write"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    check_bulk_offsets(buffers.len(), &offsets)?;
+
+    // check every buffer before submitting anything, so that a bad buffer doesn't leave half of
+    // the writes in the queue.
+    let sizes = buffers
+        .iter()
+        .map(|it| checked_op_len(it.len_bytes()))
+        .collect::<PyResult<Vec<u32>>>()?;
+
+    let count = buffers.len();
+    let mut buffers = buffers.into_iter();
+
+    let user_datas = ring.push_many(py, count, |ring, index, user_data| {
+        let offset = offsets.as_ref().map_or(-1, |it| it[index]);
+        let Some(buffer) = buffers.next() else {
+            return Err(PyValueError::new_err("ran out of buffers"));
+        };
+
+        let ring_op = io_uring::opcode::Write::new(Fd(fd), buffer.buf_ptr(), sizes[index])
+            .offset(offset as u64)
+            .build()
+            .flags(parsed_sqe_flags)
+            .user_data(user_data);
+
+        ring.autosubmit(&ring_op)?;
+        ring.add_owned_python_buffer(user_data, buffer);
+        return Ok(());
+    })?;
+
+    return make_native_array(py, "Q", &user_datas);
+}
+
+/// Performs a ``read(2)`` call via io_uring into a slot of the registered buffer pool.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_read_fixed")]
+pub fn ioring_prep_read_fixed(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    buffer_index: u16,
+    buffer_offset: usize,
+    max_size: u32,
+    offset: i64,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::ReadFixed::CODE) {
+        return Err(PyNotImplementedError::new_err("read_fixed"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    let Some(pool) = &mut ring.fixed_buffers else {
+        return Err(PyValueError::new_err("No buffers are registered"));
+    };
+
+    // the pool outlives the operation, as it can't be unregistered whilst this is in flight.
+    let slot = pool.slot(buffer_index, buffer_offset, max_size as usize)?;
+    let ring_op =
+        io_uring::opcode::ReadFixed::new(Fd(fd), slot.as_mut_ptr(), max_size, buffer_index)
+            .offset(offset as u64)
+            .build()
+            .flags(parsed_sqe_flags)
+            .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_fixed_buffer_user(user_data);
+    return Ok(user_data);
+}
+
+/// Performs a ``write(2)`` call via io_uring from a slot of the registered buffer pool.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_write_fixed")]
+pub fn ioring_prep_write_fixed(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    buffer_index: u16,
+    buffer_offset: usize,
+    size: u32,
+    file_offset: i64,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::WriteFixed::CODE) {
+        return Err(PyNotImplementedError::new_err("write_fixed"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    let Some(pool) = &mut ring.fixed_buffers else {
+        return Err(PyValueError::new_err("No buffers are registered"));
+    };
+
+    let slot = pool.slot(buffer_index, buffer_offset, size as usize)?;
+    let ring_op = io_uring::opcode::WriteFixed::new(Fd(fd), slot.as_ptr(), size, buffer_index)
+        .offset(file_offset as u64)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_fixed_buffer_user(user_data);
+    return Ok(user_data);
+}
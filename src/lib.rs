@@ -2,21 +2,33 @@
 #![allow(clippy::needless_return)] // fuck off and DIE
 #![allow(clippy::too_many_arguments)] // fuck off and die even harder!
 
+mod buffers;
+mod enter;
 mod files;
 mod flags;
 mod network;
 mod ring;
 mod shared;
+mod slab;
 
-use files::{ioring_prep_openat, ioring_prep_read, ioring_prep_write};
+use files::{
+    ioring_prep_openat, ioring_prep_read, ioring_prep_read_fixed, ioring_prep_read_into,
+    ioring_prep_read_many, ioring_prep_readv, ioring_prep_write, ioring_prep_write_fixed,
+    ioring_prep_write_many, ioring_prep_writev,
+};
 use flags::make_uring_flags;
 use network::{
-    ioring_prep_connect_v4, ioring_prep_connect_v6, ioring_prep_create_socket, ioring_prep_recv,
-    ioring_prep_send,
+    ioring_prep_accept, ioring_prep_accept_multishot, ioring_prep_bind_v4, ioring_prep_bind_v6,
+    ioring_prep_connect_v4, ioring_prep_connect_v6, ioring_prep_create_socket, ioring_prep_listen,
+    ioring_prep_recv, ioring_prep_recv_into, ioring_prep_recv_multishot, ioring_prep_send,
+    ioring_prep_send_zc,
 };
 use pyo3::prelude::*;
 use ring::{create_io_ring, CompletionEvent, TheIoRing};
-use shared::ioring_prep_close;
+use shared::{
+    ioring_prep_cancel, ioring_prep_close, ioring_prep_close_many, ioring_prep_link_timeout,
+    ioring_prep_nop, ioring_prep_poll_add, ioring_prep_timeout,
+};
 
 #[pymodule]
 fn _century_ring(m: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -29,12 +41,33 @@ fn _century_ring(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(ioring_prep_openat, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_read, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_write, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_read_into, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_read_fixed, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_write_fixed, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_readv, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_writev, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_read_many, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_write_many, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_close, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_close_many, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_nop, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_link_timeout, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_timeout, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_cancel, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_poll_add, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_create_socket, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_connect_v4, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_connect_v6, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_bind_v4, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_bind_v6, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_listen, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_accept, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_accept_multishot, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_send, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_send_zc, m)?)?;
     m.add_function(wrap_pyfunction!(ioring_prep_recv, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_recv_into, m)?)?;
+    m.add_function(wrap_pyfunction!(ioring_prep_recv_multishot, m)?)?;
 
     return Ok(());
 }
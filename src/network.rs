@@ -8,8 +8,11 @@ use nix::sys::socket::SockaddrLike;
 use pyo3::exceptions::{PyNotImplementedError, PyValueError};
 use pyo3::PyResult;
 
+use crate::buffers::ByteBuffer;
 use crate::ring::TheIoRing;
-use crate::shared::check_write_buffer;
+use crate::shared::{
+    check_write_buffer, checked_op_len, make_destination_slot, writable_buffer_region,
+};
 
 /// Performs a ``socket(2)`` call via io_uring.
 #[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_create_socket")]
@@ -18,25 +21,36 @@ pub fn ioring_prep_create_socket(
     domain: i32,
     socket_type: i32,
     protocol: i32,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+    direct_slot: Option<i32>,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Socket::CODE) {
         return Err(PyNotImplementedError::new_err("socket"));
     }
 
     let entry = io_uring::opcode::Socket::new(domain, socket_type, protocol)
+        .file_index(make_destination_slot(direct_slot)?)
         .build()
         .flags(Flags::from_bits_truncate(sqe_flags))
         .user_data(user_data);
 
     ring.autosubmit(&entry)?;
-    return Ok(());
+    return Ok(user_data);
+}
+
+/** The operations that take a socket address. */
+enum SockaddrOp {
+    Connect,
+    Bind,
 }
 
 // does the conversion sockaddr dance
 fn do_sockaddr_submit(
     ring: &mut TheIoRing,
+    op: SockaddrOp,
     fd: RawFd,
     addr: SocketAddr,
     user_data: u64,
@@ -54,10 +68,16 @@ fn do_sockaddr_submit(
         ));
     }
 
-    let entry = io_uring::opcode::Connect::new(Fd(fd), c_addr.as_ptr(), c_addr.len())
-        .build()
-        .flags(flags)
-        .user_data(user_data);
+    let entry = match op {
+        SockaddrOp::Connect => {
+            io_uring::opcode::Connect::new(Fd(fd), c_addr.as_ptr(), c_addr.len()).build()
+        }
+        SockaddrOp::Bind => {
+            io_uring::opcode::Bind::new(Fd(fd), c_addr.as_ptr(), c_addr.len()).build()
+        }
+    }
+    .flags(flags)
+    .user_data(user_data);
 
     ring.autosubmit(&entry)?;
     ring.add_owned_sockaddr(user_data, c_addr);
@@ -71,9 +91,11 @@ pub fn ioring_prep_connect_v4(
     fd: RawFd,
     ip: &str,
     port: u16,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Connect::CODE) {
         return Err(PyNotImplementedError::new_err("connect"));
     }
@@ -81,9 +103,16 @@ pub fn ioring_prep_connect_v4(
     let v4 = Ipv4Addr::from_str(ip)?;
     let rust_addr = SocketAddr::new(IpAddr::V4(v4), port);
 
-    do_sockaddr_submit(ring, fd, rust_addr, user_data, sqe_flags)?;
+    do_sockaddr_submit(
+        ring,
+        SockaddrOp::Connect,
+        fd,
+        rust_addr,
+        user_data,
+        sqe_flags,
+    )?;
 
-    return Ok(());
+    return Ok(user_data);
 }
 
 /// Performs a ``connect(2)`` call via io_uring for AF_INET6 sockets.
@@ -93,9 +122,11 @@ pub fn ioring_prep_connect_v6(
     fd: RawFd,
     ip: &str,
     port: u16,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Connect::CODE) {
         return Err(PyNotImplementedError::new_err("connect"));
     }
@@ -103,9 +134,144 @@ pub fn ioring_prep_connect_v6(
     let v6 = Ipv6Addr::from_str(ip)?;
     let rust_addr = SocketAddr::new(IpAddr::V6(v6), port);
 
-    do_sockaddr_submit(ring, fd, rust_addr, user_data, sqe_flags)?;
+    do_sockaddr_submit(
+        ring,
+        SockaddrOp::Connect,
+        fd,
+        rust_addr,
+        user_data,
+        sqe_flags,
+    )?;
 
-    return Ok(());
+    return Ok(user_data);
+}
+
+/// Performs a ``bind(2)`` call via io_uring for AF_INET sockets.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_bind_v4")]
+pub fn ioring_prep_bind_v4(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    ip: &str,
+    port: u16,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Bind::CODE) {
+        return Err(PyNotImplementedError::new_err("bind"));
+    }
+
+    let v4 = Ipv4Addr::from_str(ip)?;
+    let rust_addr = SocketAddr::new(IpAddr::V4(v4), port);
+
+    do_sockaddr_submit(ring, SockaddrOp::Bind, fd, rust_addr, user_data, sqe_flags)?;
+
+    return Ok(user_data);
+}
+
+/// Performs a ``bind(2)`` call via io_uring for AF_INET6 sockets.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_bind_v6")]
+pub fn ioring_prep_bind_v6(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    ip: &str,
+    port: u16,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Bind::CODE) {
+        return Err(PyNotImplementedError::new_err("bind"));
+    }
+
+    let v6 = Ipv6Addr::from_str(ip)?;
+    let rust_addr = SocketAddr::new(IpAddr::V6(v6), port);
+
+    do_sockaddr_submit(ring, SockaddrOp::Bind, fd, rust_addr, user_data, sqe_flags)?;
+
+    return Ok(user_data);
+}
+
+/// Performs a ``listen(2)`` call via io_uring.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_listen")]
+pub fn ioring_prep_listen(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    backlog: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Listen::CODE) {
+        return Err(PyNotImplementedError::new_err("listen"));
+    }
+
+    let entry = io_uring::opcode::Listen::new(Fd(fd), backlog)
+        .build()
+        .flags(Flags::from_bits_truncate(sqe_flags))
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    return Ok(user_data);
+}
+
+/// Performs an ``accept4(2)`` call via io_uring.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_accept")]
+pub fn ioring_prep_accept(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+    direct_slot: Option<i32>,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Accept::CODE) {
+        return Err(PyNotImplementedError::new_err("accept"));
+    }
+
+    // the peer address can always be retrieved later with getpeername(2), so there's no need to
+    // own a sockaddr buffer here.
+    let entry = io_uring::opcode::Accept::new(Fd(fd), std::ptr::null_mut(), std::ptr::null_mut())
+        .flags(flags)
+        .file_index(make_destination_slot(direct_slot)?)
+        .build()
+        .flags(Flags::from_bits_truncate(sqe_flags))
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    return Ok(user_data);
+}
+
+/// Performs a multishot ``accept4(2)`` call via io_uring, which stays armed until it fails.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_accept_multishot")]
+pub fn ioring_prep_accept_multishot(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+    allocate_direct: bool,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::AcceptMulti::CODE) {
+        return Err(PyNotImplementedError::new_err("accept_multishot"));
+    }
+
+    let entry = io_uring::opcode::AcceptMulti::new(Fd(fd))
+        .flags(flags)
+        .allocate_file_index(allocate_direct)
+        .build()
+        .flags(Flags::from_bits_truncate(sqe_flags))
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    return Ok(user_data);
 }
 
 /// Performs a ``send(2)`` call via io_uring.
@@ -113,13 +279,15 @@ pub fn ioring_prep_connect_v6(
 pub fn ioring_prep_send(
     ring: &mut TheIoRing,
     fd: RawFd,
-    data: &[u8],
-    size: usize,
+    data: ByteBuffer,
+    size: Option<usize>,
     buffer_offset: usize,
     flags: i32,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Send::CODE) {
         return Err(PyNotImplementedError::new_err("send"));
     }
@@ -131,18 +299,66 @@ pub fn ioring_prep_send(
         ));
     }
 
-    let end_offset = check_write_buffer(data, size, buffer_offset)?;
-    let vec = data[buffer_offset..end_offset].to_vec();
-    let entry = io_uring::opcode::Send::new(Fd(fd), vec.as_ptr(), vec.len() as u32)
+    // the buffer export is held by the ring until the operation completes, rather than copying.
+    let slice = data.as_slice();
+    let size = size.unwrap_or(slice.len());
+    let end_offset = check_write_buffer(slice, size, buffer_offset)?;
+    let ptr = slice[buffer_offset..end_offset].as_ptr();
+
+    let entry = io_uring::opcode::Send::new(Fd(fd), ptr, checked_op_len(size)?)
         .flags(flags)
         .build()
         .flags(parsed_sqe_flags)
         .user_data(user_data);
 
     ring.autosubmit(&entry)?;
-    ring.add_owned_buffer(user_data, vec);
+    ring.add_owned_python_buffer(user_data, data);
 
-    return Ok(());
+    return Ok(user_data);
+}
+
+/// Performs a zero-copy ``send(2)`` call via io_uring.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_send_zc")]
+pub fn ioring_prep_send_zc(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    data: ByteBuffer,
+    size: Option<usize>,
+    buffer_offset: usize,
+    flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::SendZc::CODE) {
+        return Err(PyNotImplementedError::new_err("send_zc"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    // no copy here; the buffer export is owned by the ring until the kernel posts the
+    // notification completion saying it's done with the memory.
+    let slice = data.as_slice();
+    let size = size.unwrap_or(slice.len());
+    let end_offset = check_write_buffer(slice, size, buffer_offset)?;
+    let ptr = slice[buffer_offset..end_offset].as_ptr();
+
+    let entry = io_uring::opcode::SendZc::new(Fd(fd), ptr, checked_op_len(size)?)
+        .flags(flags)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    ring.add_owned_python_buffer(user_data, data);
+
+    return Ok(user_data);
 }
 
 /// Performs a ``recv(2)`` call via io_uring.
@@ -152,9 +368,12 @@ pub fn ioring_prep_recv(
     fd: RawFd,
     max_size: u32,
     flags: i32,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+    buffer_group: Option<u16>,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Recv::CODE) {
         return Err(PyNotImplementedError::new_err("recv"));
     }
@@ -166,6 +385,22 @@ pub fn ioring_prep_recv(
         ));
     }
 
+    if let Some(group) = buffer_group {
+        // idle sockets don't pin anything; the kernel only picks a buffer once data arrives.
+        ring.check_buffer_group(group)?;
+
+        let entry = io_uring::opcode::Recv::new(Fd(fd), std::ptr::null_mut(), max_size)
+            .flags(flags)
+            .buf_group(group)
+            .build()
+            .flags(parsed_sqe_flags | Flags::BUFFER_SELECT)
+            .user_data(user_data);
+
+        ring.autosubmit(&entry)?;
+        ring.add_provided_buffer_user(user_data, group);
+        return Ok(user_data);
+    }
+
     let mut buf: Vec<u8> = vec![0; max_size as usize];
     let entry = io_uring::opcode::Recv::new(Fd(fd), buf.as_mut_ptr(), max_size)
         .flags(flags)
@@ -176,5 +411,81 @@ pub fn ioring_prep_recv(
     ring.autosubmit(&entry)?;
     ring.add_owned_buffer(user_data, buf);
 
-    return Ok(());
+    return Ok(user_data);
+}
+
+/// Performs a ``recv(2)`` call via io_uring directly into a writable Python buffer.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_recv_into")]
+pub fn ioring_prep_recv_into(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    data: ByteBuffer,
+    size: Option<usize>,
+    buffer_offset: usize,
+    flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Recv::CODE) {
+        return Err(PyNotImplementedError::new_err("recv"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    let (ptr, size) = writable_buffer_region(&data, size, buffer_offset)?;
+    let entry = io_uring::opcode::Recv::new(Fd(fd), ptr, checked_op_len(size)?)
+        .flags(flags)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    ring.add_owned_python_buffer(user_data, data);
+
+    return Ok(user_data);
+}
+
+/// Performs a multishot ``recv(2)`` call via io_uring, which stays armed until it fails.
+#[pyo3::pyfunction(name = "_RUSTFFI_ioring_prep_recv_multishot")]
+pub fn ioring_prep_recv_multishot(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    flags: i32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+    buffer_group: u16,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::RecvMulti::CODE) {
+        return Err(PyNotImplementedError::new_err("recv_multishot"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    // multishot receives always pick their buffers from a provided buffer ring.
+    ring.check_buffer_group(buffer_group)?;
+
+    let entry = io_uring::opcode::RecvMulti::new(Fd(fd), buffer_group)
+        .flags(flags)
+        .build()
+        .flags(parsed_sqe_flags | Flags::BUFFER_SELECT)
+        .user_data(user_data);
+
+    ring.autosubmit(&entry)?;
+    ring.add_provided_buffer_user(user_data, buffer_group);
+
+    return Ok(user_data);
 }
@@ -1,20 +1,41 @@
-use std::{collections::HashMap, os::fd::RawFd, sync::atomic::AtomicU64};
+use std::{
+    collections::HashMap,
+    os::fd::{AsRawFd, RawFd},
+    sync::atomic::AtomicU64,
+};
 
 use io_uring::{cqueue::Entry, squeue::Flags, types::Timespec};
-use nix::sys::socket::SockaddrLike;
+use nix::{libc, sys::socket::SockaddrLike};
 use pyo3::{
     exceptions::{PyOSError, PyValueError},
     pyclass, pyfunction, pymethods,
-    types::PyModule,
-    Bound, PyResult, Python,
+    types::{PyAnyMethods, PyBytes, PyDict, PyDictMethods, PyModule},
+    Bound, PyAny, PyResult, Python,
+};
+
+use crate::{
+    buffers::{ByteBuffer, FixedBufferPool, OwnedIoVecs, ProvidedBufferRing},
+    enter::{self, RegisteredRing, IORING_ENTER_GETEVENTS},
+    shared::make_native_array,
+    slab::UserDataTable,
 };
 
+// not exposed by the io_uring crate.
+const IORING_CQE_F_NOTIF: u32 = 1 << 3;
+
+// mirrors ``TaskRunMode`` on the Python side.
+const TASK_RUN_DEFAULT: u8 = 0;
+const TASK_RUN_COOPERATIVE: u8 = 1;
+const TASK_RUN_DEFERRED: u8 = 2;
+
 /** A single completion event returned by the io_uring. */
 #[pyclass]
 pub struct CompletionEvent {
     pub user_data: u64,
     pub result: i32,
     pub buffer: Option<Vec<u8>>,
+    pub buffer_id: Option<u16>,
+    pub flags: u32,
 }
 
 #[pymethods]
@@ -35,6 +56,30 @@ impl CompletionEvent {
         return self.buffer.as_deref();
     }
 
+    /** The ID of the provided buffer the kernel picked for this operation, if any. */
+    #[getter]
+    pub fn buffer_id(&self) -> Option<u16> {
+        return self.buffer_id;
+    }
+
+    /** The ``cqe->flags`` field. */
+    #[getter]
+    pub fn flags(&self) -> u32 {
+        return self.flags;
+    }
+
+    /** If True, the operation is still armed and more completions will be posted for it. */
+    #[getter]
+    pub fn has_more(&self) -> bool {
+        return io_uring::cqueue::more(self.flags);
+    }
+
+    /** If True, this is a zero-copy notification that the operation's buffer was released. */
+    #[getter]
+    pub fn is_notification(&self) -> bool {
+        return (self.flags & IORING_CQE_F_NOTIF) != 0;
+    }
+
     pub fn should_be_ignored(&self) -> bool {
         return (self.user_data & (1 << 63)) != 0;
     }
@@ -46,6 +91,16 @@ pub(crate) enum OwnedData {
     TwoPaths(Vec<u8>, Vec<u8>),
     Buffer(Vec<u8>),
     SockAddr(Box<dyn SockaddrLike + Send + Sync>),
+    /// Marker for an operation that points into the registered buffer pool.
+    FixedBuffer,
+    /// Marker for an operation that picks a buffer from the provided buffer ring with this ID.
+    ProvidedBuffer(u16),
+    /// An exported Python buffer that the kernel reads from or writes to directly.
+    PythonBuffer(ByteBuffer),
+    /// The iovecs for a vectored operation, and the Python buffers that they point into.
+    IoVecs(OwnedIoVecs, Vec<ByteBuffer>),
+    /// The timespec for a timeout operation.
+    Timespec(Box<Timespec>),
 }
 
 /**
@@ -62,11 +117,67 @@ pub struct TheIoRing {
     user_data_counter: AtomicU64,
     autosubmit: bool,
 
-    owned_data: HashMap<u64, OwnedData>,
+    owned_data: UserDataTable<OwnedData>,
+
+    pub(crate) fixed_buffers: Option<FixedBufferPool>,
+    pub(crate) provided_buffers: HashMap<u16, ProvidedBufferRing>,
+    registered_files: u32,
+    task_run_mode: u8,
+
+    /// The ring's own fd in the registered ring table of the creating thread, if it was registered.
+    registered_ring: Option<RegisteredRing>,
 }
 
 // non-python methods
 impl TheIoRing {
+    /**
+    Gets the user data value for a new submission, allocating the next one from the counter if
+    the caller didn't provide one.
+    */
+    pub(crate) fn resolve_user_data(&self, user_data: Option<u64>) -> u64 {
+        return user_data.unwrap_or_else(|| {
+            self.user_data_counter
+                .fetch_add(1, std::sync::atomic::Ordering::Relaxed)
+        });
+    }
+
+    /**
+    Runs any pending task work, so that completions which are ready actually get posted to the
+    completion queue.
+
+    Without ``COOP_TASKRUN`` the kernel interrupts us to run task work as soon as it's queued. With
+    it, task work waits for the next transition into the kernel, and with ``DEFER_TASKRUN`` it only
+    ever runs inside ``io_uring_enter``. Both are set up with ``TASKRUN_FLAG``, which tells us when
+    there's any work waiting so that we don't have to enter the kernel for nothing.
+    */
+    fn run_task_work(
+        ring: &mut io_uring::IoUring,
+        task_run_mode: u8,
+        registered_ring_index: Option<u32>,
+    ) -> PyResult<()> {
+        if task_run_mode == TASK_RUN_DEFAULT || !ring.submission().taskrun() {
+            return Ok(());
+        }
+
+        enter::enter(
+            ring,
+            registered_ring_index,
+            0,
+            0,
+            IORING_ENTER_GETEVENTS,
+            None,
+        )?;
+
+        return Ok(());
+    }
+
+    /** Unregisters the ring's own fd, if it was registered. */
+    fn release_registered_ring(&mut self) {
+        if let (Some(ring), Some(registered)) = (&self.the_io_uring, self.registered_ring.take()) {
+            enter::unregister_ring_fd(ring, registered);
+        }
+    }
+
     /** Adds a new path to this ring's ownership */
     pub(crate) fn add_owned_path(&mut self, user_data: u64, path: Vec<u8>) {
         let data = OwnedData::OnePath(path);
@@ -88,6 +199,109 @@ impl TheIoRing {
         self.owned_data.insert(user_data, OwnedData::SockAddr(addr));
     }
 
+    /** Adds a new Python buffer export to this ring's ownership. */
+    pub(crate) fn add_owned_python_buffer(&mut self, user_data: u64, buf: ByteBuffer) {
+        self.owned_data
+            .insert(user_data, OwnedData::PythonBuffer(buf));
+    }
+
+    /** Adds a set of iovecs, and the buffers they point into, to this ring's ownership. */
+    pub(crate) fn add_owned_iovecs(
+        &mut self,
+        user_data: u64,
+        iovecs: OwnedIoVecs,
+        buffers: Vec<ByteBuffer>,
+    ) {
+        self.owned_data
+            .insert(user_data, OwnedData::IoVecs(iovecs, buffers));
+    }
+
+    /** Adds a timespec to this ring's ownership. */
+    pub(crate) fn add_owned_timespec(&mut self, user_data: u64, timespec: Box<Timespec>) {
+        self.owned_data
+            .insert(user_data, OwnedData::Timespec(timespec));
+    }
+
+    /** Marks an operation as using the registered buffer pool. */
+    pub(crate) fn add_fixed_buffer_user(&mut self, user_data: u64) {
+        if let Some(pool) = &mut self.fixed_buffers {
+            pool.in_flight += 1;
+        }
+
+        self.owned_data.insert(user_data, OwnedData::FixedBuffer);
+    }
+
+    /** Marks an operation as picking a buffer from a provided buffer ring. */
+    pub(crate) fn add_provided_buffer_user(&mut self, user_data: u64, group: u16) {
+        if let Some(buf_ring) = self.provided_buffers.get_mut(&group) {
+            buf_ring.in_flight += 1;
+        }
+
+        self.owned_data
+            .insert(user_data, OwnedData::ProvidedBuffer(group));
+    }
+
+    /** Checks that a provided buffer ring has been registered for the specified group. */
+    pub(crate) fn check_buffer_group(&self, group: u16) -> PyResult<()> {
+        if !self.provided_buffers.contains_key(&group) {
+            let message = format!("No buffer ring is registered for group {}", group);
+            return Err(PyValueError::new_err(message));
+        }
+
+        return Ok(());
+    }
+
+    /**
+    Releases the data owned by the operation that produced ``entry``, returning the read buffer if
+    the operation owned one.
+    */
+    fn complete_entry(&mut self, entry: &Entry) -> Option<Vec<u8>> {
+        let buffer_id = io_uring::cqueue::buffer_select(entry.flags());
+        let more = io_uring::cqueue::more(entry.flags());
+
+        // multishot operations stay armed, so their data has to stick around until the final
+        // completion (the one without IORING_CQE_F_MORE) is posted.
+        let owned = if more {
+            match self.owned_data.get(entry.user_data()) {
+                Some(OwnedData::ProvidedBuffer(group)) => Some(OwnedData::ProvidedBuffer(*group)),
+                _ => None,
+            }
+        } else {
+            self.owned_data.remove(entry.user_data())
+        };
+
+        return match owned {
+            Some(OwnedData::Buffer(mut buf)) => {
+                if entry.result() >= 0 && buf.len() != (entry.result() as usize) {
+                    buf.resize(entry.result() as usize, 0);
+                }
+
+                Some(buf)
+            }
+            Some(OwnedData::FixedBuffer) => {
+                if let Some(pool) = &mut self.fixed_buffers {
+                    pool.in_flight = pool.in_flight.saturating_sub(1);
+                }
+
+                None
+            }
+            Some(OwnedData::ProvidedBuffer(group)) => {
+                if let Some(buf_ring) = self.provided_buffers.get_mut(&group) {
+                    if !more {
+                        buf_ring.in_flight = buf_ring.in_flight.saturating_sub(1);
+                    }
+
+                    if let Some(bid) = buffer_id {
+                        buf_ring.mark_checked_out(bid);
+                    }
+                }
+
+                None
+            }
+            _ => None,
+        };
+    }
+
     /** Submits a single entry to the queue, automatically submitting if the queue is full. */
     pub(crate) fn autosubmit(&mut self, entry: &io_uring::squeue::Entry) -> PyResult<()> {
         let Some(ring) = &mut self.the_io_uring else {
@@ -98,7 +312,7 @@ impl TheIoRing {
 
         loop {
             if needs_submit {
-                ring.submit()?;
+                enter::submit_and_wait(ring, enter::current_index(self.registered_ring), 0, None)?;
             }
 
             match unsafe { ring.submission().push(entry) } {
@@ -117,6 +331,60 @@ impl TheIoRing {
             }
         }
     }
+
+    /**
+    Pushes ``count`` entries in one go, calling ``push_one`` with the index of each entry and a new
+    user data value to push it, and returns the user data of every entry in order.
+
+    Room for as many of the entries as fit in the submission queue is reserved before any of them
+    are pushed, so a batch that fits (or any batch, if autosubmit is off) either gets pushed in
+    full or not at all. If a bigger batch fails part of the way through, the entries that were
+    already pushed are still live, so their user data is attached to the error as its
+    ``user_data`` attribute.
+    */
+    pub(crate) fn push_many(
+        &mut self,
+        py: Python<'_>,
+        count: usize,
+        mut push_one: impl FnMut(&mut TheIoRing, usize, u64) -> PyResult<()>,
+    ) -> PyResult<Vec<u64>> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        let capacity = ring.submission().capacity();
+        let mut user_datas = Vec::<u64>::with_capacity(count);
+
+        while user_datas.len() < count {
+            let remaining = count - user_datas.len();
+            let chunk = if self.autosubmit {
+                remaining.min(capacity)
+            } else {
+                remaining
+            };
+
+            let pushed = self.reserve_sq_entries(chunk).and_then(|_| {
+                for _ in 0..chunk {
+                    let user_data = self.resolve_user_data(None);
+                    push_one(self, user_datas.len(), user_data)?;
+                    user_datas.push(user_data);
+                }
+
+                return Ok(());
+            });
+
+            if let Err(err) = pushed {
+                if !user_datas.is_empty() {
+                    let _ = make_native_array(py, "Q", &user_datas)
+                        .and_then(|it| err.value(py).setattr("user_data", it));
+                }
+
+                return Err(err);
+            }
+        }
+
+        return Ok(user_datas);
+    }
 }
 
 // exposed python methods
@@ -134,8 +402,13 @@ impl TheIoRing {
 
     /// Submits the queue and returns immediately.
     pub fn submit(&mut self) -> PyResult<usize> {
-        if let Some(ring) = &self.the_io_uring {
-            return Ok(ring.submit()?);
+        if let Some(ring) = &mut self.the_io_uring {
+            return Ok(enter::submit_and_wait(
+                ring,
+                enter::current_index(self.registered_ring),
+                0,
+                None,
+            )?);
         }
 
         return Err(PyValueError::new_err("The ring is closed"));
@@ -143,25 +416,61 @@ impl TheIoRing {
 
     /// Submits the queue and waits for ``want`` completion queues to arrive.
     pub fn wait(&mut self, py: Python<'_>, want: usize) -> PyResult<usize> {
-        if let Some(ring) = &self.the_io_uring {
-            let result = py.allow_threads(|| Ok(ring.submit_and_wait(want)?));
+        let registered_ring_index = enter::current_index(self.registered_ring);
+
+        if let Some(ring) = &mut self.the_io_uring {
+            let result = py.allow_threads(|| {
+                Ok(enter::submit_and_wait(
+                    ring,
+                    registered_ring_index,
+                    want,
+                    None,
+                )?)
+            });
             return result;
         }
 
         return Err(PyValueError::new_err("The ring is closed"));
     }
 
-    /// Submits the queue and waits for a single completion queue entry with the specified timeout.
-    pub fn wait_with_timeout(&mut self, py: Python<'_>, sec: u64, nsec: u32) -> PyResult<usize> {
+    /// Submits the queue and waits for ``want`` completion queue entries, or until the specified
+    /// timeout passes.
+    pub fn wait_with_timeout(
+        &mut self,
+        py: Python<'_>,
+        sec: u64,
+        nsec: u32,
+        want: usize,
+    ) -> PyResult<usize> {
+        let registered_ring_index = enter::current_index(self.registered_ring);
         let Some(ring) = &mut self.the_io_uring else {
             return Err(PyValueError::new_err("The ring is closed"));
         };
 
+        let timespec = Timespec::new().sec(sec).nsec(nsec);
+
+        if ring.params().is_feature_ext_arg() {
+            // the timeout is passed straight to io_uring_enter, so this is a single syscall that
+            // doesn't need a timeout SQE and doesn't post a completion event.
+            let result = py.allow_threads(|| {
+                enter::submit_and_wait(ring, registered_ring_index, want, Some(&timespec))
+            });
+
+            return match result {
+                Ok(count) => Ok(count),
+                // the kernel only reports a timeout if nothing was submitted.
+                Err(e) if e.raw_os_error() == Some(libc::ETIME) => Ok(0),
+                Err(e) => Err(e.into()),
+            };
+        }
+
+        // old kernels without IORING_FEAT_EXT_ARG only have timeout SQEs, which count towards the
+        // number of completions waited for, so this can only wait for a single one.
+
         // purge the queue!! don't want to push a timeout op and just have it... not do anything
-        let count = ring.submit()?;
+        let count = enter::submit_and_wait(ring, registered_ring_index, 0, None)?;
 
         // playing stack-frame chicken with rust here
-        let timespec = Timespec::new().sec(sec).nsec(nsec);
         let timeout = io_uring::opcode::Timeout::new(&timespec)
             .build()
             .flags(Flags::SKIP_SUCCESS)
@@ -170,10 +479,41 @@ impl TheIoRing {
         unsafe { ring.submission().push(&timeout) }
             .map_err(|_| PyValueError::new_err("Couldn't submit timeout operation"))?;
 
-        py.allow_threads(|| ring.submit_and_wait(1))?;
+        py.allow_threads(|| enter::submit_and_wait(ring, registered_ring_index, 1, None))?;
         return Ok(count);
     }
 
+    /// Makes sure that there's room for ``count`` more entries in the submission queue, submitting
+    /// the queue first if there isn't.
+    pub fn reserve_sq_entries(&mut self, count: usize) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        let (capacity, pending) = {
+            let submission = ring.submission();
+            (submission.capacity(), submission.len())
+        };
+
+        if count > capacity {
+            let message = format!(
+                "can't fit {} entries in a submission queue of {}",
+                count, capacity
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        if capacity - pending < count {
+            if !self.autosubmit {
+                return Err(PyValueError::new_err("submission queue is full"));
+            }
+
+            enter::submit_and_wait(ring, enter::current_index(self.registered_ring), 0, None)?;
+        }
+
+        return Ok(());
+    }
+
     /// Gets the number of pending entries in the submission queue.
     pub fn pending_sq_entries(&mut self) -> PyResult<usize> {
         let Some(ring) = &mut self.the_io_uring else {
@@ -190,6 +530,12 @@ impl TheIoRing {
             return Err(PyValueError::new_err("The ring is closed"));
         };
 
+        TheIoRing::run_task_work(
+            ring,
+            self.task_run_mode,
+            enter::current_index(self.registered_ring),
+        )?;
+
         // arcane borrow checker incantations, because completion() returns an entirely new object
         // that actually points to the underlying ring
         loop {
@@ -206,49 +552,405 @@ impl TheIoRing {
         let mut completed_results: Vec<CompletionEvent> = Vec::with_capacity(entries.capacity());
 
         for entry in entries {
-            let buffer = self
-                .owned_data
-                .remove(&entry.user_data())
-                .and_then(|owned| match owned {
-                    OwnedData::Buffer(mut buf) => {
-                        if entry.result() < 0 || buf.len() == (entry.result() as usize) {
-                            return Some(buf);
-                        }
-
-                        buf.resize(entry.result() as usize, 0);
-                        return Some(buf);
-                    }
-                    _ => {
-                        return None;
-                    }
-                });
+            let buffer = self.complete_entry(&entry);
 
             completed_results.push(CompletionEvent {
                 user_data: entry.user_data(),
                 result: entry.result(),
                 buffer,
+                buffer_id: io_uring::cqueue::buffer_select(entry.flags()),
+                flags: entry.flags(),
             });
         }
 
         return Ok(completed_results);
     }
 
+    /// Drains up to ``max_entries`` completion entries from the ring into parallel arrays.
+    ///
+    /// This returns an ``array('Q')`` of user data values, an ``array('i')`` of results, an
+    /// ``array('I')`` of flags, and a dict mapping user data to the read buffer for only the
+    /// entries that owned one. No per-entry Python objects are created otherwise.
+    pub fn get_completion_batch<'py>(
+        &mut self,
+        py: Python<'py>,
+        max_entries: usize,
+    ) -> PyResult<(
+        Bound<'py, PyAny>,
+        Bound<'py, PyAny>,
+        Bound<'py, PyAny>,
+        Bound<'py, PyDict>,
+    )> {
+        let mut entries = Vec::<Entry>::new();
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        TheIoRing::run_task_work(
+            ring,
+            self.task_run_mode,
+            enter::current_index(self.registered_ring),
+        )?;
+
+        while entries.len() < max_entries {
+            let mut completion = ring.completion();
+
+            if completion.is_empty() {
+                break;
+            }
+
+            // the completion queue head is synced when ``completion`` is dropped, so anything
+            // past ``max_entries`` stays in the queue for the next call.
+            let remaining = max_entries - entries.len();
+            entries.extend(completion.by_ref().take(remaining));
+        }
+
+        let mut user_datas = Vec::<u64>::with_capacity(entries.len());
+        let mut results = Vec::<i32>::with_capacity(entries.len());
+        let mut flags = Vec::<u32>::with_capacity(entries.len());
+        let buffers = PyDict::new(py);
+
+        for entry in entries {
+            if let Some(buffer) = self.complete_entry(&entry) {
+                buffers.set_item(entry.user_data(), PyBytes::new(py, &buffer))?;
+            }
+
+            user_datas.push(entry.user_data());
+            results.push(entry.result());
+            flags.push(entry.flags());
+        }
+
+        return Ok((
+            make_native_array(py, "Q", &user_datas)?,
+            make_native_array(py, "i", &results)?,
+            make_native_array(py, "I", &flags)?,
+            buffers,
+        ));
+    }
+
     /// Registers an ``eventfd(2)`` that will be notified when the ring has new completion events.
-    pub fn register_eventfd(&mut self, event_fd: RawFd) -> PyResult<()> {
+    ///
+    /// If ``async_only`` is set, the eventfd is only notified for operations that complete
+    /// asynchronously, and not for those that complete inline while being submitted.
+    pub fn register_eventfd(&mut self, event_fd: RawFd, async_only: bool) -> PyResult<()> {
         let Some(ring) = &mut self.the_io_uring else {
             return Err(PyValueError::new_err("The ring is closed"));
         };
-        ring.submitter().register_eventfd(event_fd)?;
+
+        if async_only {
+            ring.submitter().register_eventfd_async(event_fd)?;
+        } else {
+            ring.submitter().register_eventfd(event_fd)?;
+        }
+
         return Ok(());
     }
 
+    /// Registers a pool of ``count`` buffers, each ``size`` bytes long, with the kernel.
+    pub fn register_buffers(&mut self, count: u16, size: u32) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if self.fixed_buffers.is_some() {
+            return Err(PyValueError::new_err("Buffers are already registered"));
+        }
+
+        let mut pool = FixedBufferPool::new(count, size)?;
+        let iovecs = pool.iovecs();
+
+        // safety: the pool is owned by us and is only freed after unregistering or after the
+        // ring itself is dropped.
+        unsafe { ring.submitter().register_buffers(&iovecs) }?;
+        self.fixed_buffers = Some(pool);
+        return Ok(());
+    }
+
+    /// Unregisters the buffer pool previously registered with ``register_buffers``.
+    pub fn unregister_buffers(&mut self) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        let Some(pool) = &self.fixed_buffers else {
+            return Err(PyValueError::new_err("No buffers are registered"));
+        };
+
+        if pool.in_flight > 0 {
+            let message = format!(
+                "Can't unregister buffers with {} operations still in flight",
+                pool.in_flight
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        ring.submitter().unregister_buffers()?;
+        self.fixed_buffers = None;
+        return Ok(());
+    }
+
+    /// Copies ``size`` bytes out of the registered buffer at ``index``.
+    pub fn read_registered_buffer<'py>(
+        &mut self,
+        py: Python<'py>,
+        index: u16,
+        offset: usize,
+        size: usize,
+    ) -> PyResult<Bound<'py, PyBytes>> {
+        let Some(pool) = &mut self.fixed_buffers else {
+            return Err(PyValueError::new_err("No buffers are registered"));
+        };
+
+        let slot = pool.slot(index, offset, size)?;
+        return Ok(PyBytes::new(py, slot));
+    }
+
+    /// Copies ``data`` into the registered buffer at ``index``.
+    pub fn write_registered_buffer(
+        &mut self,
+        index: u16,
+        offset: usize,
+        data: ByteBuffer,
+    ) -> PyResult<usize> {
+        let Some(pool) = &mut self.fixed_buffers else {
+            return Err(PyValueError::new_err("No buffers are registered"));
+        };
+
+        let data = data.as_slice();
+        let slot = pool.slot(index, offset, data.len())?;
+        slot.copy_from_slice(data);
+        return Ok(data.len());
+    }
+
+    /// Registers a provided buffer ring of ``count`` buffers, each ``size`` bytes long, under the
+    /// buffer group ID ``group``.
+    pub fn register_buffer_ring(&mut self, group: u16, count: u16, size: u32) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if self.provided_buffers.contains_key(&group) {
+            let message = format!("A buffer ring is already registered for group {}", group);
+            return Err(PyValueError::new_err(message));
+        }
+
+        let buf_ring = ProvidedBufferRing::new(count, size)?;
+
+        // safety: the ring memory is owned by us and is only freed after unregistering or after
+        // the ring itself is dropped.
+        unsafe {
+            ring.submitter()
+                .register_buf_ring(buf_ring.ring_addr(), buf_ring.count(), group)
+        }?;
+
+        self.provided_buffers.insert(group, buf_ring);
+        return Ok(());
+    }
+
+    /// Unregisters the provided buffer ring for the buffer group ID ``group``.
+    pub fn unregister_buffer_ring(&mut self, group: u16) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        let Some(buf_ring) = self.provided_buffers.get(&group) else {
+            let message = format!("No buffer ring is registered for group {}", group);
+            return Err(PyValueError::new_err(message));
+        };
+
+        if buf_ring.in_flight > 0 {
+            let message = format!(
+                "Can't unregister buffer ring with {} operations still in flight",
+                buf_ring.in_flight
+            );
+            return Err(PyValueError::new_err(message));
+        }
+
+        ring.submitter().unregister_buf_ring(group)?;
+        self.provided_buffers.remove(&group);
+        return Ok(());
+    }
+
+    /// Copies ``size`` bytes out of a checked out provided buffer, optionally recycling it.
+    pub fn read_provided_buffer<'py>(
+        &mut self,
+        py: Python<'py>,
+        group: u16,
+        buffer_id: u16,
+        size: usize,
+        recycle: bool,
+    ) -> PyResult<Bound<'py, PyBytes>> {
+        self.check_buffer_group(group)?;
+        let buf_ring = self.provided_buffers.get_mut(&group).unwrap();
+
+        let data = PyBytes::new(py, buf_ring.get(buffer_id, size)?);
+        if recycle {
+            buf_ring.recycle(buffer_id)?;
+        }
+
+        return Ok(data);
+    }
+
+    /// Hands a checked out provided buffer back to the kernel.
+    pub fn recycle_provided_buffer(&mut self, group: u16, buffer_id: u16) -> PyResult<()> {
+        self.check_buffer_group(group)?;
+        return self
+            .provided_buffers
+            .get_mut(&group)
+            .unwrap()
+            .recycle(buffer_id);
+    }
+
+    /// Registers a sparse file table of ``count`` empty slots with the kernel.
+    pub fn register_files(&mut self, count: u32) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if self.registered_files > 0 {
+            return Err(PyValueError::new_err("Files are already registered"));
+        }
+
+        if count == 0 {
+            return Err(PyValueError::new_err("Can't register an empty file table"));
+        }
+
+        ring.submitter().register_files_sparse(count)?;
+        self.registered_files = count;
+        return Ok(());
+    }
+
+    /// Replaces the slots in the registered file table starting at ``offset`` with ``fds``.
+    ///
+    /// A file descriptor of ``-1`` empties the slot.
+    pub fn update_registered_files(&mut self, offset: u32, fds: Vec<RawFd>) -> PyResult<usize> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if self.registered_files == 0 {
+            return Err(PyValueError::new_err("No files are registered"));
+        }
+
+        return Ok(ring.submitter().register_files_update(offset, &fds)?);
+    }
+
+    /// Unregisters the registered file table, closing every direct descriptor still in it.
+    pub fn unregister_files(&mut self) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if self.registered_files == 0 {
+            return Err(PyValueError::new_err("No files are registered"));
+        }
+
+        ring.submitter().unregister_files()?;
+        self.registered_files = 0;
+        return Ok(());
+    }
+
+    /// Gets the file descriptor of the ring itself.
+    pub fn fileno(&self) -> PyResult<RawFd> {
+        let Some(ring) = &self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        return Ok(ring.as_raw_fd());
+    }
+
+    /// Limits the number of bounded and unbounded io-wq workers, returning the previous limits.
+    ///
+    /// A limit of zero leaves that limit unchanged.
+    pub fn register_iowq_max_workers(
+        &mut self,
+        bounded: u32,
+        unbounded: u32,
+    ) -> PyResult<(u32, u32)> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        // the kernel writes the previous limits back into the same array.
+        let mut limits = [bounded, unbounded];
+        ring.submitter().register_iowq_max_workers(&mut limits)?;
+        return Ok((limits[0], limits[1]));
+    }
+
+    /// Pins the io-wq workers of this ring to the specified set of CPUs.
+    pub fn register_iowq_aff(&mut self, cpus: Vec<usize>) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        if cpus.is_empty() {
+            return Err(PyValueError::new_err(
+                "Can't pin workers to an empty set of CPUs",
+            ));
+        }
+
+        let mut cpu_set: libc::cpu_set_t = unsafe { std::mem::zeroed() };
+        for cpu in cpus {
+            if cpu >= libc::CPU_SETSIZE as usize {
+                let message = format!("cpu {} out of range", cpu);
+                return Err(PyValueError::new_err(message));
+            }
+
+            unsafe { libc::CPU_SET(cpu, &mut cpu_set) };
+        }
+
+        ring.submitter().register_iowq_aff(&cpu_set)?;
+        return Ok(());
+    }
+
+    /// Removes the CPU affinity of the io-wq workers of this ring.
+    pub fn unregister_iowq_aff(&mut self) -> PyResult<()> {
+        let Some(ring) = &mut self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        ring.submitter().unregister_iowq_aff()?;
+        return Ok(());
+    }
+
+    /// Gets the task running mode that the ring was actually set up with.
+    pub fn task_run_mode(&self) -> u8 {
+        return self.task_run_mode;
+    }
+
+    /// Gets the ``(registered_ring_fd, ext_arg, sqpoll)`` capabilities of the ring.
+    pub fn capabilities(&self) -> PyResult<(bool, bool, bool)> {
+        let Some(ring) = &self.the_io_uring else {
+            return Err(PyValueError::new_err("The ring is closed"));
+        };
+
+        return Ok((
+            enter::current_index(self.registered_ring).is_some(),
+            ring.params().is_feature_ext_arg(),
+            ring.params().is_setup_sqpoll(),
+        ));
+    }
+
+    /// Checks if the ring has been closed.
+    pub fn is_closed(&self) -> bool {
+        return self.the_io_uring.is_none();
+    }
+
     /// Closes the io_uring. Don't do this when things are still processing.
     pub fn close(&mut self) -> PyResult<()> {
+        self.release_registered_ring();
         self.the_io_uring = None;
         return Ok(());
     }
 }
 
+impl Drop for TheIoRing {
+    fn drop(&mut self) {
+        // the registration holds a reference to the ring, so it would never be freed otherwise.
+        self.release_registered_ring();
+    }
+}
+
 #[pyfunction(name = "_RUSTFFI_create_io_ring", pass_module)]
 pub fn create_io_ring(
     module: &Bound<'_, PyModule>,
@@ -257,6 +959,9 @@ pub fn create_io_ring(
     sqlpoll_idle_ms: u32,
     single_issuer: bool,
     autosubmit: bool,
+    task_run_mode: u8,
+    sq_thread_cpu: Option<u32>,
+    attach_wq: Option<RawFd>,
 ) -> PyResult<TheIoRing> {
     return module.py().allow_threads(|| {
         // sanity checking for better errors
@@ -276,6 +981,33 @@ pub fn create_io_ring(
             return Err(PyOSError::new_err(message));
         }
 
+        if sq_thread_cpu.is_some() && sqlpoll_idle_ms == 0 {
+            return Err(PyValueError::new_err(
+                "Can't pin the submission queue thread without enabling sqpoll",
+            ));
+        }
+
+        if task_run_mode > TASK_RUN_DEFERRED {
+            let message = format!("invalid task run mode {}", task_run_mode);
+            return Err(PyValueError::new_err(message));
+        }
+
+        let version = (kernel_version.major, kernel_version.minor);
+
+        // each mode falls back to the next best one if it can't be used. none of them can be used
+        // alongside sqpoll, as the kernel thread is the one running the task work there anyway.
+        let task_run_mode = match task_run_mode {
+            TASK_RUN_DEFERRED if sqlpoll_idle_ms == 0 && single_issuer && version >= (6, 1) => {
+                TASK_RUN_DEFERRED
+            }
+            TASK_RUN_DEFERRED | TASK_RUN_COOPERATIVE
+                if sqlpoll_idle_ms == 0 && version >= (5, 19) =>
+            {
+                TASK_RUN_COOPERATIVE
+            }
+            _ => TASK_RUN_DEFAULT,
+        };
+
         let mut probe = io_uring::Probe::new();
 
         let mut builder: &mut io_uring::Builder<io_uring::squeue::Entry, io_uring::cqueue::Entry> =
@@ -289,16 +1021,31 @@ pub fn create_io_ring(
             builder = builder.setup_single_issuer();
         };
 
-        // It looks like this binding doesn't correctly handle this (sigh...)
-        /*if kernel_version.major >= 6 || kernel_version.minor >= 19 {
-            builder = builder.setup_coop_taskrun();
-            builder = builder.setup_taskrun_flag();
-        }*/
+        // the taskrun flag is what lets ``run_task_work`` know when it actually needs to enter the
+        // kernel to get completions posted.
+        match task_run_mode {
+            TASK_RUN_DEFERRED => {
+                builder = builder.setup_defer_taskrun().setup_taskrun_flag();
+            }
+            TASK_RUN_COOPERATIVE => {
+                builder = builder.setup_coop_taskrun().setup_taskrun_flag();
+            }
+            _ => {}
+        }
 
         if sqlpoll_idle_ms > 0 {
             builder = builder.setup_sqpoll(sqlpoll_idle_ms);
         }
 
+        if let Some(cpu) = sq_thread_cpu {
+            builder = builder.setup_sqpoll_cpu(cpu);
+        }
+
+        // shares the io-wq worker pool of another ring, and its sqpoll thread if both use sqpoll.
+        if let Some(fd) = attach_wq {
+            builder = builder.setup_attach_wq(fd);
+        }
+
         if cq_entries > entries {
             builder = builder.setup_cqsize(cq_entries);
         }
@@ -312,12 +1059,26 @@ pub fn create_io_ring(
 
         ring.submitter().register_probe(&mut probe)?;
 
+        // the registered index only works from the thread that registered it, so it's only worth
+        // it for single issuer rings, which are usually driven from the thread that created them.
+        // other threads fall back to the plain fd. sqpoll rings barely enter the kernel at all.
+        let registered_ring = if single_issuer && sqlpoll_idle_ms == 0 {
+            enter::register_ring_fd(&ring)
+        } else {
+            None
+        };
+
         let our_ring = TheIoRing {
             the_io_uring: Some(ring),
             probe,
             user_data_counter: AtomicU64::new(0),
             autosubmit,
-            owned_data: HashMap::new(),
+            owned_data: UserDataTable::new(),
+            fixed_buffers: None,
+            provided_buffers: HashMap::new(),
+            registered_files: 0,
+            task_run_mode,
+            registered_ring,
         };
 
         return Ok(our_ring);
@@ -1,12 +1,18 @@
 use std::os::fd::RawFd;
 
-use io_uring::{squeue::Flags, types::Fd};
+use bytemuck::{cast_slice, Pod};
+use io_uring::{
+    squeue::Flags,
+    types::{CancelBuilder, DestinationSlot, Fd, Fixed, TimeoutFlags, Timespec},
+};
 use pyo3::{
     exceptions::{PyNotImplementedError, PyValueError},
-    pyfunction, PyResult,
+    pyfunction,
+    types::{PyAnyMethods, PyBytes},
+    Bound, PyAny, PyResult, Python,
 };
 
-use crate::ring::TheIoRing;
+use crate::{buffers::ByteBuffer, ring::TheIoRing};
 
 /** Checks if the argument for a writing buffer are valid or not. */
 pub(crate) fn check_write_buffer(buf: &[u8], size: usize, offset: usize) -> PyResult<usize> {
@@ -33,24 +39,306 @@ pub(crate) fn check_write_buffer(buf: &[u8], size: usize, offset: usize) -> PyRe
     return Ok(end_offset);
 }
 
+/**
+Checks that a single operation of ``size`` bytes fits in the 32-bit length of a submission queue
+entry, rather than silently truncating it.
+*/
+pub(crate) fn checked_op_len(size: usize) -> PyResult<u32> {
+    let Ok(len) = u32::try_from(size) else {
+        let message = format!("can't submit an operation of {} bytes", size);
+        return Err(PyValueError::new_err(message));
+    };
+
+    return Ok(len);
+}
+
+/**
+Gets a pointer to, and the size of, the writable region of a Python buffer that starts at
+``offset`` and is ``size`` bytes long (or extends to the end of the buffer if ``size`` is None).
+
+The pointer is only valid for as long as the buffer export is held.
+*/
+pub(crate) fn writable_buffer_region(
+    buf: &ByteBuffer,
+    size: Option<usize>,
+    offset: usize,
+) -> PyResult<(*mut u8, usize)> {
+    if buf.readonly() {
+        return Err(PyValueError::new_err("buffer must be writable"));
+    }
+
+    let len = buf.len_bytes();
+    if offset > len {
+        let message = format!("offset {} out of range from buffer of {}", offset, len);
+        return Err(PyValueError::new_err(message));
+    }
+
+    let size = size.unwrap_or(len - offset);
+    if offset + size > len {
+        let message = format!(
+            "can't read {} bytes into a buffer of {}",
+            offset + size,
+            len
+        );
+        return Err(PyValueError::new_err(message));
+    }
+
+    let ptr = unsafe { buf.buf_ptr().add(offset) };
+    return Ok((ptr, size));
+}
+
+/** Creates an ``array.array`` with the specified typecode from the items in a slice. */
+pub(crate) fn make_native_array<'py, T: Pod>(
+    py: Python<'py>,
+    typecode: &str,
+    items: &[T],
+) -> PyResult<Bound<'py, PyAny>> {
+    // the array constructor takes raw native-endian bytes, which is exactly what we have.
+    let array = py.import("array")?.getattr("array")?;
+    return array.call1((typecode, PyBytes::new(py, cast_slice(items))));
+}
+
+/**
+Converts a direct descriptor slot argument into the slot a file should be installed into.
+
+``None`` means that a regular file descriptor should be created, and ``-1`` means that the kernel
+should pick a free slot from the registered file table.
+*/
+pub(crate) fn make_destination_slot(slot: Option<i32>) -> PyResult<Option<DestinationSlot>> {
+    return match slot {
+        None => Ok(None),
+        Some(-1) => Ok(Some(DestinationSlot::auto_target())),
+        Some(it) if it >= 0 => DestinationSlot::try_from_slot_target(it as u32)
+            .map(Some)
+            .map_err(|_| PyValueError::new_err(format!("invalid direct slot {}", it))),
+        Some(it) => Err(PyValueError::new_err(format!("invalid direct slot {}", it))),
+    };
+}
+
 /// Performs a ``close(2)`` call using io_uring.
 #[pyfunction(name = "_RUSTFFI_ioring_prep_close")]
 pub fn ioring_prep_close(
     ring: &mut TheIoRing,
     fd: RawFd,
-    user_data: u64,
+    user_data: Option<u64>,
     sqe_flags: u8,
-) -> PyResult<()> {
+    fixed: bool,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
     if !ring.probe.is_supported(io_uring::opcode::Close::CODE) {
         return Err(PyNotImplementedError::new_err("read"));
     }
 
-    let ring_op = io_uring::opcode::Close::new(Fd(fd))
+    // closing a direct descriptor removes it from the registered file table instead.
+    let ring_op = if fixed {
+        io_uring::opcode::Close::new(Fixed(fd as u32))
+    } else {
+        io_uring::opcode::Close::new(Fd(fd))
+    }
+    .build()
+    .flags(Flags::from_bits_truncate(sqe_flags))
+    .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+
+    return Ok(user_data);
+}
+
+/// Performs many ``close(2)`` calls using io_uring in one go.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_close_many")]
+pub fn ioring_prep_close_many<'py>(
+    py: Python<'py>,
+    ring: &mut TheIoRing,
+    fds: Vec<RawFd>,
+    sqe_flags: u8,
+) -> PyResult<Bound<'py, PyAny>> {
+    if !ring.probe.is_supported(io_uring::opcode::Close::CODE) {
+        return Err(PyNotImplementedError::new_err("close"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+
+    let user_datas = ring.push_many(py, fds.len(), |ring, index, user_data| {
+        let ring_op = io_uring::opcode::Close::new(Fd(fds[index]))
+            .build()
+            .flags(parsed_sqe_flags)
+            .user_data(user_data);
+
+        return ring.autosubmit(&ring_op);
+    })?;
+
+    return make_native_array(py, "Q", &user_datas);
+}
+
+/// Prepares a no-op, which completes immediately.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_nop")]
+pub fn ioring_prep_nop(
+    ring: &mut TheIoRing,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    let ring_op = io_uring::opcode::Nop::new()
         .build()
         .flags(Flags::from_bits_truncate(sqe_flags))
         .user_data(user_data);
 
     ring.autosubmit(&ring_op)?;
+    return Ok(user_data);
+}
+
+/// Prepares a linked timeout for the operation immediately before it in a link chain.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_link_timeout")]
+pub fn ioring_prep_link_timeout(
+    ring: &mut TheIoRing,
+    sec: u64,
+    nsec: u32,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::LinkTimeout::CODE) {
+        return Err(PyNotImplementedError::new_err("link_timeout"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    // boxed so that the pointer stays valid when the box moves into the ring's ownership.
+    let timespec = Box::new(Timespec::new().sec(sec).nsec(nsec));
+    let ring_op = io_uring::opcode::LinkTimeout::new(&*timespec)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_owned_timespec(user_data, timespec);
+    return Ok(user_data);
+}
+
+/**
+Prepares a cancellation of in-flight operations.
+
+Operations are matched by ``target_user_data`` or by ``fd``; if neither is provided, every
+in-flight operation is matched. If ``all`` is false, only the first matching operation is
+cancelled.
+*/
+#[pyfunction(name = "_RUSTFFI_ioring_prep_cancel")]
+pub fn ioring_prep_cancel(
+    ring: &mut TheIoRing,
+    target_user_data: Option<u64>,
+    fd: Option<RawFd>,
+    fixed: bool,
+    all: bool,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::AsyncCancel::CODE) {
+        return Err(PyNotImplementedError::new_err("cancel"));
+    }
+
+    let ring_op = match (target_user_data, fd) {
+        (Some(_), Some(_)) => {
+            return Err(PyValueError::new_err(
+                "Can't cancel by both user data and file descriptor",
+            ));
+        }
+
+        // the original form of cancellation, which works on every kernel that supports it at all.
+        (Some(target), None) if !all => io_uring::opcode::AsyncCancel::new(target).build(),
+
+        (target, fd) => {
+            let builder = match (target, fd) {
+                (Some(target), _) => CancelBuilder::user_data(target),
+                (None, Some(fd)) if fixed => CancelBuilder::fd(Fixed(fd as u32)),
+                (None, Some(fd)) => CancelBuilder::fd(Fd(fd)),
+                (None, None) => CancelBuilder::any(),
+            };
+
+            let builder = if all { builder.all() } else { builder };
+            io_uring::opcode::AsyncCancel2::new(builder).build()
+        }
+    }
+    .flags(Flags::from_bits_truncate(sqe_flags))
+    .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    return Ok(user_data);
+}
+
+/// Prepares a standalone timeout, which completes with ``-ETIME`` once it expires.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_timeout")]
+pub fn ioring_prep_timeout(
+    ring: &mut TheIoRing,
+    sec: u64,
+    nsec: u32,
+    absolute: bool,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::Timeout::CODE) {
+        return Err(PyNotImplementedError::new_err("timeout"));
+    }
+
+    let parsed_sqe_flags = Flags::from_bits_truncate(sqe_flags);
+    if parsed_sqe_flags.contains(Flags::SKIP_SUCCESS) {
+        return Err(PyValueError::new_err(
+            "Can't use 'SKIP_SUCCESS' on submissions with owned data",
+        ));
+    }
+
+    // boxed for the same reason as linked timeouts.
+    let timespec = Box::new(Timespec::new().sec(sec).nsec(nsec));
+    let timeout_flags = if absolute {
+        TimeoutFlags::ABS
+    } else {
+        TimeoutFlags::empty()
+    };
+
+    let ring_op = io_uring::opcode::Timeout::new(&*timespec)
+        .flags(timeout_flags)
+        .build()
+        .flags(parsed_sqe_flags)
+        .user_data(user_data);
+
+    ring.autosubmit(&ring_op)?;
+    ring.add_owned_timespec(user_data, timespec);
+    return Ok(user_data);
+}
+
+/// Prepares a ``poll(2)``-style readiness check of a file descriptor.
+#[pyfunction(name = "_RUSTFFI_ioring_prep_poll_add")]
+pub fn ioring_prep_poll_add(
+    ring: &mut TheIoRing,
+    fd: RawFd,
+    events: u32,
+    multishot: bool,
+    user_data: Option<u64>,
+    sqe_flags: u8,
+) -> PyResult<u64> {
+    let user_data = ring.resolve_user_data(user_data);
+
+    if !ring.probe.is_supported(io_uring::opcode::PollAdd::CODE) {
+        return Err(PyNotImplementedError::new_err("poll_add"));
+    }
+
+    let ring_op = io_uring::opcode::PollAdd::new(Fd(fd), events)
+        .multi(multishot)
+        .build()
+        .flags(Flags::from_bits_truncate(sqe_flags))
+        .user_data(user_data);
 
-    return Ok(());
+    ring.autosubmit(&ring_op)?;
+    return Ok(user_data);
 }
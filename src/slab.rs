@@ -0,0 +1,113 @@
+use std::collections::HashMap;
+
+const INITIAL_CAPACITY: usize = 1024;
+
+/**
+A table of values keyed by ``user_data``, indexed directly by the low bits of the key.
+
+User data values come from a monotonic counter, so consecutive operations land in consecutive slots
+and a slot is only reused once the counter has wrapped all the way around the table. Lookups are a
+mask and a compare, with no hashing. The full ``user_data`` value is stored next to each entry and
+acts as the generation check, so a stale key never matches a newer entry in the same slot.
+
+If the counter wraps back around onto a slot that is still occupied (e.g. by a long-lived multishot
+operation), the newer entry goes into a small overflow map instead.
+*/
+pub(crate) struct UserDataTable<T> {
+    slots: Vec<Option<(u64, T)>>,
+    occupied: usize,
+    overflow: HashMap<u64, T>,
+}
+
+impl<T> UserDataTable<T> {
+    pub(crate) fn new() -> UserDataTable<T> {
+        return UserDataTable {
+            slots: std::iter::repeat_with(|| None)
+                .take(INITIAL_CAPACITY)
+                .collect(),
+            occupied: 0,
+            overflow: HashMap::new(),
+        };
+    }
+
+    fn index_of(&self, user_data: u64) -> usize {
+        // capacity is always a power of two.
+        return (user_data & (self.slots.len() as u64 - 1)) as usize;
+    }
+
+    fn len(&self) -> usize {
+        return self.occupied + self.overflow.len();
+    }
+
+    /** Inserts a new entry, replacing any existing entry with the same key. */
+    pub(crate) fn insert(&mut self, user_data: u64, value: T) {
+        // keep the load factor at or below one half so that wrapping onto a live slot stays rare.
+        if (self.len() + 1) * 2 > self.slots.len() {
+            self.grow();
+        }
+
+        self.insert_no_grow(user_data, value);
+    }
+
+    fn insert_no_grow(&mut self, user_data: u64, value: T) {
+        let index = self.index_of(user_data);
+
+        match &mut self.slots[index] {
+            slot @ None => {
+                *slot = Some((user_data, value));
+                self.occupied += 1;
+            }
+            Some((existing, old)) if *existing == user_data => {
+                *old = value;
+            }
+            Some(_) => {
+                self.overflow.insert(user_data, value);
+            }
+        }
+    }
+
+    fn grow(&mut self) {
+        let new_capacity = self.slots.len() * 2;
+        let old_slots = std::mem::replace(
+            &mut self.slots,
+            std::iter::repeat_with(|| None).take(new_capacity).collect(),
+        );
+        let old_overflow = std::mem::take(&mut self.overflow);
+        self.occupied = 0;
+
+        for (user_data, value) in old_slots.into_iter().flatten().chain(old_overflow) {
+            self.insert_no_grow(user_data, value);
+        }
+    }
+
+    /** Gets a reference to the entry with the specified key, if it exists. */
+    pub(crate) fn get(&self, user_data: u64) -> Option<&T> {
+        if let Some((existing, value)) = &self.slots[self.index_of(user_data)] {
+            if *existing == user_data {
+                return Some(value);
+            }
+        }
+
+        if self.overflow.is_empty() {
+            return None;
+        }
+
+        return self.overflow.get(&user_data);
+    }
+
+    /** Removes the entry with the specified key, returning it if it existed. */
+    pub(crate) fn remove(&mut self, user_data: u64) -> Option<T> {
+        let index = self.index_of(user_data);
+
+        if matches!(&self.slots[index], Some((existing, _)) if *existing == user_data) {
+            self.occupied -= 1;
+            return self.slots[index].take().map(|(_, value)| value);
+        }
+
+        if self.overflow.is_empty() {
+            return None;
+        }
+
+        return self.overflow.remove(&user_data);
+    }
+}
@@ -0,0 +1,190 @@
+import asyncio
+import errno
+import socket
+import threading
+
+import pytest
+
+from century_ring.aio.loop import UringEventLoop, new_event_loop
+from century_ring.aio.sidecar import start_uring_sidecar
+from century_ring.enums import FileOpenMode
+
+
+def test_running_on_the_ring():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        assert isinstance(loop, UringEventLoop)
+
+        before = loop.time()
+        await asyncio.sleep(0.05)
+        assert loop.time() - before >= 0.05
+
+        # call_soon_threadsafe goes through the self-pipe, which is polled by the ring.
+        future = loop.create_future()
+        loop.call_soon_threadsafe(future.set_result, 1)
+        assert await future == 1
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_sock_methods():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            server.setblocking(False)
+            client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            client.setblocking(False)
+
+            with client:
+                _, (conn, _) = await asyncio.gather(
+                    loop.sock_connect(client, server.getsockname()),
+                    loop.sock_accept(server),
+                )
+
+                with conn:
+                    await loop.sock_sendall(client, b"hello, world!" * 1000)
+                    received = bytearray()
+                    while len(received) < 13_000:
+                        received += await loop.sock_recv(conn, 65536)
+
+                    assert received == b"hello, world!" * 1000
+
+                    buffer = bytearray(16)
+                    await loop.sock_sendall(conn, b"pong")
+                    assert await loop.sock_recv_into(client, buffer) == 4
+                    assert buffer[:4] == b"pong"
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_streams():
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(await reader.readline())
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+
+    async def main() -> None:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+
+        async with server:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname())
+            writer.write(b"echo\n")
+            assert await reader.readline() == b"echo\n"
+            assert await reader.read() == b""
+            writer.close()
+            await writer.wait_closed()
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_subprocess():
+    async def main() -> None:
+        process = await asyncio.create_subprocess_exec("echo", "hi", stdout=asyncio.subprocess.PIPE)
+        stdout, _ = await process.communicate()
+        assert stdout == b"hi\n"
+        assert process.returncode == 0
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_waiting_for_ring_operations():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        assert isinstance(loop, UringEventLoop)
+
+        cqe = await loop.wait_for_completion(
+            loop.ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY)
+        )
+        fd = cqe.result
+
+        try:
+            cqe = await loop.wait_for_completion(loop.ring.prep_read(fd, 16))
+            assert cqe.buffer == b"\x00" * 16
+        finally:
+            await loop.wait_for_completion(loop.ring.prep_close(fd))
+
+        with pytest.raises(FileNotFoundError):
+            await loop.wait_for_completion(
+                loop.ring.prep_openat(None, b"/doesnt-exist", FileOpenMode.READ_ONLY)
+            )
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_cancelled_wait_cancels_operation():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        assert isinstance(loop, UringEventLoop)
+        left, right = socket.socketpair()
+
+        with left, right:
+            ud = loop.ring.prep_recv(left.fileno(), 1024)
+
+            with pytest.raises(TimeoutError):
+                async with asyncio.timeout(0.1):
+                    await loop.wait_for_completion(ud)
+
+            async with asyncio.timeout(5):
+                cqe = await loop.wait_for_completion(ud, autoraise=False)
+
+            assert cqe.result == -errno.ECANCELED
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_sidecar_shares_loop_ring():
+    async def main() -> None:
+        loop = asyncio.get_running_loop()
+        assert isinstance(loop, UringEventLoop)
+
+        async with start_uring_sidecar() as sidecar:
+            assert sidecar.ring is loop.ring
+
+            ud = sidecar.ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY)
+            cqe = await sidecar.wait_for_completion(ud)
+            await sidecar.wait_for_completion(sidecar.ring.prep_close(cqe.result))
+
+            # the loop itself has to wake up for, and hand over, a completion that arrives while
+            # it's sleeping.
+            left, right = socket.socketpair()
+            with left, right:
+                loop.call_later(0.05, right.send, b"wake up")
+
+                async with asyncio.timeout(5):
+                    cqe = await sidecar.wait_for_completion(
+                        sidecar.ring.prep_recv(left.fileno(), 16)
+                    )
+
+                assert cqe.buffer == b"wake up"
+
+    asyncio.run(main(), loop_factory=new_event_loop)
+
+
+def test_running_on_another_thread():
+    loop = new_event_loop()
+    results: list[bytes] = []
+
+    async def main() -> None:
+        assert isinstance(loop, UringEventLoop)
+        await asyncio.sleep(0.01)
+
+        cqe = await loop.wait_for_completion(
+            loop.ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY)
+        )
+        read = await loop.wait_for_completion(loop.ring.prep_read(cqe.result, 4))
+        await loop.wait_for_completion(loop.ring.prep_close(cqe.result))
+        results.append(read.buffer or b"")
+
+    def run() -> None:
+        loop.run_until_complete(main())
+
+    try:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    finally:
+        loop.close()
+
+    assert results == [b"\x00" * 4]
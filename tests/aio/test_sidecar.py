@@ -1,8 +1,14 @@
+import errno
+import socket
+
+import anyio
 import pytest
 
-from century_ring import raise_for_cqe
+from century_ring import CompletionEvent, IoUring, raise_for_cqe
+from century_ring.aio.manager import UringIoManager
 from century_ring.aio.sidecar import start_uring_sidecar
 from century_ring.enums import FileOpenMode
+from century_ring.handle import FixedFileHandle
 
 pytestmark = pytest.mark.anyio
 
@@ -23,3 +29,231 @@ async def test_waiting_with_failure():
 
         with pytest.raises(OSError):
             await sidecar.wait_for_completion(ud)
+
+
+async def test_cancelled_wait_cancels_operation():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+
+            with anyio.move_on_after(0.1):
+                await sidecar.wait_for_completion(ud)
+
+            # nothing was ever sent, so the only way this completes is if it got cancelled.
+            with anyio.fail_after(5):
+                cqe = await sidecar.wait_for_completion(ud, autoraise=False)
+
+            assert cqe.result == -errno.ECANCELED
+
+
+async def test_cancelling_after_ring_closed():
+    left, right = socket.socketpair()
+
+    with left, right, anyio.fail_after(5):
+        async with anyio.create_task_group() as group:
+            async with start_uring_sidecar() as sidecar:
+                ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+                group.start_soon(sidecar.wait_for_completion, ud)
+                await anyio.sleep(0.05)
+
+            assert sidecar.ring.closed
+
+            # the waiting task outlives the ring, and its cancellation mustn't turn into an error
+            # about the ring being closed.
+            group.cancel_scope.cancel()
+
+
+async def test_waiting_with_deadline():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+
+            with anyio.fail_after(5), pytest.raises(TimeoutError):
+                await sidecar.wait_for_completion(ud, deadline=anyio.current_time() + 0.05)
+
+
+async def test_completing_before_deadline():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            right.send(b"hello")
+            ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+
+            cqe = await sidecar.wait_for_completion(ud, deadline=anyio.current_time() + 5)
+            assert cqe.buffer == b"hello"
+
+
+async def test_completing_before_deadline_disarms_timer(monkeypatch: pytest.MonkeyPatch):
+    results: list[int] = []
+    original_dispatch = UringIoManager._dispatch_completion
+
+    def recording_dispatch(self: UringIoManager, cqe: CompletionEvent) -> None:
+        results.append(cqe.result)
+        original_dispatch(self, cqe)
+
+    monkeypatch.setattr(UringIoManager, "_dispatch_completion", recording_dispatch)
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            right.send(b"hello")
+            ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+            await sidecar.wait_for_completion(ud, deadline=anyio.current_time() + 0.05)
+
+            # long enough for the timer to have fired, if it was left armed.
+            await anyio.sleep(0.1)
+            assert -errno.ETIME not in results
+
+
+async def test_recv_chunks():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            sidecar.ring.register_buffer_ring(0, 4, 1024)
+
+            right.send(b"hello")
+            chunks: list[bytes] = []
+
+            async for chunk in sidecar.recv_chunks(left.fileno(), 0):
+                chunks.append(chunk)
+
+                if len(chunks) == 1:
+                    right.send(b"world")
+                else:
+                    right.shutdown(socket.SHUT_WR)
+
+            assert chunks == [b"hello", b"world"]
+
+
+async def test_waiting_for_chain():
+    async with start_uring_sidecar() as sidecar:
+        sidecar.ring.register_files(1)
+        handle = FixedFileHandle(sidecar.ring, 0)
+
+        prepared = (
+            sidecar.ring.chain()
+            .add(IoUring.prep_openat, None, b"/dev/zero", FileOpenMode.READ_ONLY, direct_slot=0)
+            .add(IoUring.prep_read, handle, 8)
+            .add(IoUring.prep_close, handle)
+            .prep()
+        )
+
+        _, read, _ = await sidecar.wait_for_chain(prepared)
+        assert read.buffer == b"\x00" * 8
+
+
+async def test_waiting_for_readiness():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            await sidecar.wait_writable(left.fileno())
+
+            with anyio.move_on_after(0.05) as scope:
+                await sidecar.wait_readable(left.fileno())
+
+            assert scope.cancelled_caught
+
+            right.send(b"hello")
+
+            with anyio.fail_after(5):
+                await sidecar.wait_readable(left.fileno())
+
+
+@pytest.mark.parametrize("anyio_backend", ["trio"])
+async def test_trio_sidecar(anyio_backend: str):
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar() as sidecar:
+            # regular trio timers and I/O still have to wake up the ring.
+            before = anyio.current_time()
+            await anyio.sleep(0.05)
+            assert anyio.current_time() - before >= 0.05
+
+            async with anyio.create_task_group() as group:
+                group.start_soon(anyio.wait_readable, left)
+                await anyio.sleep(0.01)
+                right.send(b"x")
+
+            assert left.recv(1) == b"x"
+
+            ud = sidecar.ring.prep_recv(left.fileno(), 1024)
+            right.send(b"hello")
+
+            with anyio.fail_after(5):
+                cqe = await sidecar.wait_for_completion(ud)
+
+            assert cqe.buffer == b"hello"
+
+
+async def test_many_concurrent_waits():
+    async with start_uring_sidecar() as sidecar:
+        results: list[int] = []
+
+        async def wait_for_nop() -> None:
+            cqe = await sidecar.wait_for_completion(sidecar.ring.prep_nop())
+            results.append(cqe.result)
+
+        with anyio.fail_after(5):
+            async with anyio.create_task_group() as group:
+                for _ in range(200):
+                    group.start_soon(wait_for_nop)
+
+        assert results == [0] * 200
+        assert not sidecar._completion_waiters
+
+
+async def test_submissions_are_coalesced(monkeypatch: pytest.MonkeyPatch):
+    submits = 0
+    original_submit = IoUring.submit
+
+    def counting_submit(self: IoUring) -> int:
+        nonlocal submits
+        submits += 1
+        return original_submit(self)
+
+    monkeypatch.setattr(IoUring, "submit", counting_submit)
+
+    async with start_uring_sidecar() as sidecar:
+        async def wait_for_nop() -> None:
+            await sidecar.wait_for_completion(sidecar.ring.prep_nop())
+
+        with anyio.fail_after(5):
+            async with anyio.create_task_group() as group:
+                for _ in range(200):
+                    group.start_soon(wait_for_nop)
+
+    # every task started its operation in the same loop iteration.
+    assert submits == 1
+
+
+async def test_forced_submissions_dispatch_inline_completions():
+    left, right = socket.socketpair()
+
+    with left, right:
+        async with start_uring_sidecar(force_submissions=True) as sidecar:
+            with anyio.fail_after(5):
+                cqe = await sidecar.wait_for_completion(sidecar.ring.prep_nop())
+
+            assert cqe.result == 0
+
+            async def send_later() -> None:
+                await anyio.sleep(0.05)
+                right.send(b"wake up")
+
+            # this one completes long after it was submitted, so it's only dispatched if the ring's
+            # file descriptor wakes the sidecar up.
+            with anyio.fail_after(5):
+                async with anyio.create_task_group() as group:
+                    group.start_soon(send_later)
+                    ud = sidecar.ring.prep_recv(left.fileno(), 16)
+                    cqe = await sidecar.wait_for_completion(ud)
+
+            assert cqe.buffer == b"wake up"
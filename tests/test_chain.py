@@ -0,0 +1,100 @@
+import errno
+import os
+
+import pytest
+
+from century_ring import FileOpenMode, IoUring, make_io_ring, raise_for_cqe
+from century_ring.handle import FixedFileHandle
+from tests import AutoclosingScope
+
+
+def test_open_read_close_chain():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+        os.write(fd, b"chained!")
+
+        ring.register_files(1)
+        handle = FixedFileHandle(ring, 0)
+
+        path = f"/proc/self/fd/{fd}".encode()
+        prepared = (
+            ring.chain()
+            .add(IoUring.prep_openat, None, path, FileOpenMode.READ_ONLY, direct_slot=0)
+            .add(IoUring.prep_read, handle, 4096, 0)
+            .add(IoUring.prep_close, handle)
+            .prep()
+        )
+        assert len(prepared.user_data) == 3
+
+        ring.submit_and_wait(3)
+        completions = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+        open_cqe, read_cqe, close_cqe = (completions[it] for it in prepared.user_data)
+
+        for cqe in (open_cqe, read_cqe, close_cqe):
+            raise_for_cqe(cqe)
+
+        assert read_cqe.buffer == b"chained!"
+        assert prepared.final_user_data == close_cqe.user_data
+
+
+def test_failing_chain_cancels_rest():
+    with make_io_ring() as ring:
+        prepared = (
+            ring.chain()
+            .add(IoUring.prep_openat, None, b"/doesnt-exist", FileOpenMode.READ_ONLY)
+            .add(IoUring.prep_close, -1)
+            .prep()
+        )
+
+        ring.submit_and_wait(2)
+        completions = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+
+        assert completions[prepared.user_data[0]].result == -errno.ENOENT
+        assert completions[prepared.user_data[1]].result == -errno.ECANCELED
+
+
+def test_chain_timeout():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        read_end, write_end = os.pipe()
+        scope.add(read_end)
+        scope.add(write_end)
+
+        chain = ring.chain().add(IoUring.prep_read, read_end, 16).add_timeout(0, 10_000_000)
+        prepared = chain.prep()
+        ring.submit_and_wait(2)
+
+        completions = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+        assert completions[prepared.user_data[0]].result == -errno.ECANCELED
+        assert completions[prepared.timeout_user_data[0]].result == -errno.ETIME
+
+
+def test_chain_operation_timeout():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        read_end, write_end = os.pipe()
+        scope.add(read_end)
+        scope.add(write_end)
+
+        prepared = (
+            ring.chain()
+            .add(IoUring.prep_read, read_end, 16, timeout=0.01)
+            .add(IoUring.prep_nop)
+            .prep()
+        )
+        ring.submit_and_wait(3)
+
+        completions = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+        assert len(completions) == 3
+        assert completions[prepared.user_data[0]].result == -errno.ECANCELED
+        assert completions[prepared.user_data[1]].result == -errno.ECANCELED
+
+
+def test_invalid_chains():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError):
+            ring.chain().prep()
+
+        with pytest.raises(ValueError):
+            ring.chain().add_timeout(1)
+
+        with pytest.raises(ValueError):
+            ring.chain().add(IoUring.prep_close, -1).add_timeout(1).add_timeout(1)
@@ -3,7 +3,7 @@ import select
 
 import pytest
 
-from century_ring import make_io_ring
+from century_ring import make_io_ring, make_sqe_flags
 from tests import AutoclosingScope
 
 
@@ -34,3 +34,21 @@ def test_invalid_efd():
 
         with pytest.raises(OSError):
             ring.register_eventfd(file)
+
+
+def test_async_only_eventfd():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        efd = ring.register_eventfd(async_only=True)
+        scope.add(efd)
+
+        # nops complete inline while being submitted, so they never notify the eventfd.
+        ring.prep_nop()
+        ring.submit_and_wait()
+        assert ring.get_completion_entries()
+        assert select.select([efd], [], [], 0.0)[0] == []
+
+        # forcing the read onto a kernel worker makes it complete asynchronously.
+        file = scope.add(os.open("/dev/zero", os.O_RDONLY))
+        ring.prep_read(file, 8, sqe_flags=make_sqe_flags(io_async=True))
+        ring.submit_and_wait()
+        assert select.select([efd], [], [], 1.0)[0] == [efd]
@@ -1,11 +1,14 @@
+import errno
+import mmap
 import os
 import random
 import secrets
 import sys
+from array import array
 
 import pytest
 
-from century_ring import FileOpenFlag, FileOpenMode, make_io_ring, raise_for_cqe
+from century_ring import FileOpenFlag, FileOpenMode, ReadWriteFlag, make_io_ring, raise_for_cqe
 from tests import AutoclosingScope
 
 
@@ -130,3 +133,255 @@ def test_invalid_writes():
 
         with pytest.raises(ValueError):
             ring.prep_write(sys.stderr.fileno(), b"123", file_offset=-100)
+
+
+def test_fixed_write_and_read():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+        ring.register_buffers(4, 4096)
+
+        assert ring.write_registered_buffer(1, b"wow!") == 4
+        ring.prep_write_fixed(fd, 1, 4, file_offset=0)
+        ring.submit_and_wait()
+        write_cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(write_cqe)
+        assert write_cqe.result == 4
+
+        ring.prep_read_fixed(fd, 2, 4096, offset=0)
+        ring.submit_and_wait()
+        read_cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(read_cqe)
+        assert read_cqe.result == 4
+        assert read_cqe.buffer is None
+        assert ring.read_registered_buffer(2, read_cqe.result) == b"wow!"
+
+        ring.unregister_buffers()
+
+
+def test_invalid_fixed_buffers():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError):
+            ring.prep_read_fixed(0, 0, 8)
+
+        ring.register_buffers(1, 16)
+
+        with pytest.raises(ValueError):
+            ring.register_buffers(1, 16)
+
+        with pytest.raises(ValueError, match="out of range"):
+            ring.prep_read_fixed(0, 1, 8)
+
+        with pytest.raises(ValueError, match="out of range"):
+            ring.prep_write_fixed(0, 0, 8, buffer_offset=12)
+
+        with pytest.raises(ValueError, match="out of range"):
+            ring.write_registered_buffer(0, b"x" * 17)
+
+
+def test_read_provided_buffer():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        file = scope.add(os.open("/dev/zero", os.O_RDONLY))
+        ring.register_buffer_ring(0, 2, 64)
+
+        ring.prep_read(file, 64, buffer_group=0)
+        ring.prep_read(file, 64, buffer_group=0)
+        ring.prep_read(file, 64, buffer_group=0)
+        ring.submit_and_wait(3)
+        cqes = ring.get_completion_entries()
+
+        # only two buffers in the ring, so the last read has nowhere to go
+        assert sorted(cqe.result for cqe in cqes) == [-errno.ENOBUFS, 64, 64]
+
+        for cqe in cqes:
+            if cqe.buffer_id is not None:
+                ring.recycle_provided_buffer(0, cqe.buffer_id)
+
+
+def test_writing_buffer_protocol_objects():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+
+        source = mmap.mmap(-1, 16)
+        source.write(b"from an mmap!!!!")
+
+        for buffer in (bytearray(b"bytearray"), memoryview(b"memoryview"), source):
+            ring.prep_write(fd, buffer)
+            ring.submit_and_wait()
+            cqe = ring.get_completion_entries()[0]
+            raise_for_cqe(cqe)
+            assert cqe.buffer is None
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        assert os.read(fd, 64) == b"bytearraymemoryviewfrom an mmap!!!!"
+
+
+def test_writing_buffers_of_any_format():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+
+        items = array("i", [1, -2, 3, 0x7FFFFFFF])
+        halves = memoryview(bytearray(b"halfword")).cast("H")
+
+        for buffer in (items, halves):
+            ring.prep_write(fd, buffer)
+            ring.submit_and_wait()
+            cqe = ring.get_completion_entries()[0]
+            raise_for_cqe(cqe)
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        assert os.read(fd, 64) == items.tobytes() + b"halfword"
+
+        # sizes and offsets are in bytes, not items.
+        into = array("d", [0.0, 0.0])
+        ring.prep_read_into(fd, into, 8, offset=0)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+
+        assert cqe.result == 8
+        assert into.tobytes() == items.tobytes()[:8] + b"\x00" * 8
+
+
+def test_read_into_buffer():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+        os.write(fd, b"wow!")
+
+        buffer = bytearray(b"-" * 8)
+        ring.prep_read_into(fd, buffer, offset=0, buffer_offset=2)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+
+        assert cqe.result == 4
+        assert cqe.buffer is None
+        assert buffer == b"--wow!--"
+
+
+def test_invalid_read_into():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError, match="writable"):
+            ring.prep_read_into(0, b"immutable")
+
+        with pytest.raises(ValueError):
+            ring.prep_read_into(0, bytearray(4), count=8)
+
+
+def test_bulk_write_and_read():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+
+        chunks = [b"one", bytearray(b"two"), memoryview(b"three")]
+        writes = ring.prep_write_many(fd, chunks, offsets=[0, 3, 6])
+        assert writes.typecode == "Q"
+        assert len(writes) == 3
+
+        ring.submit_and_wait(3)
+        for cqe in ring.get_completion_entries():
+            raise_for_cqe(cqe)
+
+        fds = array("i", [fd, fd, fd])
+        reads = ring.prep_read_many(fds, [3, 3, 5], offsets=[0, 3, 6])
+        ring.submit_and_wait(3)
+
+        results = {cqe.user_data: cqe.buffer for cqe in ring.get_completion_entries()}
+        assert [results[user_data] for user_data in reads] == [b"one", b"two", b"three"]
+
+
+def test_bulk_close():
+    with make_io_ring() as ring:
+        fds = [os.open("/dev/zero", os.O_RDONLY) for _ in range(8)]
+        closes = ring.prep_close_many(fds)
+        ring.submit_and_wait(8)
+
+        completions = ring.get_completion_entries()
+        assert sorted(cqe.user_data for cqe in completions) == sorted(closes)
+        for cqe in completions:
+            raise_for_cqe(cqe)
+
+        for fd in fds:
+            with pytest.raises(OSError):
+                os.fstat(fd)
+
+
+def test_invalid_bulk_ops():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError):
+            ring.prep_read_many([0, 0], [1, 2, 3])
+
+        with pytest.raises(ValueError):
+            ring.prep_read_many([0, 0], 1, offsets=[0])
+
+        with pytest.raises(ValueError):
+            ring.prep_write_many(1, [b"a", b"b"], offsets=[0, 1, 2])
+
+        assert ring.pending_sq_entries == 0
+
+
+def test_bulk_ops_reserve_the_queue():
+    with make_io_ring(entries=4, cq_size=64) as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/dev/zero", os.O_RDONLY))
+
+        # a batch bigger than the queue is pushed a queue's worth at a time.
+        reads = ring.prep_read_many(array("i", [fd] * 10), 1)
+        assert len(reads) == 10
+        ring.submit_and_wait(10)
+
+        results = {cqe.user_data: cqe.buffer for cqe in ring.get_completion_entries()}
+        assert [results[user_data] for user_data in reads] == [b"\x00"] * 10
+
+    with make_io_ring(entries=4, cq_size=64, autosubmit=False) as ring:
+        ring.prep_nop()
+
+        with pytest.raises(ValueError):
+            ring.prep_close_many([-1] * 4)
+
+        # none of the closes made it into the queue.
+        assert ring.pending_sq_entries == 1
+
+
+def test_vectored_write_and_read():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+
+        ring.prep_writev(fd, [b"head", bytearray(b"body"), memoryview(b"tail")], file_offset=0)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+        assert cqe.result == 12
+
+        first, second = bytearray(6), bytearray(6)
+        ring.prep_readv(fd, [first, second], offset=0)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+
+        assert cqe.result == 12
+        assert cqe.buffer is None
+        assert first == b"headbo"
+        assert second == b"dytail"
+
+
+def test_vectored_rw_flags():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        fd = scope.add(os.open(b"/tmp", os.O_RDWR | os.O_TMPFILE))
+        os.write(fd, b"start")
+
+        # RWF_APPEND ignores the offset entirely.
+        ring.prep_writev(fd, [b"-end"], file_offset=0, rw_flags={ReadWriteFlag.APPEND})
+        ring.submit_and_wait()
+        raise_for_cqe(ring.get_completion_entries()[0])
+
+        assert os.pread(fd, 16, 0) == b"start-end"
+
+
+def test_invalid_vectored_ops():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError):
+            ring.prep_readv(0, [])
+
+        with pytest.raises(ValueError, match="writable"):
+            ring.prep_readv(0, [bytearray(1), b"immutable"])
+
+        with pytest.raises(ValueError):
+            ring.prep_writev(1, [])
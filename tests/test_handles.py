@@ -1,7 +1,10 @@
+import os
+
 import pytest
 
+from century_ring import AUTO_SLOT, raise_for_cqe
 from century_ring.enums import FileOpenMode
-from century_ring.handle import FdHandle
+from century_ring.handle import FdHandle, FixedFileHandle
 from century_ring.ring import make_io_ring
 
 
@@ -57,3 +60,53 @@ def test_closing_handle_via_uring() -> None:
 
         # *actually* close it for good measure...
         ring.submit_and_wait()
+
+
+def test_direct_descriptor_explicit_slot() -> None:
+    with make_io_ring() as ring:
+        ring.register_files(4)
+        ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY, direct_slot=2)
+        ring.submit_and_wait()
+        handle = FixedFileHandle.from_completion_event(ring, ring.get_completion_entries()[0], 2)
+
+        with handle:
+            assert handle.fd == 2
+            ring.prep_read(handle, 8)
+            ring.submit_and_wait()
+            assert ring.get_completion_entries()[0].buffer == b"\x00" * 8
+
+        assert handle.close_called()
+
+
+def test_direct_descriptor_auto_slot() -> None:
+    with make_io_ring() as ring:
+        ring.register_files(4)
+        ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY, direct_slot=AUTO_SLOT)
+        ring.submit_and_wait()
+        handle = FixedFileHandle.from_completion_event(ring, ring.get_completion_entries()[0])
+
+        assert 0 <= handle.fd < 4
+
+        ring.prep_close(handle)
+        assert handle.close_called()
+
+        ring.submit_and_wait()
+        raise_for_cqe(ring.get_completion_entries()[0])
+
+
+def test_installing_registered_file() -> None:
+    with make_io_ring() as ring:
+        ring.register_files(1)
+
+        fd = os.open("/dev/zero", os.O_RDONLY)
+        try:
+            assert ring.update_registered_files(0, [fd]) == 1
+        finally:
+            os.close(fd)
+
+        handle = FixedFileHandle(ring, 0)
+        ring.prep_read(handle, 8)
+        ring.submit_and_wait()
+        assert ring.get_completion_entries()[0].buffer == b"\x00" * 8
+
+        ring.unregister_files()
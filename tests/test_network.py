@@ -1,3 +1,4 @@
+import errno
 import os
 import socket
 import stat
@@ -95,3 +96,251 @@ def test_socket_uring_read(listening_tcp_v4: ListenSocket):
         raise_for_cqe(cqe)
 
         assert cqe.buffer == b"test!"
+
+
+def test_socket_uring_read_provided_buffer(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(our_socket.fileno())
+
+        our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+        inbound_socket, _ = listening_tcp_v4.sock.accept()
+
+        ring.register_buffer_ring(7, 4, 2048)
+        ring.prep_recv(our_socket.fileno(), 0, buffer_group=7)
+        ring.submit()
+
+        inbound_socket.send(b"test!", socket.SOCK_NONBLOCK)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+
+        assert cqe.buffer is None
+        assert cqe.buffer_id is not None
+        assert ring.read_provided_buffer(7, cqe.buffer_id, cqe.result) == b"test!"
+
+        # already handed back to the kernel
+        with pytest.raises(ValueError):
+            ring.recycle_provided_buffer(7, cqe.buffer_id)
+
+        ring.unregister_buffer_ring(7)
+
+
+def test_invalid_buffer_ring():
+    with make_io_ring() as ring:
+        with pytest.raises(ValueError):
+            ring.prep_recv(0, 0, buffer_group=1)
+
+        with pytest.raises(ValueError):
+            ring.register_buffer_ring(1, 3, 2048)
+
+        ring.register_buffer_ring(1, 2, 2048)
+
+        with pytest.raises(ValueError):
+            ring.register_buffer_ring(1, 2, 2048)
+
+
+def test_socket_uring_read_multishot(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(our_socket.fileno())
+
+        our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+        inbound_socket, _ = listening_tcp_v4.sock.accept()
+
+        ring.register_buffer_ring(0, 8, 2048)
+        ud = ring.prep_recv_multishot(our_socket.fileno(), 0)
+        ring.submit()
+
+        for message in (b"one", b"two"):
+            inbound_socket.send(message)
+            ring.submit_and_wait()
+            cqe = ring.get_completion_entries()[0]
+            raise_for_cqe(cqe)
+
+            assert cqe.user_data == ud
+            assert cqe.has_more
+            assert cqe.buffer_id is not None
+            assert ring.read_provided_buffer(0, cqe.buffer_id, cqe.result) == message
+
+        inbound_socket.close()
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        assert cqe.result == 0
+        assert not cqe.has_more
+
+
+def test_socket_accept(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        ring.prep_accept(listening_tcp_v4.sock.fileno())
+        ring.submit()
+
+        our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(our_socket.fileno())
+        our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+        accepted = scope.add(cqe.result)
+
+        assert stat.S_ISSOCK(os.fstat(accepted).st_mode)
+
+
+def test_socket_accept_multishot(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        ud = ring.prep_accept_multishot(listening_tcp_v4.sock.fileno())
+        ring.submit()
+
+        for _ in range(3):
+            our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            scope.add(our_socket.fileno())
+            our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+
+            ring.submit_and_wait()
+            cqe = ring.get_completion_entries()[0]
+            raise_for_cqe(cqe)
+            scope.add(cqe.result)
+
+            assert cqe.user_data == ud
+            assert cqe.has_more
+
+
+def test_socket_bind_and_listen():
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(sock.fileno())
+
+        try:
+            ring.prep_bind_v4(sock.fileno(), "127.0.0.1", 0)
+        except NotImplementedError:
+            pytest.skip("bind isn't supported on this kernel")
+
+        ring.submit_and_wait()
+        raise_for_cqe(ring.get_completion_entries()[0])
+
+        ring.prep_listen(sock.fileno())
+        ring.submit_and_wait()
+        raise_for_cqe(ring.get_completion_entries()[0])
+
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_ACCEPTCONN) == 1
+
+
+def test_socket_uring_write_zero_copy(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(our_socket.fileno())
+
+        our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+        inbound_socket, _ = listening_tcp_v4.sock.accept()
+
+        payload = bytearray(b"x" * 65536)
+        ud = ring.prep_send_zc(our_socket.fileno(), memoryview(payload))
+        ring.submit_and_wait(2)
+
+        events = ring.get_completion_entries()
+        assert [cqe.user_data for cqe in events] == [ud, ud]
+
+        result, notification = events
+        raise_for_cqe(result)
+        assert result.result == len(payload)
+        assert result.has_more
+        assert notification.is_notification
+        assert not notification.has_more
+
+        received = b""
+        while len(received) < len(payload):
+            received += inbound_socket.recv(65536)
+
+        assert received == payload
+
+
+def test_socket_uring_read_into(listening_tcp_v4: ListenSocket):
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        our_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        scope.add(our_socket.fileno())
+
+        our_socket.connect((listening_tcp_v4.address, listening_tcp_v4.port))
+        inbound_socket, _ = listening_tcp_v4.sock.accept()
+
+        buffer = bytearray(16)
+        ring.prep_recv_into(our_socket.fileno(), memoryview(buffer)[4:])
+        ring.submit()
+
+        inbound_socket.send(b"test!", socket.SOCK_NONBLOCK)
+        ring.submit_and_wait()
+        cqe = ring.get_completion_entries()[0]
+        raise_for_cqe(cqe)
+
+        assert buffer[4 : 4 + cqe.result] == b"test!"
+
+
+def test_cancel_recv_by_user_data():
+    left, right = socket.socketpair()
+
+    with left, right, make_io_ring() as ring:
+        recv_ud = ring.prep_recv(left.fileno(), 2048)
+        ring.submit()
+
+        cancel_ud = ring.prep_cancel(recv_ud)
+        ring.submit_and_wait(2)
+
+        results = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+        assert results[recv_ud].result == -errno.ECANCELED
+        assert results[cancel_ud].result == 0
+
+
+def test_cancel_recv_by_fd():
+    left, right = socket.socketpair()
+
+    with left, right, make_io_ring() as ring:
+        first = ring.prep_recv(left.fileno(), 2048)
+        second = ring.prep_recv(left.fileno(), 2048)
+        ring.submit()
+
+        cancel_ud = ring.prep_cancel(fd=left.fileno(), match_all=True)
+        ring.submit_and_wait(3)
+
+        results = {cqe.user_data: cqe for cqe in ring.get_completion_entries()}
+        assert results[first].result == -errno.ECANCELED
+        assert results[second].result == -errno.ECANCELED
+        assert results[cancel_ud].result == 2
+
+
+def test_cancel_nothing():
+    with make_io_ring() as ring:
+        cancel_ud = ring.prep_cancel(12345)
+        ring.submit_and_wait(1)
+
+        (cqe,) = ring.get_completion_entries()
+        assert cqe.user_data == cancel_ud
+        assert cqe.result == -errno.ENOENT
+
+
+def test_recv_with_timeout():
+    left, right = socket.socketpair()
+
+    with left, right, make_io_ring() as ring:
+        recv_ud = ring.prep_recv(left.fileno(), 2048, timeout=0.05)
+        ring.submit_and_wait(2)
+
+        results = ring.get_completion_entries()
+        (recv,) = [cqe for cqe in results if not cqe.should_be_ignored()]
+        (timeout,) = [cqe for cqe in results if cqe.should_be_ignored()]
+
+        assert recv.user_data == recv_ud
+        assert recv.result == -errno.ECANCELED
+        assert timeout.result == -errno.ETIME
+
+
+def test_recv_completing_before_timeout():
+    left, right = socket.socketpair()
+
+    with left, right, make_io_ring() as ring:
+        right.send(b"hello")
+        recv_ud = ring.prep_recv(left.fileno(), 2048, timeout=5)
+        ring.submit_and_wait(2)
+
+        (recv,) = [cqe for cqe in ring.get_completion_entries() if not cqe.should_be_ignored()]
+        assert recv.user_data == recv_ud
+        assert recv.buffer == b"hello"
@@ -1,11 +1,13 @@
 import errno
 import os
 import sys
+import threading
 import time
+from contextlib import ExitStack
 
 import pytest
 
-from century_ring import FileOpenMode, make_io_ring, raise_for_cqe
+from century_ring import CompletionEvent, FileOpenMode, TaskRunMode, make_io_ring, raise_for_cqe
 from tests import AutoclosingScope
 
 
@@ -84,6 +86,33 @@ def test_empty_timeout() -> None:
         assert after - before >= 1.0
 
 
+def test_timeout_posts_no_completion() -> None:
+    with make_io_ring() as ring:
+        ring.submit_and_wait_with_timeout(seconds=0, nsec=10_000_000)
+        assert [it for it in ring.get_completion_entries() if not it.should_be_ignored()] == []
+
+
+def test_timeout_waiting_for_count() -> None:
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        read_end, write_end = os.pipe()
+        scope.add(read_end)
+        scope.add(write_end)
+
+        ring.prep_close(-1)
+        ring.prep_read(read_end, 1)
+
+        # only one of the two operations can complete, so this has to wait for the timeout.
+        before = time.monotonic()
+        ring.submit_and_wait_with_timeout(seconds=0, nsec=200_000_000, count=2)
+        after = time.monotonic()
+        assert after - before >= 0.2
+
+        os.write(write_end, b"!")
+        ring.submit_and_wait_with_timeout(seconds=1, count=2)
+        results = [it for it in ring.get_completion_entries() if not it.should_be_ignored()]
+        assert len(results) == 2
+
+
 def test_real_timeout() -> None:
     with make_io_ring() as ring:
         ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY)
@@ -121,8 +150,183 @@ def test_multiple_timeouts_ignoring_completions() -> None:
         assert (after - before) >= 1.0
 
 
+def test_absolute_timeout() -> None:
+    with make_io_ring() as ring:
+        expires = time.monotonic() + 0.05
+        seconds, nsec = divmod(round(expires * 1_000_000_000), 1_000_000_000)
+
+        # submitted late, but it still expires at the same time.
+        ud = ring.prep_timeout(seconds, nsec, absolute=True)
+        time.sleep(0.02)
+        ring.submit_and_wait(1)
+        after = time.monotonic()
+
+        (cqe,) = ring.get_completion_entries()
+        assert cqe.user_data == ud
+        assert cqe.result == -errno.ETIME
+        assert expires <= after < expires + 0.02
+
+
 def test_pending_sq_entries() -> None:
     with make_io_ring() as ring:
         ring.prep_openat(None, b"/dev/zero", FileOpenMode.READ_ONLY)
 
         assert ring.pending_sq_entries == 1
+
+
+def test_completion_batch():
+    with make_io_ring(entries=256, cq_size=512) as ring, AutoclosingScope() as scope:
+        file = scope.add(os.open("/dev/zero", os.O_RDONLY))
+
+        reads = [ring.prep_read(file, 16) for _ in range(10)]
+        closes = [ring.prep_close(-1) for _ in range(10)]
+        ring.submit_and_wait(20)
+
+        first = ring.get_completion_batch(max_entries=15)
+        second = ring.get_completion_batch(max_entries=15)
+        assert len(first) == 15
+        assert len(second) == 5
+        assert len(ring.get_completion_batch()) == 0
+
+        user_data = [*first.user_data, *second.user_data]
+        results = [*first.results, *second.results]
+        assert sorted(user_data) == sorted(reads + closes)
+
+        for ud, result in zip(user_data, results):
+            if ud in reads:
+                assert result == 16
+            else:
+                assert result == -errno.EBADF
+
+        buffers = first.buffers | second.buffers
+        assert buffers.keys() == set(reads)
+        assert all(buf == b"\x00" * 16 for buf in buffers.values())
+
+
+def test_invalid_completion_batch():
+    with make_io_ring() as ring, pytest.raises(ValueError):
+        ring.get_completion_batch(0)
+
+
+def test_prep_returns_user_data():
+    with make_io_ring() as ring:
+        first = ring.prep_close(-1)
+        second = ring.prep_close(-1)
+        assert first != second
+
+        ring.submit_and_wait(2)
+        completions = ring.get_completion_entries()
+        assert sorted(cqe.user_data for cqe in completions) == sorted([first, second])
+
+
+@pytest.mark.parametrize("mode", list(TaskRunMode))
+def test_task_run_modes(mode: TaskRunMode) -> None:
+    with make_io_ring(task_run_mode=mode) as ring, AutoclosingScope() as scope:
+        read_end, write_end = os.pipe()
+        scope.add(read_end)
+        scope.add(write_end)
+
+        user_data = ring.prep_read(read_end, 5)
+        ring.submit()
+        os.write(write_end, b"hello")
+
+        # reaping has to work without a waiting submit, e.g. after an eventfd wakeup.
+        deadline = time.monotonic() + 5
+        results: list[CompletionEvent] = []
+        while not results and time.monotonic() < deadline:
+            results = ring.get_completion_entries()
+
+        assert [it.user_data for it in results] == [user_data]
+        assert results[0].buffer == b"hello"
+
+
+def test_task_run_mode_fallback_with_sqpoll() -> None:
+    with make_io_ring(sqpoll_idle_ms=10, task_run_mode=TaskRunMode.DEFERRED) as ring:
+        assert ring.task_run_mode == TaskRunMode.DEFAULT
+
+
+def test_iowq_max_workers() -> None:
+    with make_io_ring() as ring:
+        ring.register_iowq_max_workers(4, 8)
+        assert ring.register_iowq_max_workers() == (4, 8)
+
+
+def test_iowq_affinity() -> None:
+    with make_io_ring() as ring:
+        ring.register_iowq_aff([0])
+        ring.unregister_iowq_aff()
+
+        with pytest.raises(ValueError):
+            ring.register_iowq_aff([])
+
+
+def test_attach_wq() -> None:
+    with make_io_ring(sqpoll_idle_ms=10) as first:
+        with make_io_ring(sqpoll_idle_ms=10, attach_wq=first) as second:
+            user_data = second.prep_nop()
+            second.submit_and_wait(1)
+
+            (cqe,) = second.get_completion_entries()
+            assert cqe.user_data == user_data
+
+
+def test_sq_thread_cpu() -> None:
+    with pytest.raises(ValueError):
+        with make_io_ring(sq_thread_cpu=0):
+            pass
+
+    with make_io_ring(sqpoll_idle_ms=10, sq_thread_cpu=0) as ring:
+        ring.prep_nop()
+        ring.submit_and_wait(1)
+        assert len(ring.get_completion_entries()) == 1
+
+
+def test_registered_ring_fd() -> None:
+    with make_io_ring() as ring, AutoclosingScope() as scope:
+        assert ring.capabilities().registered_ring_fd
+
+        zero = scope.add(os.open("/dev/zero", os.O_RDONLY))
+        ring.prep_read(zero, 8)
+        assert ring.submit_and_wait(1) == 1
+        assert ring.submit_and_wait_with_timeout(0, 1_000_000) == 0
+        assert len(ring.get_completion_entries()) == 1
+
+    with make_io_ring(single_issuer=False) as ring:
+        assert not ring.capabilities().registered_ring_fd
+
+    with make_io_ring(sqpoll_idle_ms=10) as ring:
+        capabilities = ring.capabilities()
+        assert capabilities.sqpoll
+        assert not capabilities.registered_ring_fd
+
+
+def test_registered_ring_fd_other_thread() -> None:
+    errors: list[BaseException] = []
+
+    with ExitStack() as stack:
+        ring = stack.enter_context(make_io_ring())
+        assert ring.capabilities().registered_ring_fd
+
+        def use_and_close() -> None:
+            try:
+                # this thread's own registered ring most likely got the same index.
+                with make_io_ring() as other:
+                    assert not ring.capabilities().registered_ring_fd
+
+                    ring.prep_nop()
+                    assert ring.submit_and_wait(1) == 1
+                    assert len(ring.get_completion_entries()) == 1
+                    stack.close()
+
+                    # closing the first ring mustn't have unregistered this one.
+                    other.prep_nop()
+                    assert other.submit_and_wait(1) == 1
+                    assert len(other.get_completion_entries()) == 1
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=use_and_close)
+        thread.start()
+        thread.join()
+
+    assert not errors, errors
@@ -36,3 +36,63 @@ def test_skip_success_write():
 def test_skip_success_send():
     with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
         ring.prep_send(0, b"", sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_read_fixed():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.register_buffers(1, 16)
+        ring.prep_read_fixed(0, 0, 1, sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_write_fixed():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.register_buffers(1, 16)
+        ring.prep_write_fixed(0, 0, 1, sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_bind_v4():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        try:
+            ring.prep_bind_v4(0, "127.0.0.1", 0, sqe_flags=make_sqe_flags(skip_success=True))
+        except NotImplementedError:
+            pytest.skip("bind isn't supported on this kernel")
+
+
+def test_skip_success_send_zc():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_send_zc(0, b"", sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_read_into():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_read_into(0, bytearray(1), sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_recv_into():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_recv_into(0, bytearray(1), sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_read_many():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_read_many([0], 1, sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_write_many():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_write_many(0, [b"a"], sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_readv():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_readv(0, [bytearray(1)], sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_writev():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_writev(0, [b"a"], sqe_flags=make_sqe_flags(skip_success=True))
+
+
+def test_skip_success_link_timeout():
+    with make_io_ring() as ring, pytest.raises(ValueError, match=PATTERN):
+        ring.prep_link_timeout(1, sqe_flags=make_sqe_flags(skip_success=True))